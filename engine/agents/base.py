@@ -3,7 +3,8 @@ Base agent wrapper around claude-agent-sdk.
 Injects charter, identity, and context into every call.
 
 Supports two modes:
-1. query() - One-shot queries (simple, no hooks)
+1. Pooled sessions - One-shot turns on a warm ClaudeSDKClient from
+   engine/agents/pool.py (no subprocess startup per reply; no hooks)
 2. ClaudeSDKClient - Continuous conversation with hooks (autonomous mode)
 """
 
@@ -11,7 +12,6 @@ import asyncio
 import logging
 from pathlib import Path
 from claude_agent_sdk import (
-    query,
     ClaudeAgentOptions,
     ClaudeSDKClient,
     AssistantMessage,
@@ -19,7 +19,9 @@ from claude_agent_sdk import (
     ResultMessage,
     HookMatcher,
 )
-from engine.agents.system_prompt import build_coo_system_prompt, build_system_prompt
+from engine.agents.pool import get_pool
+from engine.agents.sessions import agent_session
+from engine.agents.system_prompt import build_coo_system_prompt, build_system_prompt, get_current_time
 
 logger = logging.getLogger(__name__)
 
@@ -94,11 +96,48 @@ def get_default_hooks() -> dict:
     }
 
 
+def _interactive_options(allowed_tools: list = None) -> ClaudeAgentOptions:
+    """Options for a pooled session (the pool adds the system prompt when it starts one)."""
+    return ClaudeAgentOptions(
+        model="claude-opus-4-5-20251101",
+        allowed_tools=allowed_tools or COO_TOOLS,
+        permission_mode="acceptEdits",
+        cwd=str(ROOT),
+        add_dirs=get_add_dirs(),
+        setting_sources=["project"],
+    )
+
+
+def _vega_prompt() -> str:
+    return build_coo_system_prompt(name="Vega")
+
+
+async def _pooled_turn(identity: str, task: str, options: ClaudeAgentOptions, system_prompt, prompt_key: str = ""):
+    """
+    Run one turn on a warm pooled session, yielding its messages.
+
+    A pooled session keeps the system prompt it started with (up to the
+    pool's max age), so the turn carries the current time itself.
+    """
+    async with agent_session(identity), get_pool().session(identity, options, system_prompt, prompt_key) as client:
+        await client.query(f"(Current time: {get_current_time()})\n\n{task}")
+        async for message in client.receive_response():
+            yield message
+
+
+def prewarm(count: int = 1):
+    """
+    Keep `count` Vega sessions warm in the running loop's pool, so even the
+    first reply skips CLI startup. Call from a long-lived loop (engine/runtime.py).
+    """
+    get_pool().keep_warm("Vega", _interactive_options(), _vega_prompt, count)
+
+
 async def run_vega(task: str, stream_callback=None) -> str:
     """
     Run Vega (the COO) with full context injection.
 
-    Uses simple query() mode - good for one-shot tasks.
+    Runs one turn on a warm pooled session - good for one-shot tasks.
 
     Args:
         task: What you want Vega to do
@@ -107,22 +146,9 @@ async def run_vega(task: str, stream_callback=None) -> str:
     Returns:
         Vega's response
     """
-    system_prompt = build_coo_system_prompt(name="Vega")
-
     result_text = ""
 
-    async for message in query(
-        prompt=task,
-        options=ClaudeAgentOptions(
-            model="claude-opus-4-5-20251101",
-            system_prompt=system_prompt,
-            allowed_tools=COO_TOOLS,
-            permission_mode="acceptEdits",
-            cwd=str(ROOT),
-            add_dirs=get_add_dirs(),
-            setting_sources=["project"],
-        )
-    ):
+    async for message in _pooled_turn("Vega", task, _interactive_options(), _vega_prompt):
         # Stream text as it comes in
         if isinstance(message, AssistantMessage):
             for block in message.content:
@@ -175,7 +201,7 @@ async def run_vega_autonomous(
     result_text = ""
     continuation_count = 0
 
-    async with ClaudeSDKClient(options=options) as client:
+    async with agent_session("Vega (autonomous)"), ClaudeSDKClient(options=options) as client:
         # Send initial task
         await client.query(initial_task)
 
@@ -216,20 +242,7 @@ async def run_vega_streaming(task: str):
     Yields:
         Text chunks as they arrive
     """
-    system_prompt = build_coo_system_prompt(name="Vega")
-
-    async for message in query(
-        prompt=task,
-        options=ClaudeAgentOptions(
-            model="claude-opus-4-5-20251101",
-            system_prompt=system_prompt,
-            allowed_tools=COO_TOOLS,
-            permission_mode="acceptEdits",
-            cwd=str(ROOT),
-            add_dirs=get_add_dirs(),
-            setting_sources=["project"],
-        )
-    ):
+    async for message in _pooled_turn("Vega", task, _interactive_options(), _vega_prompt):
         if isinstance(message, AssistantMessage):
             for block in message.content:
                 if isinstance(block, TextBlock):
@@ -265,26 +278,17 @@ async def run_agent(
             return await run_vega_autonomous(task, stream_callback)
         return await run_vega(task, stream_callback)
 
-    system_prompt = build_system_prompt(
-        agent_name=agent_name,
-        agent_role=agent_role,
-        role_prompt=role_prompt
-    )
+    def system_prompt() -> str:
+        return build_system_prompt(
+            agent_name=agent_name,
+            agent_role=agent_role,
+            role_prompt=role_prompt
+        )
 
-    allowed_tools = tools or COO_TOOLS
     result_text = ""
 
-    async for message in query(
-        prompt=task,
-        options=ClaudeAgentOptions(
-            model="claude-opus-4-5-20251101",
-            system_prompt=system_prompt,
-            allowed_tools=allowed_tools,
-            permission_mode="acceptEdits",
-            cwd=str(ROOT),
-            add_dirs=get_add_dirs(),
-            setting_sources=["project"],
-        )
+    async for message in _pooled_turn(
+        agent_name, task, _interactive_options(tools), system_prompt, prompt_key=f"{agent_role}\n{role_prompt}"
     ):
         if isinstance(message, AssistantMessage):
             for block in message.content:
@@ -310,13 +314,8 @@ def run_autonomous(task: str, stream_callback=None) -> str:
 
 def _has_pending_work() -> bool:
     """Check if there's pending work in the queue."""
-    work_queue = ROOT / "vault" / "hive" / "work_queue.md"
-    if not work_queue.exists():
-        return False
-
     try:
-        content = work_queue.read_text()
-        # Simple check: are there unchecked items?
-        return '- [ ]' in content
+        from engine.autonomous.queue import get_queue
+        return get_queue().count_pending() > 0
     except Exception:
         return False
@@ -0,0 +1,497 @@
+"""
+Warm Agent Session Pool
+
+Every query() call spawns a fresh Claude Code subprocess and sends the
+system prompt again, adding seconds before the first token of every
+Discord/Slack reply. The pool keeps connected ClaudeSDKClient sessions
+ready instead:
+
+- Sessions are keyed by agent identity and a hash of their options; a
+  checkout takes an idle session for its key, or starts one (a cold
+  start) if none is idle
+- After a turn the session's conversation is cleared (/clear) in the
+  background and it goes back to the pool only once the CLI confirms a
+  new conversation started; a turn that fails or is abandoned, or a
+  clear that can't be confirmed, discards it, so one turn never sees
+  another's conversation
+- keep_warm() holds a number of idle sessions ready per key, refilled
+  after every checkout
+- Idle sessions are evicted after idle_ttl; every session is retired
+  after max_age, so the system prompt it started with (time, hive state,
+  memory) is never stale for long
+- Health checks: an idle session is pinged (a control request round trip,
+  no model call) before it's handed out, and dropped if the CLI doesn't
+  answer
+- Counters: hits, cold starts, evictions, discards
+
+ClaudeSDKClient must be connected and disconnected in the same task, so
+each session has an owner task that holds the connection open until the
+session is closed; callers only query and read.
+
+Usage:
+    from engine.agents.pool import get_pool
+
+    async with get_pool().session("Vega", options, build_prompt) as client:
+        await client.query(task)
+        async for message in client.receive_response():
+            ...
+"""
+
+import asyncio
+import dataclasses
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Callable, Optional, Union
+
+from claude_agent_sdk import ClaudeAgentOptions, ClaudeSDKClient, ResultMessage, SystemMessage
+
+logger = logging.getLogger(__name__)
+
+# CLI processes per pool (idle and in use); past this, idle sessions are
+# evicted to make room, and extra sessions are closed after their turn
+DEFAULT_MAX_SIZE = 6
+
+# Idle sessions are closed after this long unused
+DEFAULT_IDLE_TTL = 10 * 60
+
+# Sessions are retired after this long, however often they're used
+DEFAULT_MAX_AGE = 30 * 60
+
+# Seconds between eviction/health/refill passes
+MAINTENANCE_INTERVAL = 30.0
+
+# Seconds a session may take to start, to clear its conversation, and to
+# answer a health check
+CONNECT_TIMEOUT = 60.0
+CLEAR_TIMEOUT = 15.0
+PING_TIMEOUT = 5.0
+
+CLEAR_COMMAND = "/clear"
+
+PromptSource = Union[str, Callable[[], str]]
+PoolKey = tuple[str, str]
+
+
+def _stable(value):
+    """JSON fallback for option values: functions by name, dataclasses by fields."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if callable(value):
+        return f"{getattr(value, '__module__', '')}.{getattr(value, '__qualname__', repr(value))}"
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def options_hash(options: ClaudeAgentOptions) -> str:
+    """
+    Hash of everything in `options` that shapes the CLI process, except the
+    system prompt (the pool builds that when a session starts).
+    """
+    fields = {
+        f.name: getattr(options, f.name)
+        for f in dataclasses.fields(options)
+        if f.name != "system_prompt"
+    }
+    encoded = json.dumps(fields, sort_keys=True, default=_stable)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+class PooledSession:
+    """A connected ClaudeSDKClient and the task that owns its connection."""
+
+    def __init__(self, key: PoolKey, client: ClaudeSDKClient):
+        self.key = key
+        self.client = client
+        self.created = time.monotonic()
+        self.last_used = self.created
+        self.turns = 0
+        self.keep = True  # False: close after this turn (pool was full)
+        self._closing = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, timeout: float = CONNECT_TIMEOUT):
+        """Connect (in the owner task) and wait until the session is ready."""
+        connected = asyncio.get_running_loop().create_future()
+        connected.add_done_callback(lambda f: f.cancelled() or f.exception())  # retrieved even after a timeout
+        self._task = asyncio.create_task(self._own(connected), name=f"agent-session:{self.key[0]}")
+        try:
+            await asyncio.wait_for(asyncio.shield(connected), timeout=timeout)
+        except BaseException:
+            self.close()
+            raise
+
+    async def _own(self, connected: asyncio.Future):
+        try:
+            await self.client.connect()
+        except BaseException as e:
+            if not connected.done():
+                connected.set_exception(e if isinstance(e, Exception) else asyncio.CancelledError())
+            if not isinstance(e, Exception):
+                raise
+            return
+        if not connected.done():
+            connected.set_result(None)
+        try:
+            await self._closing.wait()
+        finally:
+            try:
+                await self.client.disconnect()
+            except Exception as e:
+                logger.debug(f"Error closing agent session {self.key[0]}: {e}")
+
+    def close(self):
+        """Disconnect (done by the owner task)."""
+        self._closing.set()
+
+    async def wait_closed(self):
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+    @property
+    def alive(self) -> bool:
+        """Connected and not closing (see ping() for whether the CLI still answers)."""
+        return not self._closing.is_set() and self._task is not None and not self._task.done()
+
+    async def ping(self, timeout: float = PING_TIMEOUT) -> bool:
+        """
+        Check the CLI still answers, with a control request that re-sends
+        the session's permission mode (a no-op round trip, no model call).
+        """
+        if not self.alive:
+            return False
+        mode = self.client.options.permission_mode or "default"
+        try:
+            await asyncio.wait_for(self.client.set_permission_mode(mode), timeout=timeout)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Agent session for {self.key[0]} failed its health check: {e or type(e).__name__}")
+            return False
+        return True
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+    @property
+    def idle_for(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+class AgentPool:
+    """Warm ClaudeSDKClient sessions for one event loop, keyed by identity and options."""
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_MAX_SIZE,
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        """
+        Args:
+            max_size: CLI processes kept at once (idle and in use)
+            idle_ttl: Seconds an idle session is kept
+            max_age: Seconds before a session is retired
+        """
+        self.max_size = max(1, max_size)
+        self.idle_ttl = idle_ttl
+        self.max_age = max_age
+
+        self._idle: dict[PoolKey, list[PooledSession]] = {}  # most recently used last
+        self._busy: set[PooledSession] = set()
+        self._starting = 0  # sessions starting (counted toward max_size)
+        self._warming: Counter = Counter()  # PoolKey -> background starts in flight
+        self._specs: dict[PoolKey, tuple[ClaudeAgentOptions, PromptSource]] = {}
+        self._warm: dict[PoolKey, int] = {}  # PoolKey -> idle sessions to keep ready
+        self._tasks: set[asyncio.Task] = set()
+        self._maintenance: Optional[asyncio.Task] = None
+        self._closed = False
+        self.counts: Counter = Counter()
+
+    @asynccontextmanager
+    async def session(
+        self,
+        identity: str,
+        options: ClaudeAgentOptions,
+        system_prompt: PromptSource,
+        prompt_key: str = "",
+    ):
+        """
+        Check out a connected client for one turn.
+
+        The turn must be read to its ResultMessage; leaving the block with
+        an exception (or abandoning a stream) discards the session instead
+        of returning it.
+
+        Args:
+            identity: Agent identity, e.g. "Vega"
+            options: Options for the session (system_prompt is ignored)
+            system_prompt: The system prompt, or a function building it
+                (called only when a session starts)
+            prompt_key: Anything else the system prompt depends on, so
+                different prompts for one identity don't share sessions
+        """
+        key = self._key(identity, options, prompt_key)
+        self._specs[key] = (options, system_prompt)
+        self._ensure_maintenance()
+
+        pooled = await self._take_idle(key)
+        if pooled is not None:
+            self.counts["hits"] += 1
+        else:
+            self.counts["cold_starts"] += 1
+            pooled = await self._start(key)
+        self._busy.add(pooled)
+        self._refill(key)
+
+        try:
+            yield pooled.client
+        except BaseException:
+            self._busy.discard(pooled)
+            self.counts["discarded"] += 1
+            pooled.close()
+            raise
+        else:
+            self._busy.discard(pooled)
+            pooled.turns += 1
+            pooled.last_used = time.monotonic()
+            self._spawn(self._reset(pooled))
+
+    def keep_warm(
+        self,
+        identity: str,
+        options: ClaudeAgentOptions,
+        system_prompt: PromptSource,
+        count: int = 1,
+        prompt_key: str = "",
+    ):
+        """Keep `count` idle sessions ready for this identity (started in the background)."""
+        key = self._key(identity, options, prompt_key)
+        self._specs[key] = (options, system_prompt)
+        self._warm[key] = count
+        self._ensure_maintenance()
+        self._refill(key)
+
+    async def close(self):
+        """Close every session (in-use ones are closed when their turn ends)."""
+        self._closed = True
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+        sessions = [s for idle in self._idle.values() for s in idle]
+        self._idle.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        for pooled in sessions:
+            pooled.close()
+        await asyncio.gather(*(s.wait_closed() for s in sessions), *self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "idle": sum(len(s) for s in self._idle.values()),
+            "busy": len(self._busy),
+            "starting": self._starting,
+            "max_size": self.max_size,
+            **dict(self.counts),
+        }
+
+    def summary(self) -> str:
+        checkouts = self.counts["hits"] + self.counts["cold_starts"]
+        if not checkouts:
+            return "No pooled sessions used"
+        return (
+            f"{checkouts} checkouts, {self.counts['hits']} warm "
+            f"({self.counts['hits'] / checkouts:.0%}), {self.counts['cold_starts']} cold starts, "
+            f"{self.counts['evicted']} evicted, {self.counts['discarded']} discarded"
+        )
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _key(identity: str, options: ClaudeAgentOptions, prompt_key: str) -> PoolKey:
+        digest = options_hash(options)
+        if prompt_key:
+            digest += ":" + hashlib.sha256(prompt_key.encode()).hexdigest()[:8]
+        return (identity, digest)
+
+    def _size(self) -> int:
+        return sum(len(s) for s in self._idle.values()) + len(self._busy) + self._starting
+
+    async def _take_idle(self, key: PoolKey) -> Optional[PooledSession]:
+        """Most recently used idle session for the key that answers a ping."""
+        idle = self._idle.get(key, [])
+        while idle:
+            pooled = idle.pop()
+            if pooled.age >= self.max_age:
+                self.counts["retired"] += 1
+            elif await pooled.ping():
+                return pooled
+            else:
+                self.counts["discarded"] += 1
+            pooled.close()
+        return None
+
+    async def _start(self, key: PoolKey, reserved: bool = False) -> PooledSession:
+        """
+        Start a session for the key, making room in the pool if needed.
+
+        Args:
+            key: Pool key (its spec must be registered)
+            reserved: The caller already counted this start in _starting
+        """
+        keep = True
+        if not reserved:
+            if self._size() >= self.max_size and not self._evict_lru():
+                logger.info(f"Agent pool full ({self.max_size}); {key[0]} session won't be kept")
+                keep = False
+            self._starting += 1
+
+        try:
+            options, system_prompt = self._specs[key]
+            prompt = system_prompt() if callable(system_prompt) else system_prompt
+            pooled = PooledSession(key, ClaudeSDKClient(options=dataclasses.replace(options, system_prompt=prompt)))
+            pooled.keep = keep
+            started = time.monotonic()
+            await pooled.start()
+        finally:
+            self._starting -= 1
+        logger.info(f"Started agent session for {key[0]} in {time.monotonic() - started:.1f}s")
+        return pooled
+
+    def _evict_lru(self) -> bool:
+        """Close the least recently used idle session. False if none is idle."""
+        candidates = [s for idle in self._idle.values() for s in idle]
+        if not candidates:
+            return False
+        oldest = min(candidates, key=lambda s: s.last_used)
+        self._idle[oldest.key].remove(oldest)
+        self.counts["evicted"] += 1
+        oldest.close()
+        return True
+
+    async def _reset(self, pooled: PooledSession):
+        """
+        Clear a returned session's conversation, then make it idle again.
+
+        Sessions are shared between users (and scheduled routines), so a
+        session only goes back to the pool when the clear is confirmed;
+        otherwise it's discarded and the next turn gets a fresh one.
+        """
+        if self._closed or not pooled.keep or pooled.age >= self.max_age or not pooled.alive:
+            pooled.close()
+            return
+        try:
+            cleared = await asyncio.wait_for(self._clear(pooled.client), timeout=CLEAR_TIMEOUT)
+        except asyncio.CancelledError:
+            pooled.close()
+            raise
+        except Exception as e:
+            cleared = False
+            logger.warning(f"Could not clear {pooled.key[0]} session: {e or type(e).__name__}")
+        if not cleared or self._closed:
+            if not cleared:
+                logger.warning(f"{pooled.key[0]} session clear not confirmed, discarding it")
+                self.counts["discarded"] += 1
+            pooled.close()
+            return
+        self._idle.setdefault(pooled.key, []).append(pooled)
+
+    @staticmethod
+    async def _clear(client: ClaudeSDKClient) -> bool:
+        """
+        Send /clear and read its response.
+
+        Returns:
+            True if the CLI started a new conversation (it announces one with
+            an init system message) and the command didn't fail
+        """
+        await client.query(CLEAR_COMMAND)
+        new_session = False
+        ok = False
+        async for message in client.receive_response():  # ends after the command's ResultMessage
+            if isinstance(message, SystemMessage) and message.subtype == "init":
+                new_session = bool(message.data.get("session_id"))
+            elif isinstance(message, ResultMessage):
+                ok = not message.is_error
+        return new_session and ok
+
+    # ------------------------------------------------------------------
+    # Background upkeep
+    # ------------------------------------------------------------------
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _refill(self, key: PoolKey):
+        """Start sessions in the background until the key has its warm count."""
+        want = self._warm.get(key, 0)
+        have = len(self._idle.get(key, [])) + self._warming[key]
+        for _ in range(want - have):
+            if self._closed or self._size() >= self.max_size:
+                break
+            self._starting += 1  # reserved now so the size check above stays accurate
+            self._warming[key] += 1
+            self._spawn(self._warm_one(key))
+
+    async def _warm_one(self, key: PoolKey):
+        try:
+            pooled = await self._start(key, reserved=True)
+        except Exception as e:
+            logger.warning(f"Could not warm a {key[0]} session: {e}")
+            return
+        finally:
+            self._warming[key] -= 1
+        if self._closed:
+            pooled.close()
+        else:
+            self._idle.setdefault(key, []).append(pooled)
+
+    def _ensure_maintenance(self):
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.create_task(self._maintain())
+
+    async def _maintain(self):
+        """Evict stale idle sessions, drop dead ones, refill warm counts."""
+        while not self._closed:
+            await asyncio.sleep(MAINTENANCE_INTERVAL)
+            for key, idle in list(self._idle.items()):
+                for pooled in list(idle):
+                    if not pooled.alive:
+                        reason = "discarded"
+                    elif pooled.age >= self.max_age:
+                        reason = "retired"
+                    elif pooled.idle_for >= self.idle_ttl and len(idle) > self._warm.get(key, 0):
+                        reason = "evicted"
+                    else:
+                        continue
+                    idle.remove(pooled)
+                    self.counts[reason] += 1
+                    pooled.close()
+                    logger.debug(f"Agent session for {key[0]} {reason}")
+            for key in list(self._warm):
+                self._refill(key)
+
+
+_lock = threading.Lock()
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AgentPool]" = weakref.WeakKeyDictionary()
+
+
+def get_pool() -> AgentPool:
+    """Get the session pool for the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        pool = _pools.get(loop)
+        if pool is None:
+            pool = _pools[loop] = AgentPool()
+        return pool
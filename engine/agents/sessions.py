@@ -0,0 +1,141 @@
+"""
+Agent Session Limiter
+
+Every agent run is a Claude Code subprocess holding a model session.
+When Discord, Slack, the scheduler and the autonomous daemon share one
+process (engine/runtime.py) they also share one cap on how many of those
+run at once, instead of each component sizing its own:
+
+- At most max_sessions agent runs at once per event loop; the rest wait
+  in arrival order
+- Set the cap with JPA_MAX_AGENT_SESSIONS (default 4)
+- Running/waiting/peak counts and total wait time, for health checks
+  and the shutdown summary
+
+Usage:
+    from engine.agents.sessions import agent_session
+
+    async with agent_session("slack Vega"):
+        async for message in query(prompt=task, options=options):
+            ...
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 4
+
+# Waits longer than this are logged
+SLOW_WAIT_SECONDS = 5.0
+
+
+class SessionLimiter:
+    """
+    Caps concurrent agent sessions.
+
+    One semaphore is kept per event loop, since asyncio primitives can't be
+    shared across loops; in the runtime everything runs on one loop, so the
+    cap is process-wide. Counters are thread-safe.
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS):
+        """
+        Args:
+            max_sessions: Agent sessions running at once (per event loop)
+        """
+        self.max_sessions = max(1, max_sessions)
+        self._lock = threading.Lock()
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.running = 0
+        self.waiting = 0
+        self.peak = 0
+        self.sessions = 0
+        self.wait_total = 0.0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_sessions)
+            return semaphore
+
+    @asynccontextmanager
+    async def session(self, label: str = "agent"):
+        """
+        Hold a session slot for the duration of the block.
+
+        Args:
+            label: Who is running (for the slow-wait log line)
+        """
+        semaphore = self._semaphore()
+        started = time.monotonic()
+        with self._lock:
+            self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            with self._lock:
+                self.waiting -= 1
+
+        waited = time.monotonic() - started
+        if waited > SLOW_WAIT_SECONDS:
+            logger.info(f"{label} waited {waited:.1f}s for an agent session")
+        with self._lock:
+            self.running += 1
+            self.sessions += 1
+            self.peak = max(self.peak, self.running)
+            self.wait_total += waited
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.running -= 1
+            semaphore.release()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "waiting": self.waiting,
+                "peak": self.peak,
+                "max_sessions": self.max_sessions,
+                "sessions": self.sessions,
+            }
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.sessions:
+                return "No agent sessions yet"
+            return (
+                f"{self.sessions} sessions, peak {self.peak}/{self.max_sessions} at once, "
+                f"mean wait {self.wait_total / self.sessions:.1f}s"
+            )
+
+
+_limiter_instance: Optional[SessionLimiter] = None
+
+
+def get_session_limiter() -> SessionLimiter:
+    """Get the process-wide session limiter."""
+    global _limiter_instance
+    if _limiter_instance is None:
+        _limiter_instance = SessionLimiter(
+            int(os.getenv("JPA_MAX_AGENT_SESSIONS", DEFAULT_MAX_SESSIONS))
+        )
+    return _limiter_instance
+
+
+def agent_session(label: str = "agent"):
+    """Hold a slot in the shared limiter: `async with agent_session("Vega"): ...`"""
+    return get_session_limiter().session(label)
@@ -3,9 +3,15 @@ Entry point for autonomous daemon.
 
 Usage:
     python -m engine.autonomous              # Start daemon
+    python -m engine.autonomous --workers 3  # Start daemon with 3 workers
     python -m engine.autonomous add "task"   # Add task to queue
     python -m engine.autonomous list         # List pending tasks
     python -m engine.autonomous clear        # Clear completed tasks
+    python -m engine.autonomous migrate      # Import work_queue.json into SQLite
+    python -m engine.autonomous export out.json
+    python -m engine.autonomous compact      # Archive old finished tasks
+    python -m engine.autonomous search "query"  # Search archived tasks
+    python -m engine.autonomous stats        # Counts and dedup savings
 """
 
 import argparse
@@ -27,15 +33,37 @@ Commands:
   list       List all tasks in the queue
   pending    List pending tasks
   clear      Clear completed/failed tasks
+  migrate    Import a legacy work_queue.json into the SQLite queue
+  export     Export the queue to a work_queue.json file
+  compact    Move finished tasks past retention into the archive
+  search     Search archived tasks
+  stats      Show task counts and agent sessions saved by deduplication
 
 Examples:
   python -m engine.autonomous
+  python -m engine.autonomous --workers 3 --cap low=1
   python -m engine.autonomous add "Review today's meetings and summarize"
   python -m engine.autonomous add --priority high "Urgent: check on CI failures"
+  python -m engine.autonomous add --key brief:2026-01-07 "Write the morning brief"
+  python -m engine.autonomous add --at 2026-01-07T15:00 "Prep for the 3pm sync"
+  python -m engine.autonomous add --every "0 8 * * 1-5" --key morning_brief "Write the morning brief"
   python -m engine.autonomous list
+  python -m engine.autonomous migrate --from vault/hive/work_queue.json
+  python -m engine.autonomous compact --days 3
+  python -m engine.autonomous search "meetings" --since 2026-01-01 --status failed
 """
     )
 
+    # Daemon options
+    parser.add_argument(
+        '--workers', '-w', type=int, default=1,
+        help='Concurrent agent sessions when running the daemon'
+    )
+    parser.add_argument(
+        '--cap', action='append', default=[], metavar='PRIORITY=N',
+        help='Max concurrent tasks for a priority (e.g. low=1); repeatable'
+    )
+
     subparsers = parser.add_subparsers(dest='command')
 
     # Add task command
@@ -52,15 +80,60 @@ Examples:
         default='cli',
         help='Source of the task'
     )
+    add_parser.add_argument(
+        '--key', '-k',
+        help='Idempotency key; adds with the same key coalesce into one task'
+    )
+    add_parser.add_argument(
+        '--no-dedupe', action='store_true',
+        help='Always add a new task, even if an identical one is pending'
+    )
+    add_parser.add_argument(
+        '--at', dest='not_before',
+        help="Don't run before this time (ISO, e.g. 2026-01-07T15:00)"
+    )
+    add_parser.add_argument(
+        '--every', dest='recurrence', metavar='CRON',
+        help='Repeat on a cron schedule (e.g. "0 8 * * 1-5")'
+    )
 
     # List command
     subparsers.add_parser('list', help='List all tasks')
     subparsers.add_parser('pending', help='List pending tasks')
     subparsers.add_parser('clear', help='Clear completed tasks')
+    subparsers.add_parser('stats', help='Show task counts and dedup savings')
+
+    # Migration / export (JSON is the interchange format)
+    migrate_parser = subparsers.add_parser('migrate', help='Import work_queue.json into SQLite')
+    migrate_parser.add_argument(
+        '--from', dest='json_path',
+        help='JSON file to import (defaults to work_queue.json next to the database)'
+    )
+    migrate_parser.add_argument(
+        '--replace', action='store_true',
+        help='Drop existing tasks before importing'
+    )
+    export_parser = subparsers.add_parser('export', help='Export the queue to JSON')
+    export_parser.add_argument('json_path', help='Where to write the JSON file')
+
+    # Archive
+    compact_parser = subparsers.add_parser('compact', help='Archive old finished tasks')
+    compact_parser.add_argument(
+        '--days', type=float, default=None,
+        help='Retention window in days (default: 7)'
+    )
+    search_parser = subparsers.add_parser('search', help='Search archived tasks')
+    search_parser.add_argument('query', nargs='?', default='', help='Text to search for')
+    search_parser.add_argument('--since', help='Only tasks finished on/after YYYY-MM-DD')
+    search_parser.add_argument('--until', help='Only tasks finished on/before YYYY-MM-DD')
+    search_parser.add_argument('--status', choices=['completed', 'failed'], help='Filter by status')
+    search_parser.add_argument('--limit', '-n', type=int, default=20, help='Max results')
 
     args = parser.parse_args()
 
     if args.command == 'add':
+        from datetime import datetime
+        from croniter import croniter
         from engine.autonomous.queue import WorkQueue, TaskPriority
 
         priority_map = {
@@ -70,15 +143,35 @@ Examples:
             'urgent': TaskPriority.URGENT,
         }
 
+        try:
+            not_before = datetime.fromisoformat(args.not_before) if args.not_before else None
+        except ValueError:
+            print(f"Invalid --at time: {args.not_before}")
+            sys.exit(1)
+        if args.recurrence and not croniter.is_valid(args.recurrence):
+            print(f"Invalid --every cron expression: {args.recurrence}")
+            sys.exit(1)
+
         queue = WorkQueue()
         task = queue.add(
             description=args.description,
             priority=priority_map[args.priority],
             source=args.source,
+            idempotency_key=args.key,
+            dedupe=not args.no_dedupe,
+            not_before=not_before,
+            recurrence=args.recurrence,
         )
-        print(f"Added task: {task.id}")
+        if task.coalesced:
+            print(f"Coalesced into existing task: {task.id} ({task.coalesced} duplicate(s) so far)")
+        else:
+            print(f"Added task: {task.id}")
         print(f"Description: {task.description}")
         print(f"Priority: {task.priority.name}")
+        if task.not_before:
+            print(f"Not before: {task.not_before}")
+        if task.recurrence:
+            print(f"Repeats: {task.recurrence}")
 
     elif args.command == 'list':
         from engine.autonomous.queue import WorkQueue
@@ -108,19 +201,95 @@ Examples:
         print(f"{'Priority':<8} Description")
         print("-" * 60)
         for task in sorted(tasks, key=lambda t: -t.priority.value):
-            print(f"{task.priority.name:<8} {task.description}")
+            when = f" (at {task.not_before})" if task.not_before else ""
+            print(f"{task.priority.name:<8} {task.description}{when}")
 
     elif args.command == 'clear':
         from engine.autonomous.queue import WorkQueue
 
         queue = WorkQueue()
-        queue.clear_completed()
-        print("Cleared completed and failed tasks")
+        removed = queue.clear_completed()
+        print(f"Cleared {removed} completed and failed tasks")
+
+    elif args.command == 'stats':
+        from engine.autonomous.queue import WorkQueue
+
+        queue = WorkQueue()
+        stats = queue.stats()
+        for status in ('pending', 'in_progress', 'completed', 'failed'):
+            print(f"{status:<12} {stats[status]}")
+        print(f"{'saved':<12} {stats['sessions_saved']} agent session(s) via deduplication")
+
+    elif args.command == 'migrate':
+        from pathlib import Path
+        from engine.autonomous.queue import WorkQueue
+
+        queue = WorkQueue()
+        json_path = Path(args.json_path) if args.json_path else queue.queue_path.with_suffix('.json')
+        if not json_path.exists():
+            print(f"Nothing to migrate: {json_path} not found")
+            return
+
+        count = queue.import_json(json_path, replace=args.replace)
+        print(f"Imported {count} tasks from {json_path}")
+        print(f"Queue database: {queue.queue_path}")
+
+    elif args.command == 'export':
+        from pathlib import Path
+        from engine.autonomous.queue import WorkQueue
+
+        queue = WorkQueue()
+        count = queue.export_json(Path(args.json_path))
+        print(f"Exported {count} tasks to {args.json_path}")
+
+    elif args.command == 'compact':
+        from engine.autonomous.queue import WorkQueue, DEFAULT_RETENTION_DAYS
+
+        queue = WorkQueue()
+        days = args.days if args.days is not None else DEFAULT_RETENTION_DAYS
+        archived = queue.compact(days)
+        print(f"Archived {archived} tasks finished more than {days:g} days ago")
+        print(f"Archive: {queue.archive.archive_dir}")
+
+    elif args.command == 'search':
+        from datetime import date
+        from engine.autonomous.queue import WorkQueue
+
+        try:
+            since = date.fromisoformat(args.since) if args.since else None
+            until = date.fromisoformat(args.until) if args.until else None
+        except ValueError as e:
+            parser.error(f"Invalid date: {e}")
+
+        queue = WorkQueue()
+        tasks = queue.search_archive(
+            args.query, since=since, until=until, status=args.status, limit=args.limit
+        )
+
+        if not tasks:
+            print("No archived tasks found")
+            return
+
+        print(f"{'Finished':<20} {'Status':<10} Description")
+        print("-" * 80)
+        for task in tasks:
+            finished = (task.completed_at or "")[:19]
+            print(f"{finished:<20} {task.status.value:<10} {task.description[:50]}")
 
     else:
         # No command = start daemon
+        from engine.autonomous.queue import TaskPriority
         from engine.autonomous.daemon import main as daemon_main
-        asyncio.run(daemon_main())
+
+        priority_caps = {}
+        for cap in args.cap:
+            name, _, limit = cap.partition('=')
+            try:
+                priority_caps[TaskPriority[name.strip().upper()]] = int(limit)
+            except (KeyError, ValueError):
+                parser.error(f"Invalid --cap '{cap}', expected e.g. low=1")
+
+        asyncio.run(daemon_main(workers=args.workers, priority_caps=priority_caps))
 
 
 if __name__ == "__main__":
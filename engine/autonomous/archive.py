@@ -0,0 +1,115 @@
+"""
+Append-only archive for finished work queue tasks.
+
+Completed and failed tasks older than the retention window are moved
+out of the hot queue into date-partitioned, gzip-compressed JSONL files:
+
+    vault/hive/work_queue_archive/2026-01-07.jsonl.gz
+
+Each compaction appends a new gzip member to the day's file, which
+gzip readers treat as one continuous stream. Files are partitioned by
+the day the task finished, so date-bounded searches only open the
+files they need.
+"""
+
+import gzip
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+SUFFIX = ".jsonl.gz"
+
+
+class QueueArchive:
+    """Date-partitioned JSONL.gz archive of finished tasks."""
+
+    def __init__(self, archive_dir: Path):
+        self.archive_dir = Path(archive_dir)
+
+    def _partition(self, task: dict) -> str:
+        finished = task.get('completed_at') or task.get('created_at') or ""
+        return finished[:10] or "undated"
+
+    def append(self, tasks: list[dict]) -> int:
+        """Append tasks to their day's archive file. Returns how many were written."""
+        if not tasks:
+            return 0
+
+        by_day: dict[str, list[dict]] = {}
+        for task in tasks:
+            by_day.setdefault(self._partition(task), []).append(task)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        for day, day_tasks in by_day.items():
+            path = self.archive_dir / f"{day}{SUFFIX}"
+            with gzip.open(path, 'at', encoding='utf-8') as f:
+                for task in day_tasks:
+                    f.write(json.dumps(task) + "\n")
+
+        return len(tasks)
+
+    def files(self, since: Optional[date] = None, until: Optional[date] = None) -> list[Path]:
+        """Archive files whose day falls within [since, until], oldest first."""
+        if not self.archive_dir.exists():
+            return []
+
+        selected = []
+        for path in sorted(self.archive_dir.glob(f"*{SUFFIX}")):
+            day_str = path.name[:-len(SUFFIX)]
+            try:
+                day = datetime.strptime(day_str, "%Y-%m-%d").date()
+            except ValueError:
+                selected.append(path)  # "undated" etc. — always searched
+                continue
+            if since and day < since:
+                continue
+            if until and day > until:
+                continue
+            selected.append(path)
+        return selected
+
+    def iter_tasks(self, since: Optional[date] = None, until: Optional[date] = None) -> Iterator[dict]:
+        """Stream every archived task in the date range."""
+        for path in self.files(since, until):
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def search(
+        self,
+        query: str = "",
+        since: Optional[date] = None,
+        until: Optional[date] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+    ) -> list[dict]:
+        """
+        Search archived tasks.
+
+        Args:
+            query: Case-insensitive text to find in description, result, or error
+            since: Only tasks finished on or after this day
+            until: Only tasks finished on or before this day
+            status: Only "completed" or "failed" tasks
+            limit: Max results (most recent first)
+
+        Returns:
+            Matching task dicts, most recently finished first
+        """
+        needle = query.lower()
+        matches = []
+        for task in self.iter_tasks(since, until):
+            if status and task.get('status') != status:
+                continue
+            if needle:
+                haystack = " ".join(
+                    str(task.get(k) or "") for k in ('description', 'result', 'error')
+                ).lower()
+                if needle not in haystack:
+                    continue
+            matches.append(task)
+
+        matches.sort(key=lambda t: t.get('completed_at') or "", reverse=True)
+        return matches[:limit]
@@ -0,0 +1,116 @@
+"""
+Work queue storage benchmark.
+
+Seeds a throwaway queue with N historical (completed) tasks and measures
+per-operation latency of add/get_next/start/complete for each backend.
+
+Usage:
+    python -m engine.autonomous.bench
+    python -m engine.autonomous.bench --sizes 10000 100000 --ops 200
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from engine.autonomous.queue import WorkQueue
+from engine.autonomous.storage import JsonQueueStorage, SQLiteQueueStorage
+
+
+def _history(size: int) -> list[dict]:
+    """Generate finished tasks that look like months of daemon output."""
+    base = datetime(2026, 1, 1)
+    tasks = []
+    for i in range(size):
+        created = base + timedelta(minutes=i)
+        tasks.append({
+            "id": f"task_hist_{i}",
+            "description": f"Historical task {i}: review meetings and summarize",
+            "priority": 1 + i % 4,
+            "status": "completed" if i % 10 else "failed",
+            "created_at": created.isoformat(),
+            "started_at": created.isoformat(),
+            "completed_at": (created + timedelta(seconds=30)).isoformat(),
+            "result": "Done. " * 40,
+            "error": None,
+            "source": "bench",
+        })
+    return tasks
+
+
+def _time_ops(queue: WorkQueue, ops: int) -> dict[str, float]:
+    """Run add -> get_next -> start -> complete cycles, return mean ms per op."""
+    timings = {"add": [], "get_next": [], "start": [], "complete": []}
+
+    for i in range(ops):
+        t0 = time.perf_counter()
+        queue.add(f"bench task {i}", source="bench")
+        t1 = time.perf_counter()
+        task = queue.get_next()
+        t2 = time.perf_counter()
+        queue.start(task.id)
+        t3 = time.perf_counter()
+        queue.complete(task.id, "ok")
+        t4 = time.perf_counter()
+
+        timings["add"].append(t1 - t0)
+        timings["get_next"].append(t2 - t1)
+        timings["start"].append(t3 - t2)
+        timings["complete"].append(t4 - t3)
+
+    # Debounced markdown write lands after the timed loop
+    queue.flush_markdown_view()
+
+    return {op: statistics.mean(values) * 1000 for op, values in timings.items()}
+
+
+def run_benchmark(sizes: list[int], ops: int, json_ops: int) -> list[tuple]:
+    """Benchmark each backend at each history size."""
+    rows = []
+    for size in sizes:
+        history = _history(size)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp_path = Path(tmp)
+
+            storage = SQLiteQueueStorage(tmp_path / "work_queue.db")
+            storage.import_all(history)
+            queue = WorkQueue(queue_path=tmp_path / "work_queue.db", storage=storage)
+            rows.append(("sqlite", size, ops, _time_ops(queue, ops)))
+            storage.close()
+
+            if json_ops:
+                storage = JsonQueueStorage(tmp_path / "legacy.json")
+                storage.import_all(history, replace=True)
+                queue = WorkQueue(queue_path=tmp_path / "legacy.json", storage=storage)
+                rows.append(("json", size, json_ops, _time_ops(queue, json_ops)))
+
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark work queue storage backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000],
+                        help="Historical task counts to seed")
+    parser.add_argument("--ops", type=int, default=200,
+                        help="add/get_next/start/complete cycles for SQLite")
+    parser.add_argument("--json-ops", type=int, default=5,
+                        help="Cycles for the legacy JSON backend (0 to skip)")
+    args = parser.parse_args()
+
+    rows = run_benchmark(args.sizes, args.ops, args.json_ops)
+
+    print(f"{'Backend':<8} {'History':>8} {'Cycles':>7} {'add':>10} {'get_next':>10} {'start':>10} {'complete':>10}")
+    print("-" * 70)
+    for backend, size, cycles, ms in rows:
+        print(
+            f"{backend:<8} {size:>8} {cycles:>7} "
+            f"{ms['add']:>8.2f}ms {ms['get_next']:>8.2f}ms {ms['start']:>8.2f}ms {ms['complete']:>8.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
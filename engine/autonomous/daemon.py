@@ -10,7 +10,11 @@ Usage:
 
 Features:
 - Continuous operation with configurable sleep between tasks
-- Graceful shutdown on SIGINT/SIGTERM
+- Event-driven wakeup when tasks are added (polling is only a fallback)
+- Delayed/recurring tasks: idle workers sleep exactly until the next one is due
+- Periodic compaction of old finished tasks into the archive
+- Pool of concurrent workers with per-priority concurrency caps
+- Graceful shutdown on SIGINT/SIGTERM (drains in-flight tasks)
 - Logging of all activity
 - Integration with the work queue
 - Uses hooks for auto-approval of safe operations
@@ -19,6 +23,9 @@ Features:
 import asyncio
 import logging
 import signal
+import time
+from collections import Counter
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -26,27 +33,55 @@ from typing import Optional
 from dotenv import load_dotenv
 load_dotenv()
 
-from engine.autonomous.queue import WorkQueue, Task, TaskStatus
+from engine.autonomous.notify import WakeupListener
+from engine.autonomous.queue import (
+    WorkQueue,
+    get_queue,
+    Task,
+    TaskPriority,
+    TaskStatus,
+    DEFAULT_LEASE_SECONDS,
+    DEFAULT_RETENTION_DAYS,
+    default_worker_id,
+)
 from engine.agents.base import run_vega_autonomous
 
-# Configure logging
+ROOT = Path(__file__).parent.parent.parent
+LOG_DIR = ROOT / "vault" / "hive" / "logs"
+LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+# Configure logging (a no-op when engine/runtime.py has already configured it)
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.StreamHandler(),
-        logging.FileHandler('/Users/jpa/jpa-os/vault/hive/logs/daemon.log'),
+        logging.FileHandler(LOG_DIR / "daemon.log"),
     ]
 )
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class WorkerStats:
+    """Per-worker counters, reported on shutdown."""
+    worker_id: str
+    tasks_completed: int = 0
+    tasks_failed: int = 0
+    tasks_lost: int = 0  # finished after the lease was lost; result not recorded
+    busy_seconds: float = 0.0
+    current_task: Optional[str] = None
+
+
 class AutonomousDaemon:
     """
     Daemon for autonomous agent operation.
 
     Continuously processes tasks from the work queue,
     enabling agents to work without human prompting.
+
+    Runs a pool of workers, each one an asyncio task driving its own
+    run_vega_autonomous session, so independent tasks drain in parallel.
     """
 
     def __init__(
@@ -55,26 +90,65 @@ class AutonomousDaemon:
         sleep_between_tasks: int = 10,
         sleep_when_idle: int = 60,
         max_consecutive_failures: int = 3,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        workers: int = 1,
+        priority_caps: Optional[dict[TaskPriority, int]] = None,
+        drain_timeout: Optional[float] = None,
+        retention_days: float = DEFAULT_RETENTION_DAYS,
+        compact_interval: int = 3600,
+        handle_signals: bool = True,
     ):
         """
         Initialize the daemon.
 
         Args:
-            queue: Work queue to process (defaults to standard location)
-            sleep_between_tasks: Seconds to sleep between tasks
-            sleep_when_idle: Seconds to sleep when queue is empty
+            queue: Work queue to process (defaults to the shared get_queue())
+            sleep_between_tasks: Seconds a worker sleeps between tasks
+            sleep_when_idle: Fallback poll interval when the queue is empty
+                (workers normally wake as soon as a task is added)
             max_consecutive_failures: Stop after this many failures in a row
+            worker_id: Identity used when claiming tasks (defaults to host:pid)
+            lease_seconds: Lease length; renewed while a task is running
+            workers: Number of concurrent agent sessions
+            priority_caps: Max tasks of a given priority running at once
+                (e.g. {TaskPriority.LOW: 1}); uncapped priorities use all workers
+            drain_timeout: On shutdown, seconds to let in-flight tasks finish
+                before cancelling them (None = wait for them)
+            retention_days: Finished tasks older than this are archived
+            compact_interval: Seconds between compaction runs
+            handle_signals: Install SIGINT/SIGTERM handlers in start() (off
+                when hosted by engine/runtime.py, which owns shutdown)
         """
-        self.queue = queue or WorkQueue()
+        # The shared queue, so Stop hooks in this process read the view this
+        # daemon keeps current instead of rebuilding it after each of our writes
+        self.queue = queue or get_queue()
         self.sleep_between_tasks = sleep_between_tasks
         self.sleep_when_idle = sleep_when_idle
         self.max_consecutive_failures = max_consecutive_failures
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.workers = max(1, workers)
+        self.priority_caps = priority_caps or {}
+        self.drain_timeout = drain_timeout
+        self.retention_days = retention_days
+        self.compact_interval = compact_interval
+        self.handle_signals = handle_signals
 
         self.running = False
         self.consecutive_failures = 0
         self.tasks_processed = 0
+        self.tasks_lost = 0
         self.start_time: Optional[datetime] = None
 
+        self.worker_stats: dict[str, WorkerStats] = {}
+        self._in_flight: Counter = Counter()  # TaskPriority -> running count
+        self._worker_tasks: list[asyncio.Task] = []
+        self._stop = asyncio.Event()
+        self._work_available = asyncio.Event()
+        self._wakeup: Optional[WakeupListener] = None
+        self._shutdown_requested = 0
+
     async def start(self):
         """Start the daemon."""
         self.running = True
@@ -82,80 +156,235 @@ class AutonomousDaemon:
 
         logger.info("=" * 60)
         logger.info("AUTONOMOUS DAEMON STARTING")
+        logger.info(f"Workers: {self.workers}")
+        if self.priority_caps:
+            caps = ", ".join(f"{p.name.lower()}={n}" for p, n in self.priority_caps.items())
+            logger.info(f"Priority caps: {caps}")
         logger.info(f"Sleep between tasks: {self.sleep_between_tasks}s")
-        logger.info(f"Sleep when idle: {self.sleep_when_idle}s")
+        logger.info(f"Sleep when idle: {self.sleep_when_idle}s (fallback poll)")
+        logger.info(f"Worker: {self.worker_id} (lease {self.lease_seconds}s)")
         logger.info("=" * 60)
 
         # Set up signal handlers for graceful shutdown
-        loop = asyncio.get_event_loop()
-        for sig in (signal.SIGINT, signal.SIGTERM):
-            loop.add_signal_handler(sig, self._handle_shutdown)
+        if self.handle_signals:
+            loop = asyncio.get_event_loop()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(sig, self._handle_shutdown)
+
+        # Wake idle workers as soon as a task is added
+        self._wakeup = WakeupListener(self.queue.wake_dir)
+        if self._wakeup.start(on_wake=self._work_available.set):
+            logger.info(f"Listening for new work on {self._wakeup.sock_path}")
 
-        await self._main_loop()
+        try:
+            await self._main_loop()
+        finally:
+            self._wakeup.close()
 
     def _handle_shutdown(self):
-        """Handle shutdown signals."""
-        logger.info("Shutdown signal received, stopping gracefully...")
+        """
+        Handle shutdown signals.
+
+        First signal: stop claiming and let in-flight tasks drain.
+        Second signal: cancel in-flight tasks (they're released back to the queue).
+        """
+        self._shutdown_requested += 1
+        if self._shutdown_requested == 1:
+            logger.info("Shutdown signal received, draining in-flight tasks...")
+            self.stop()
+        else:
+            logger.info("Second shutdown signal, cancelling in-flight tasks")
+            self._cancel_workers()
+
+    def stop(self):
+        """Stop claiming new tasks; workers exit after their current task."""
         self.running = False
+        self._stop.set()
+
+    def _cancel_workers(self):
+        for worker in self._worker_tasks:
+            worker.cancel()
+
+    async def _sleep(self, seconds: float):
+        """Sleep, but wake up immediately on shutdown."""
+        try:
+            await asyncio.wait_for(self._stop.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    def _idle_timeout(self) -> float:
+        """How long an idle worker should wait: until the next scheduled task, at most the poll interval."""
+        next_due = self.queue.next_due_at()
+        if next_due is None:
+            return self.sleep_when_idle
+        return max(0.0, min(self.sleep_when_idle, (next_due - datetime.now()).total_seconds()))
+
+    async def _wait_for_work(self, timeout: float):
+        """Block until a task is added, shutdown, or the timeout passes."""
+        if self._work_available.is_set():
+            self._work_available.clear()
+            return
+
+        waiters = [
+            asyncio.ensure_future(self._stop.wait()),
+            asyncio.ensure_future(self._work_available.wait()),
+        ]
+        try:
+            await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+        self._work_available.clear()
 
     async def _main_loop(self):
-        """Main processing loop."""
+        """Run the worker pool until shutdown, then drain."""
+        self._worker_tasks = [
+            asyncio.create_task(self._worker_loop(f"{self.worker_id}/w{i}"))
+            for i in range(self.workers)
+        ]
+
+        housekeeping = asyncio.create_task(self._housekeeping_loop())
+
+        await self._stop.wait()
+        housekeeping.cancel()
+
+        # Drain: workers stop claiming and finish what they're running
+        busy = [w for w in self.worker_stats.values() if w.current_task]
+        if busy:
+            logger.info(f"Waiting for {len(busy)} in-flight task(s) to finish")
+        done, pending = await asyncio.wait(self._worker_tasks, timeout=self.drain_timeout)
+        if pending:
+            logger.info(f"Drain timeout reached, cancelling {len(pending)} worker(s)")
+            for worker in pending:
+                worker.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # Log final stats
+        self._log_shutdown_stats()
+
+    async def _housekeeping_loop(self):
+        """Keep the hot queue small: archive old finished tasks periodically."""
         while self.running:
             try:
-                # Get next task
-                task = self.queue.get_next()
+                archived = self.queue.compact(self.retention_days)
+                if archived:
+                    logger.info(f"Archived {archived} finished task(s) older than {self.retention_days} days")
+            except Exception as e:
+                logger.error(f"Compaction failed: {e}")
+            await self._sleep(self.compact_interval)
+
+    def _claimable_priorities(self) -> Optional[list[TaskPriority]]:
+        """Priorities a worker may claim right now, given the caps (None = any)."""
+        if not self.priority_caps:
+            return None
+        return [
+            p for p in TaskPriority
+            if p not in self.priority_caps or self._in_flight[p] < self.priority_caps[p]
+        ]
+
+    async def _worker_loop(self, worker_id: str):
+        """One worker: claim, run, repeat until shutdown."""
+        stats = self.worker_stats.setdefault(worker_id, WorkerStats(worker_id))
+
+        while self.running:
+            try:
+                # Claim the next task (atomic, leased to this worker)
+                task = self.queue.claim_next(
+                    worker_id,
+                    self.lease_seconds,
+                    priorities=self._claimable_priorities(),
+                )
 
                 if task is None:
-                    logger.debug("No pending tasks, sleeping...")
-                    await asyncio.sleep(self.sleep_when_idle)
+                    logger.debug(f"[{worker_id}] No claimable tasks, waiting for work...")
+                    await self._wait_for_work(self._idle_timeout())
                     continue
 
                 # Process the task
-                await self._process_task(task)
+                await self._process_task(task, worker_id, stats)
 
                 # Sleep between tasks
                 if self.running:
-                    await asyncio.sleep(self.sleep_between_tasks)
+                    await self._sleep(self.sleep_between_tasks)
 
-            except Exception as e:
-                logger.error(f"Error in main loop: {e}")
-                self.consecutive_failures += 1
+            except asyncio.CancelledError:
+                raise
 
-                if self.consecutive_failures >= self.max_consecutive_failures:
-                    logger.error(f"Too many consecutive failures ({self.consecutive_failures}), stopping")
-                    self.running = False
-                else:
-                    await asyncio.sleep(self.sleep_when_idle)
+            except Exception as e:
+                logger.error(f"[{worker_id}] Error in worker loop: {e}")
+                self._record_failure()
+                if self.running:
+                    await self._sleep(self.sleep_when_idle)
 
-        # Log final stats
-        self._log_shutdown_stats()
+    def _record_failure(self):
+        """Count a failure; stop the daemon after too many in a row."""
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.max_consecutive_failures and self.running:
+            logger.error(f"Too many consecutive failures ({self.consecutive_failures}), stopping")
+            self.stop()
 
-    async def _process_task(self, task: Task):
+    async def _process_task(self, task: Task, worker_id: str, stats: WorkerStats):
         """Process a single task."""
-        logger.info(f"Processing task: {task.id}")
-        logger.info(f"Description: {task.description}")
+        logger.info(f"[{worker_id}] Processing task: {task.id}")
+        logger.info(f"[{worker_id}] Description: {task.description}")
+
+        self._in_flight[task.priority] += 1
+        stats.current_task = task.id
+        started = time.monotonic()
 
-        # Mark as in progress
-        self.queue.start(task.id)
+        # Keep the lease alive while the agent works
+        heartbeat = asyncio.create_task(self._renew_lease(task, worker_id))
+
+        # With one worker, stream to the terminal; with several it'd be interleaved
+        stream_callback = (lambda x: print(x, end='', flush=True)) if self.workers == 1 else None
 
         try:
             # Run Vega in autonomous mode
             result = await run_vega_autonomous(
                 initial_task=task.description,
-                stream_callback=lambda x: print(x, end='', flush=True),
+                stream_callback=stream_callback,
             )
 
-            # Mark as complete
-            self.queue.complete(task.id, result)
-            self.tasks_processed += 1
-            self.consecutive_failures = 0
-
-            logger.info(f"Task {task.id} completed successfully")
+            # Mark as complete (only counts if we still held the lease)
+            if self.queue.complete(task.id, result, worker_id=worker_id):
+                self.tasks_processed += 1
+                self.consecutive_failures = 0
+                stats.tasks_completed += 1
+                logger.info(f"[{worker_id}] Task {task.id} completed successfully")
+            else:
+                self.tasks_lost += 1
+                stats.tasks_lost += 1
+                logger.warning(f"[{worker_id}] Task {task.id} finished after its lease was lost; result not recorded")
+
+        except asyncio.CancelledError:
+            # Hard shutdown: put the task back rather than failing it
+            logger.info(f"[{worker_id}] Task {task.id} interrupted, releasing back to queue")
+            self.queue.release(task.id, worker_id)
+            raise
 
         except Exception as e:
-            logger.error(f"Task {task.id} failed: {e}")
-            self.queue.fail(task.id, str(e))
-            self.consecutive_failures += 1
+            logger.error(f"[{worker_id}] Task {task.id} failed: {e}")
+            self.queue.fail(task.id, str(e), worker_id=worker_id)
+            stats.tasks_failed += 1
+            self._record_failure()
+
+        finally:
+            heartbeat.cancel()
+            self._in_flight[task.priority] -= 1
+            if self.priority_caps:
+                # A capped slot freed up; let idle workers re-check
+                self._work_available.set()
+            stats.current_task = None
+            stats.busy_seconds += time.monotonic() - started
+
+    async def _renew_lease(self, task: Task, worker_id: str):
+        """Renew the task's lease periodically until cancelled."""
+        interval = max(self.lease_seconds / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            if not self.queue.renew_lease(task.id, worker_id, self.lease_seconds):
+                logger.warning(f"[{worker_id}] Lost lease on task {task.id}")
+                return
 
     def _log_shutdown_stats(self):
         """Log statistics on shutdown."""
@@ -168,16 +397,19 @@ class AutonomousDaemon:
         logger.info("AUTONOMOUS DAEMON STOPPED")
         logger.info(f"Runtime: {runtime}")
         logger.info(f"Tasks processed: {self.tasks_processed}")
+        if self.tasks_lost:
+            logger.info(f"Tasks lost (lease expired before completion): {self.tasks_lost}")
+        for stats in self.worker_stats.values():
+            logger.info(
+                f"  {stats.worker_id}: {stats.tasks_completed} completed, "
+                f"{stats.tasks_failed} failed, {stats.tasks_lost} lost, busy {stats.busy_seconds:.0f}s"
+            )
         logger.info("=" * 60)
 
 
-async def main():
+async def main(workers: int = 1, priority_caps: Optional[dict[TaskPriority, int]] = None):
     """Entry point for the daemon."""
-    # Ensure log directory exists
-    log_dir = Path('/Users/jpa/jpa-os/vault/hive/logs')
-    log_dir.mkdir(parents=True, exist_ok=True)
-
-    daemon = AutonomousDaemon()
+    daemon = AutonomousDaemon(workers=workers, priority_caps=priority_caps)
     await daemon.start()
 
 
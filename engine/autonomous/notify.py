@@ -0,0 +1,128 @@
+"""
+Wakeup channel between the work queue and idle daemons.
+
+Each running daemon binds a Unix datagram socket in a shared directory
+next to the queue database. WorkQueue.add (from the CLI, Slack, another
+daemon...) sends a one-byte datagram to every socket there, so idle
+workers pick up new tasks within milliseconds instead of waiting out
+their polling interval. Polling stays on as a fallback.
+
+Sending is best-effort and never raises: if nobody is listening the
+task just sits in the queue until the next poll.
+"""
+
+import asyncio
+import errno
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+WAKE_MESSAGE = b"!"
+
+
+def notify(wake_dir: Path):
+    """Ping every daemon listening in wake_dir. Stale sockets are removed."""
+    if not hasattr(socket, "AF_UNIX"):
+        return
+
+    try:
+        entries = list(os.scandir(wake_dir))
+    except FileNotFoundError:
+        return
+
+    if not entries:
+        return
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    try:
+        for entry in entries:
+            if not entry.name.endswith(".sock"):
+                continue
+            try:
+                sock.sendto(WAKE_MESSAGE, entry.path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                # Listener died without cleaning up
+                try:
+                    os.unlink(entry.path)
+                except OSError:
+                    pass
+            except OSError as e:
+                # Full buffer means a wakeup is already pending — good enough
+                if e.errno not in (errno.EAGAIN, errno.EWOULDBLOCK, errno.ENOBUFS):
+                    logger.debug(f"Wakeup to {entry.path} failed: {e}")
+    finally:
+        sock.close()
+
+
+class WakeupListener:
+    """
+    Receives wakeup pings for one daemon process.
+
+    Usage:
+        listener = WakeupListener(queue.wake_dir)
+        if listener.start(on_wake=event.set):
+            ...
+        listener.close()
+    """
+
+    def __init__(self, wake_dir: Path):
+        self.wake_dir = Path(wake_dir)
+        self.sock_path = self.wake_dir / f"{os.getpid()}.sock"
+        self._sock: Optional[socket.socket] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def start(self, on_wake: Callable[[], None]) -> bool:
+        """
+        Bind the socket and call on_wake whenever a ping arrives.
+
+        Must be called from inside the running event loop. Returns False
+        (and the caller should just poll) if Unix sockets aren't available.
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            return False
+
+        try:
+            self.wake_dir.mkdir(parents=True, exist_ok=True)
+            if self.sock_path.exists():
+                self.sock_path.unlink()
+
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+            sock.setblocking(False)
+            sock.bind(str(self.sock_path))
+        except OSError as e:
+            logger.warning(f"Wakeup socket unavailable ({e}), falling back to polling")
+            return False
+
+        def _on_readable():
+            # Drain everything queued; one wakeup covers a burst of adds
+            while True:
+                try:
+                    sock.recv(64)
+                except (BlockingIOError, InterruptedError):
+                    break
+                except OSError:
+                    break
+            on_wake()
+
+        self._sock = sock
+        self._loop = asyncio.get_running_loop()
+        self._loop.add_reader(sock.fileno(), _on_readable)
+        return True
+
+    def close(self):
+        """Stop listening and remove the socket file."""
+        if self._sock is None:
+            return
+        if self._loop is not None:
+            self._loop.remove_reader(self._sock.fileno())
+        self._sock.close()
+        self._sock = None
+        try:
+            self.sock_path.unlink()
+        except OSError:
+            pass
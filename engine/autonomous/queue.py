@@ -8,15 +8,33 @@ Tasks can be added to the queue from anywhere:
 - Other agents
 
 The autonomous daemon picks up tasks from this queue.
+
+Tasks can also be scheduled: `not_before` holds a task back until a
+given time, and `recurrence` (a cron expression) re-queues the next
+occurrence whenever a run finishes.
 """
 
-import json
-from datetime import datetime
+import hashlib
+import heapq
+import os
+import re
+import socket
+import tempfile
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 
+from croniter import croniter
+
+from engine.autonomous.storage import QueueStorage, SQLiteQueueStorage, JsonQueueStorage
+from engine.autonomous.notify import notify
+from engine.autonomous.archive import QueueArchive
+
 
 class TaskPriority(Enum):
     LOW = 1
@@ -45,39 +63,398 @@ class Task:
     result: Optional[str] = None
     error: Optional[str] = None
     source: str = "manual"  # Where the task came from
+    worker_id: Optional[str] = None  # Worker holding the lease while in progress
+    lease_expires_at: Optional[str] = None
+    attempts: int = 0  # How many times a worker has claimed this task
+    idempotency_key: Optional[str] = None  # Caller-supplied dedup key
+    fingerprint: Optional[str] = None  # Hash of the normalized description
+    coalesced: int = 0  # Duplicate adds folded into this task
+    not_before: Optional[str] = None  # Don't run before this time (ISO)
+    recurrence: Optional[str] = None  # Cron expression; next run is queued on finish
 
     def __post_init__(self):
         if not self.created_at:
             self.created_at = datetime.now().isoformat()
 
 
-class WorkQueue:
+ROOT = Path(__file__).parent.parent.parent
+
+# Shared by the daemon, the CLI, and the Stop hooks
+DEFAULT_QUEUE_PATH = ROOT / "vault" / "hive" / "work_queue.db"
+
+# How long a claimed task stays leased without a renew_lease() heartbeat
+DEFAULT_LEASE_SECONDS = 600
+
+# Claims allowed before a task whose lease keeps expiring is failed
+MAX_ATTEMPTS = 3
+
+# Finished tasks stay in the hot queue this long before compact() archives them
+DEFAULT_RETENTION_DAYS = 7
+
+
+@dataclass(frozen=True)
+class PendingSummary:
+    """Cheap answer to "is there more work?" for hooks and continuation checks."""
+    pending: int = 0
+    in_progress: int = 0
+    top: tuple = field(default_factory=tuple)  # (description, priority name) of the next few tasks
+
+
+def task_fingerprint(description: str) -> str:
     """
-    Persistent work queue for autonomous agents.
+    Content fingerprint used to spot duplicate tasks.
 
-    Stores tasks in a JSON file in the vault.
+    Case, whitespace, and punctuation are ignored, so "Review today's
+    meetings." and "review todays meetings" collide.
     """
+    normalized = re.sub(r"[^\w\s]", "", description.lower())
+    normalized = " ".join(normalized.split())
+    return hashlib.sha256(normalized.encode()).hexdigest()[:32]
+
+
+def default_worker_id() -> str:
+    """Worker ID for this process: host:pid."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec='microseconds')
+
+
+def _timestamp(when: datetime) -> str:
+    """Stored form of a time: naive local ISO, so string order is time order."""
+    if when.tzinfo is not None:
+        when = when.astimezone().replace(tzinfo=None)
+    return when.isoformat(timespec='microseconds')
 
-    def __init__(self, queue_path: Optional[Path] = None):
-        self.queue_path = queue_path or Path("/Users/jpa/jpa-os/vault/hive/work_queue.json")
-        self._ensure_queue_exists()
 
-    def _ensure_queue_exists(self):
-        """Create queue file if it doesn't exist."""
-        if not self.queue_path.exists():
-            self.queue_path.parent.mkdir(parents=True, exist_ok=True)
-            self._save([])
+def next_occurrence(recurrence: str, after: Optional[datetime] = None) -> datetime:
+    """Next time a cron expression fires after `after` (default: now)."""
+    return croniter(recurrence, after or datetime.now()).get_next(datetime)
 
-    def _load(self) -> list[dict]:
-        """Load tasks from disk."""
+
+class ReadyIndex:
+    """
+    Min-heap of pending tasks keyed by (-priority, created_at).
+
+    Removals are lazy: discarded IDs stay in the heap until they reach
+    the top, so push/discard/pop are all O(log n).
+    """
+
+    def __init__(self, tasks: Optional[list[dict]] = None):
+        self._entries: dict[str, dict] = {}
+        self._heap: list[tuple] = []
+        for t in tasks or []:
+            self._entries[t['id']] = t
+        self._heap = [self._key(t) for t in self._entries.values()]
+        heapq.heapify(self._heap)
+
+    @staticmethod
+    def _key(task: dict) -> tuple:
+        return (-task['priority'], task['created_at'], task['id'])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, task: dict):
+        """Add (or re-add) a pending task."""
+        self._entries[task['id']] = task
+        heapq.heappush(self._heap, self._key(task))
+
+    def discard(self, task_id: str):
+        """Forget a task that is no longer pending."""
+        self._entries.pop(task_id, None)
+
+    def peek(self) -> Optional[dict]:
+        """Highest priority pending task without removing it."""
+        while self._heap:
+            _, _, task_id = self._heap[0]
+            task = self._entries.get(task_id)
+            if task is not None and self._key(task) == self._heap[0]:
+                return task
+            heapq.heappop(self._heap)  # stale entry
+        return None
+
+    def top(self, n: int) -> list[dict]:
+        """The n highest priority pending tasks, in order. O(len * log n)."""
+        return heapq.nsmallest(n, self._entries.values(), key=self._key)
+
+    def tasks(self) -> list[dict]:
+        """All pending tasks in priority order."""
+        return sorted(self._entries.values(), key=self._key)
+
+    def pop(self) -> Optional[dict]:
+        """Remove and return the highest priority pending task."""
+        task = self.peek()
+        if task is not None:
+            heapq.heappop(self._heap)
+            del self._entries[task['id']]
+        return task
+
+
+class DelayedIndex:
+    """
+    Timer heap of pending tasks that aren't due yet, keyed by not_before.
+
+    The daemon sleeps until next_due() instead of polling; due() hands
+    back everything whose time has come so it can move to the ready index.
+    Removals are lazy, like ReadyIndex.
+    """
+
+    def __init__(self):
+        self._entries: dict[str, dict] = {}
+        self._heap: list[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def push(self, task: dict):
+        self._entries[task['id']] = task
+        heapq.heappush(self._heap, (task['not_before'], task['id']))
+
+    def discard(self, task_id: str):
+        self._entries.pop(task_id, None)
+
+    def next_due(self) -> Optional[str]:
+        """Earliest not_before among delayed tasks."""
+        while self._heap:
+            not_before, task_id = self._heap[0]
+            task = self._entries.get(task_id)
+            if task is not None and task['not_before'] == not_before:
+                return not_before
+            heapq.heappop(self._heap)  # stale entry
+        return None
+
+    def due(self, now: str) -> list[dict]:
+        """Remove and return every task due at or before `now`."""
+        ready = []
+        while True:
+            not_before = self.next_due()
+            if not_before is None or not_before > now:
+                return ready
+            _, task_id = heapq.heappop(self._heap)
+            ready.append(self._entries.pop(task_id))
+
+    def tasks(self) -> list[dict]:
+        """All delayed tasks, soonest first."""
+        return sorted(self._entries.values(), key=lambda t: (t['not_before'], t['id']))
+
+
+class QueueView:
+    """
+    In-memory snapshot of what the queue looks like right now.
+
+    Holds the ready index, the delayed (not yet due) tasks, plus the
+    handful of in-progress and recently finished tasks the markdown
+    view shows. Mutating calls update it in
+    place with the rows they already touched, so rendering never has to
+    go back to storage.
+    """
+
+    RECENT_COMPLETED = 5
+    RECENT_FAILED = 3
+
+    def __init__(self, storage: QueueStorage):
+        now = _now()
+        pending = storage.list_tasks(TaskStatus.PENDING.value)
+        self.ready = ReadyIndex([t for t in pending if not self._is_delayed(t, now)])
+        self.delayed = DelayedIndex()
+        for t in pending:
+            if self._is_delayed(t, now):
+                self.delayed.push(t)
+        self.in_progress: dict[str, dict] = {
+            t['id']: t for t in storage.list_tasks(TaskStatus.IN_PROGRESS.value)
+        }
+        self.completed = deque(
+            storage.list_finished(TaskStatus.COMPLETED.value, self.RECENT_COMPLETED),
+            maxlen=self.RECENT_COMPLETED,
+        )
+        self.failed = deque(
+            storage.list_finished(TaskStatus.FAILED.value, self.RECENT_FAILED),
+            maxlen=self.RECENT_FAILED,
+        )
+
+        self._summary: dict[int, PendingSummary] = {}
+
+    @staticmethod
+    def _is_delayed(task: dict, now: str) -> bool:
+        return bool(task.get('not_before')) and task['not_before'] > now
+
+    def promote_due(self, now: str):
+        """Move delayed tasks whose time has come into the ready index."""
+        due = self.delayed.due(now)
+        if due:
+            self._summary.clear()
+            for task in due:
+                self.ready.push(task)
+
+    def _push_pending(self, task: dict):
+        self.ready.discard(task['id'])
+        self.delayed.discard(task['id'])
+        if self._is_delayed(task, _now()):
+            self.delayed.push(task)
+        else:
+            self.ready.push(task)
+
+    def summary(self, limit: int) -> PendingSummary:
+        """Counts plus the top `limit` pending tasks, cached until the view changes."""
+        if limit not in self._summary:
+            top = self.ready.top(limit)
+            self._summary[limit] = PendingSummary(
+                pending=len(self.ready),
+                in_progress=len(self.in_progress),
+                top=tuple((t['description'], TaskPriority(t['priority']).name.lower()) for t in top),
+            )
+        return self._summary[limit]
+
+    def task_added(self, task: dict):
+        self._summary.clear()
+        self._push_pending(task)
+
+    def task_updated(self, task: dict):
+        """A task changed in place (e.g. a duplicate bumped its priority)."""
+        self._summary.clear()
+        if task['status'] == TaskStatus.PENDING.value:
+            self._push_pending(task)
+        elif task['status'] == TaskStatus.IN_PROGRESS.value:
+            self.in_progress[task['id']] = task
+
+    def task_started(self, task: dict):
+        self._summary.clear()
+        self.ready.discard(task['id'])
+        self.delayed.discard(task['id'])
+        self.in_progress[task['id']] = task
+
+    def task_finished(self, task: dict):
+        self._summary.clear()
+        self.ready.discard(task['id'])
+        self.delayed.discard(task['id'])
+        self.in_progress.pop(task['id'], None)
+        if task['status'] == TaskStatus.COMPLETED.value:
+            self.completed.append(task)
+        else:
+            self.failed.append(task)
+
+    def render(self) -> str:
+        """Render the markdown view for humans."""
+        lines = ["# Work Queue", "", f"Last updated: {datetime.now().isoformat()}", ""]
+
+        if self.in_progress:
+            lines.append("## In Progress")
+            for t in self.in_progress.values():
+                lines.append(f"- [ ] **{t['description']}** (started {t.get('started_at', 'unknown')})")
+            lines.append("")
+
+        pending = self.ready.tasks()
+        if pending:
+            lines.append("## Pending")
+            for t in pending:
+                priority_label = TaskPriority(t['priority']).name.lower()
+                lines.append(f"- [ ] {t['description']} ({priority_label})")
+            lines.append("")
+
+        scheduled = self.delayed.tasks()
+        if scheduled:
+            lines.append("## Scheduled")
+            for t in scheduled:
+                repeat = f", every `{t['recurrence']}`" if t.get('recurrence') else ""
+                lines.append(f"- [ ] {t['description']} (at {t['not_before']}{repeat})")
+            lines.append("")
+
+        if self.completed:
+            lines.append("## Completed")
+            for t in self.completed:  # Last 5 completed
+                lines.append(f"- [x] {t['description']}")
+            lines.append("")
+
+        if self.failed:
+            lines.append("## Failed")
+            for t in self.failed:  # Last 3 failed
+                lines.append(f"- [!] {t['description']} - {t.get('error', 'unknown error')}")
+            lines.append("")
+
+        return '\n'.join(lines)
+
+
+def _atomic_write_text(path: Path, content: str):
+    """Write via a temp file + rename so readers never see a partial file."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except Exception:
         try:
-            return json.loads(self.queue_path.read_text())
-        except Exception:
-            return []
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class WorkQueue:
+    """
+    Persistent work queue for autonomous agents.
 
-    def _save(self, tasks: list[dict]):
-        """Save tasks to disk."""
-        self.queue_path.write_text(json.dumps(tasks, indent=2))
+    Stores tasks in a SQLite database in the vault (see storage.py).
+    The legacy work_queue.json format is only used for import/export.
+    """
+
+    def __init__(
+        self,
+        queue_path: Optional[Path] = None,
+        storage: Optional[QueueStorage] = None,
+        markdown_debounce: float = 0.5,
+    ):
+        self.queue_path = queue_path or DEFAULT_QUEUE_PATH
+        is_new = storage is None and not self.queue_path.exists()
+        self.storage = storage or SQLiteQueueStorage(self.queue_path)
+
+        # Idle daemons listen here; add() pings them (see notify.py)
+        self.wake_dir = self.queue_path.with_suffix('.wake')
+
+        # Finished tasks past retention are moved here by compact()
+        self.archive = QueueArchive(self.queue_path.with_name(f"{self.queue_path.stem}_archive"))
+
+        # In-memory view (ready index + recent tasks), rebuilt lazily when
+        # another process changes the store
+        self._lock = threading.RLock()
+        self._view: Optional[QueueView] = None
+        self._view_token: Optional[tuple] = None
+
+        # Markdown regeneration is coalesced over this window (0 = immediate)
+        self.markdown_debounce = markdown_debounce
+        self._markdown_timer: Optional[threading.Timer] = None
+
+        # One-time import of the old JSON queue sitting next to a fresh database
+        legacy_path = self.queue_path.with_suffix('.json')
+        if is_new and legacy_path.exists():
+            self.import_json(legacy_path)
+
+    def _state(self) -> QueueView:
+        """Get the in-memory view, rebuilding it if the store changed under us."""
+        with self._lock:
+            token = self.storage.change_token()
+            if self._view is None or token != self._view_token:
+                self._view = QueueView(self.storage)
+                self._view_token = token
+            else:
+                self._view.promote_due(_now())
+            return self._view
+
+    def _ready_index(self) -> ReadyIndex:
+        """Get the ready index of pending tasks."""
+        return self._state().ready
+
+    def _apply(self, change: str, task: dict):
+        """Apply a change made by this process to the in-memory view."""
+        with self._lock:
+            if self._view is not None:
+                getattr(self._view, change)(task)
+
+    def _invalidate(self):
+        """Drop the in-memory view; it's rebuilt on next use."""
+        with self._lock:
+            self._view = None
 
     def _task_to_dict(self, task: Task) -> dict:
         """Convert task to dict for storage."""
@@ -88,6 +465,7 @@ class WorkQueue:
 
     def _dict_to_task(self, d: dict) -> Task:
         """Convert dict to Task."""
+        d = dict(d)
         d['priority'] = TaskPriority(d['priority'])
         d['status'] = TaskStatus(d['status'])
         return Task(**d)
@@ -96,159 +474,412 @@ class WorkQueue:
         self,
         description: str,
         priority: TaskPriority = TaskPriority.NORMAL,
-        source: str = "manual"
+        source: str = "manual",
+        idempotency_key: Optional[str] = None,
+        dedupe: bool = True,
+        not_before: Optional[datetime] = None,
+        recurrence: Optional[str] = None,
     ) -> Task:
         """
         Add a new task to the queue.
 
+        Duplicates are coalesced rather than queued twice: if a task with
+        the same idempotency_key is pending or in progress, or a pending
+        task has the same content fingerprint, that task is returned
+        instead (with its priority raised to `priority` if higher). Every
+        coalesced add is one agent session saved. Scheduled tasks only
+        dedupe by idempotency_key, never by content, so "do X now" is not
+        folded into tomorrow's recurring "do X".
+
         Args:
             description: What needs to be done
             priority: Task priority (LOW, NORMAL, HIGH, URGENT)
             source: Where the task came from
+            idempotency_key: Optional caller key, e.g. "morning_brief:2026-01-07"
+            dedupe: Set False to always add a new row
+            not_before: Hold the task until this time
+            recurrence: Cron expression (e.g. "0 8 * * 1-5"). The task first
+                runs at not_before, or the next fire time if not given, and
+                each finished run queues the next occurrence.
 
         Returns:
-            The created Task
+            The created Task, or the existing task it was coalesced into
         """
-        tasks = self._load()
+        if recurrence and not_before is None:
+            not_before = next_occurrence(recurrence)
+        scheduled = not_before is not None
 
-        # Generate ID
-        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{len(tasks)}"
+        # Generate ID: readable timestamp plus a random suffix, so daemons
+        # adding in the same second (or after compaction) never collide
+        task_id = f"task_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:12]}"
 
         task = Task(
             id=task_id,
             description=description,
             priority=priority,
             source=source,
+            idempotency_key=idempotency_key,
+            fingerprint=task_fingerprint(description) if dedupe and not scheduled else None,
+            not_before=_timestamp(not_before) if scheduled else None,
+            recurrence=recurrence,
         )
 
-        tasks.append(self._task_to_dict(task))
-        self._save(tasks)
+        task_dict = self._task_to_dict(task)
+        if dedupe:
+            task_dict, coalesced = self.storage.insert_or_coalesce(task_dict)
+        else:
+            self.storage.insert(task_dict)
+            coalesced = False
+
+        if coalesced:
+            self._apply('task_updated', task_dict)
+            self._update_markdown_view()
+            return self._dict_to_task(task_dict)
+
+        self._apply('task_added', task_dict)
 
         # Also update the markdown view
         self._update_markdown_view()
 
+        # Wake any idle daemon
+        notify(self.wake_dir)
+
         return task
 
+    def get(self, task_id: str) -> Optional[Task]:
+        """Get a task by ID."""
+        d = self.storage.get(task_id)
+        return self._dict_to_task(d) if d else None
+
     def get_next(self) -> Optional[Task]:
         """
         Get the next task to work on.
 
         Returns highest priority pending task, or None if queue is empty.
         """
-        tasks = self._load()
+        return self.peek()
+
+    def peek(self) -> Optional[Task]:
+        """Highest priority pending task, without claiming it. O(1) amortized."""
+        with self._lock:
+            d = self._ready_index().peek()
+        return self._dict_to_task(d) if d else None
+
+    def pop_next(self) -> Optional[Task]:
+        """
+        Take the highest priority pending task and mark it in progress.
+
+        Shorthand for claim_next() with this process as the worker.
+        Returns None if nothing is pending.
+        """
+        return self.claim_next()
+
+    def claim_next(
+        self,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        priorities: Optional[list[TaskPriority]] = None,
+    ) -> Optional[Task]:
+        """
+        Atomically select the next pending task and lease it to a worker.
+
+        Selection and the in-progress update happen under the storage
+        lock, so two daemons (or a daemon and the CLI) can never claim
+        the same task. Expired leases from crashed workers are put back
+        in the queue first.
 
-        # Filter to pending tasks
-        pending = [t for t in tasks if t['status'] == TaskStatus.PENDING.value]
+        Args:
+            worker_id: Who is claiming (defaults to host:pid)
+            lease_seconds: How long the claim holds without renew_lease()
+            priorities: Only claim tasks with one of these priorities
 
-        if not pending:
+        Returns:
+            The claimed Task, or None if nothing is pending
+        """
+        self.requeue_expired()
+
+        now = datetime.now()
+        d = self.storage.claim(
+            worker_id or default_worker_id(),
+            now=now.isoformat(timespec='microseconds'),
+            lease_until=(now + timedelta(seconds=lease_seconds)).isoformat(timespec='microseconds'),
+            priorities=[p.value for p in priorities] if priorities is not None else None,
+        )
+        if d is None:
             return None
 
-        # Sort by priority (highest first), then by created_at (oldest first)
-        pending.sort(key=lambda t: (-t['priority'], t['created_at']))
+        self._apply('task_started', d)
+        self._update_markdown_view()
+        return self._dict_to_task(d)
+
+    def renew_lease(
+        self,
+        task_id: str,
+        worker_id: Optional[str] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+    ) -> bool:
+        """
+        Extend a worker's lease on an in-progress task.
+
+        Returns False if the worker no longer holds the task (the lease
+        expired and it was re-queued or claimed by someone else).
+        """
+        lease_until = datetime.now() + timedelta(seconds=lease_seconds)
+        return self.storage.update(
+            task_id,
+            where={'status': TaskStatus.IN_PROGRESS.value, 'worker_id': worker_id or default_worker_id()},
+            lease_expires_at=lease_until.isoformat(timespec='microseconds'),
+        )
+
+    def release(self, task_id: str, worker_id: Optional[str] = None) -> bool:
+        """
+        Hand an in-progress task back to the queue without counting it as failed.
+
+        Used when a worker is shut down mid-task. Returns False if the
+        worker no longer holds the task.
+        """
+        released = self.storage.update(
+            task_id,
+            where={'status': TaskStatus.IN_PROGRESS.value, 'worker_id': worker_id or default_worker_id()},
+            status=TaskStatus.PENDING.value,
+            started_at=None,
+            worker_id=None,
+            lease_expires_at=None,
+        )
+        if released:
+            self._invalidate()
+            self._update_markdown_view()
+            notify(self.wake_dir)
+        return released
+
+    def requeue_expired(self) -> int:
+        """
+        Return tasks with expired leases to the queue.
 
-        return self._dict_to_task(pending[0])
+        Tasks that have already been claimed MAX_ATTEMPTS times are
+        marked failed instead, and go through the same bookkeeping as
+        fail() (so a recurring task still gets its next run). Returns how
+        many tasks changed.
+        """
+        requeued, failed = self.storage.requeue_expired(_now(), MAX_ATTEMPTS)
+        if requeued or failed:
+            self._invalidate()
+            for task_id in failed:
+                self._finished(task_id)
+            self._update_markdown_view()
+            notify(self.wake_dir)
+        return requeued + len(failed)
+
+    def count_pending(self) -> int:
+        """Number of pending tasks that are due, served from the ready index."""
+        with self._lock:
+            return len(self._ready_index())
+
+    def next_due_at(self) -> Optional[datetime]:
+        """When the earliest delayed task becomes due, or None if nothing is scheduled."""
+        with self._lock:
+            not_before = self._state().delayed.next_due()
+        return datetime.fromisoformat(not_before) if not_before else None
+
+    def list_scheduled(self) -> list[Task]:
+        """Pending tasks that aren't due yet, soonest first."""
+        with self._lock:
+            delayed = self._state().delayed.tasks()
+        return [self._dict_to_task(t) for t in delayed]
+
+    def pending_summary(self, limit: int = 5) -> PendingSummary:
+        """
+        Pending/in-progress counts and the next few tasks.
+
+        Served from the in-memory view (rebuilt only when the store's
+        change token moves), so it's constant-time regardless of queue
+        history. Used by the Stop hooks.
+        """
+        with self._lock:
+            return self._state().summary(limit)
 
     def start(self, task_id: str) -> bool:
         """Mark a task as in progress."""
-        tasks = self._load()
-
-        for task in tasks:
-            if task['id'] == task_id:
-                task['status'] = TaskStatus.IN_PROGRESS.value
-                task['started_at'] = datetime.now().isoformat()
-                self._save(tasks)
-                self._update_markdown_view()
-                return True
-
-        return False
-
-    def complete(self, task_id: str, result: str = "") -> bool:
-        """Mark a task as completed."""
-        tasks = self._load()
-
-        for task in tasks:
-            if task['id'] == task_id:
-                task['status'] = TaskStatus.COMPLETED.value
-                task['completed_at'] = datetime.now().isoformat()
-                task['result'] = result
-                self._save(tasks)
-                self._update_markdown_view()
-                return True
-
-        return False
-
-    def fail(self, task_id: str, error: str = "") -> bool:
-        """Mark a task as failed."""
-        tasks = self._load()
-
-        for task in tasks:
-            if task['id'] == task_id:
-                task['status'] = TaskStatus.FAILED.value
-                task['completed_at'] = datetime.now().isoformat()
-                task['error'] = error
-                self._save(tasks)
-                self._update_markdown_view()
-                return True
-
-        return False
+        updated = self.storage.update(
+            task_id,
+            status=TaskStatus.IN_PROGRESS.value,
+            started_at=datetime.now().isoformat(),
+        )
+        if updated:
+            self._apply('task_started', self.storage.get(task_id))
+            self._update_markdown_view()
+        return updated
+
+    def _lease_condition(self, worker_id: Optional[str]) -> Optional[dict]:
+        """Only let a worker finish a task it still holds."""
+        if worker_id is None:
+            return None
+        return {'status': TaskStatus.IN_PROGRESS.value, 'worker_id': worker_id}
+
+    def complete(self, task_id: str, result: str = "", worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a task as completed.
+
+        If worker_id is given, this is a no-op (returns False) unless that
+        worker still holds the task's lease.
+        """
+        updated = self.storage.update(
+            task_id,
+            where=self._lease_condition(worker_id),
+            status=TaskStatus.COMPLETED.value,
+            completed_at=datetime.now().isoformat(),
+            result=result,
+            lease_expires_at=None,
+        )
+        if updated:
+            self._finished(task_id)
+        return updated
+
+    def fail(self, task_id: str, error: str = "", worker_id: Optional[str] = None) -> bool:
+        """
+        Mark a task as failed.
+
+        If worker_id is given, only applies while that worker holds the lease.
+        """
+        updated = self.storage.update(
+            task_id,
+            where=self._lease_condition(worker_id),
+            status=TaskStatus.FAILED.value,
+            completed_at=datetime.now().isoformat(),
+            error=error,
+            lease_expires_at=None,
+        )
+        if updated:
+            self._finished(task_id)
+        return updated
+
+    def _finished(self, task_id: str):
+        """Bookkeeping after complete()/fail(), including queuing the next run of a recurring task."""
+        d = self.storage.get(task_id)
+        self._apply('task_finished', d)
+
+        if d.get('recurrence'):
+            # A failed run doesn't stop the schedule; missed runs aren't replayed
+            self.add(
+                d['description'],
+                priority=TaskPriority(d['priority']),
+                source=d['source'],
+                idempotency_key=d.get('idempotency_key'),
+                not_before=next_occurrence(d['recurrence']),
+                recurrence=d['recurrence'],
+            )
+        else:
+            self._update_markdown_view()
 
     def list_pending(self) -> list[Task]:
         """Get all pending tasks."""
-        tasks = self._load()
-        pending = [t for t in tasks if t['status'] == TaskStatus.PENDING.value]
+        pending = self.storage.list_tasks(TaskStatus.PENDING.value)
         return [self._dict_to_task(t) for t in pending]
 
     def list_all(self) -> list[Task]:
         """Get all tasks."""
-        tasks = self._load()
-        return [self._dict_to_task(t) for t in tasks]
+        return [self._dict_to_task(t) for t in self.storage.list_tasks()]
 
-    def clear_completed(self):
+    def clear_completed(self) -> int:
         """Remove completed tasks from the queue."""
-        tasks = self._load()
-        tasks = [t for t in tasks if t['status'] not in [
-            TaskStatus.COMPLETED.value,
-            TaskStatus.FAILED.value
-        ]]
-        self._save(tasks)
+        removed = self.storage.delete_finished()
+        self._invalidate()
         self._update_markdown_view()
+        return removed
 
-    def _update_markdown_view(self):
-        """Update the markdown view of the queue for humans."""
-        md_path = self.queue_path.with_suffix('.md')
+    def stats(self) -> dict[str, int]:
+        """Task counts by status plus lifetime dedup savings."""
+        stats = {status.value: self.storage.count(status.value) for status in TaskStatus}
+        stats['sessions_saved'] = self.storage.counters().get('coalesced', 0)
+        return stats
 
-        tasks = self._load()
-        lines = ["# Work Queue", "", f"Last updated: {datetime.now().isoformat()}", ""]
+    def compact(self, retention_days: float = DEFAULT_RETENTION_DAYS, batch_size: int = 1000) -> int:
+        """
+        Move finished tasks older than the retention window into the archive.
 
-        # Group by status
-        pending = [t for t in tasks if t['status'] == TaskStatus.PENDING.value]
-        in_progress = [t for t in tasks if t['status'] == TaskStatus.IN_PROGRESS.value]
-        completed = [t for t in tasks if t['status'] == TaskStatus.COMPLETED.value]
-        failed = [t for t in tasks if t['status'] == TaskStatus.FAILED.value]
+        Tasks are appended to the archive before being deleted from the
+        hot queue, so a crash mid-compaction can at worst archive a task
+        twice — never lose it.
 
-        if in_progress:
-            lines.append("## In Progress")
-            for t in in_progress:
-                lines.append(f"- [ ] **{t['description']}** (started {t.get('started_at', 'unknown')})")
-            lines.append("")
+        Returns the number of tasks archived.
+        """
+        cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
+        archived = 0
+
+        while True:
+            batch = self.storage.finished_before(cutoff, batch_size)
+            if not batch:
+                break
+            self.archive.append(batch)
+            self.storage.delete([t['id'] for t in batch])
+            archived += len(batch)
+            if len(batch) < batch_size:
+                break
+
+        if archived:
+            self._invalidate()
+            self._update_markdown_view()
+        return archived
+
+    def search_archive(self, query: str = "", **filters) -> list[Task]:
+        """Search archived tasks. See QueueArchive.search for filters."""
+        return [self._dict_to_task(t) for t in self.archive.search(query, **filters)]
+
+    def import_json(self, json_path: Path, replace: bool = False) -> int:
+        """
+        Import tasks from a legacy work_queue.json file.
 
-        if pending:
-            lines.append("## Pending")
-            for t in sorted(pending, key=lambda x: -x['priority']):
-                priority_label = TaskPriority(t['priority']).name.lower()
-                lines.append(f"- [ ] {t['description']} ({priority_label})")
-            lines.append("")
+        Returns the number of tasks imported.
+        """
+        tasks = JsonQueueStorage(json_path).export_all()
+        count = self.storage.import_all(tasks, replace=replace)
+        self._invalidate()
+        self._update_markdown_view()
+        return count
 
-        if completed:
-            lines.append("## Completed")
-            for t in completed[-5:]:  # Last 5 completed
-                lines.append(f"- [x] {t['description']}")
-            lines.append("")
+    def export_json(self, json_path: Path) -> int:
+        """
+        Export every task to a work_queue.json file.
 
-        if failed:
-            lines.append("## Failed")
-            for t in failed[-3:]:  # Last 3 failed
-                lines.append(f"- [!] {t['description']} - {t.get('error', 'unknown error')}")
-            lines.append("")
+        Returns the number of tasks exported.
+        """
+        tasks = self.storage.export_all()
+        JsonQueueStorage(json_path).import_all(tasks, replace=True)
+        return len(tasks)
 
-        md_path.write_text('\n'.join(lines))
+    def _update_markdown_view(self):
+        """
+        Schedule a refresh of the markdown view for humans.
+
+        Calls within the debounce window are coalesced into one write,
+        so a burst of add() calls renders the file once.
+        """
+        if self.markdown_debounce <= 0:
+            self.flush_markdown_view()
+            return
+
+        with self._lock:
+            if self._markdown_timer is not None:
+                return  # already scheduled; it'll pick up this change too
+            self._markdown_timer = threading.Timer(self.markdown_debounce, self.flush_markdown_view)
+            self._markdown_timer.start()
+
+    def flush_markdown_view(self):
+        """Write the markdown view now (atomically), cancelling any pending refresh."""
+        with self._lock:
+            if self._markdown_timer is not None:
+                self._markdown_timer.cancel()
+                self._markdown_timer = None
+            content = self._state().render()
+
+        _atomic_write_text(self.queue_path.with_suffix('.md'), content)
+
+
+_queue_instance = None
+
+def get_queue() -> WorkQueue:
+    """Get the shared work queue instance."""
+    global _queue_instance
+    if _queue_instance is None:
+        _queue_instance = WorkQueue()
+    return _queue_instance
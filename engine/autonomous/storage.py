@@ -0,0 +1,657 @@
+"""
+Storage backends for the work queue.
+
+The queue talks to storage through QueueStorage so the persistence
+layer can be swapped without touching WorkQueue:
+
+- SQLiteQueueStorage: the default. WAL mode, tasks indexed by status and
+  priority, every state transition is a single-row UPDATE.
+- JsonQueueStorage: the original work_queue.json format. Every call
+  rewrites the whole file, so it's only used for import/export.
+
+Claiming a task (select + mark in progress) happens inside one lock:
+a BEGIN IMMEDIATE transaction for SQLite, a portalocker file lock for
+JSON. That's what makes it safe to run more than one daemon.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+import portalocker
+
+
+# Column name -> SQL declaration. New Task fields get appended here and
+# are added to existing databases by _ensure_schema().
+COLUMNS = {
+    "id": "TEXT PRIMARY KEY",
+    "description": "TEXT NOT NULL",
+    "priority": "INTEGER NOT NULL",
+    "status": "TEXT NOT NULL",
+    "created_at": "TEXT NOT NULL",
+    "started_at": "TEXT",
+    "completed_at": "TEXT",
+    "result": "TEXT",
+    "error": "TEXT",
+    "source": "TEXT NOT NULL DEFAULT 'manual'",
+    "worker_id": "TEXT",
+    "lease_expires_at": "TEXT",
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "idempotency_key": "TEXT",
+    "fingerprint": "TEXT",
+    "coalesced": "INTEGER NOT NULL DEFAULT 0",
+    "not_before": "TEXT",
+    "recurrence": "TEXT",
+}
+
+INDEXES = {
+    # get_next: pending tasks by priority (highest first), oldest first
+    "idx_tasks_ready": "tasks(status, priority DESC, created_at)",
+    # Markdown view / clear: finished tasks by completion time
+    "idx_tasks_finished": "tasks(status, completed_at)",
+    # Lease expiry sweep over in-progress tasks
+    "idx_tasks_lease": "tasks(status, lease_expires_at)",
+    # Duplicate detection on add()
+    "idx_tasks_idempotency": "tasks(idempotency_key, status)",
+    "idx_tasks_fingerprint": "tasks(fingerprint, status)",
+    # Delayed tasks by due time
+    "idx_tasks_due": "tasks(status, not_before)",
+}
+
+# Statuses in which a task can absorb a duplicate
+KEY_ACTIVE_STATUSES = ("pending", "in_progress")  # same idempotency key
+FINGERPRINT_ACTIVE_STATUSES = ("pending",)        # same content
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class QueueStorage(ABC):
+    """
+    Interface between WorkQueue and the place tasks live.
+
+    Tasks are passed around as plain dicts (the same shape as the
+    JSON format) so backends never need to know about Task/enums.
+    """
+
+    @abstractmethod
+    def insert(self, task: dict):
+        """Store a new task."""
+
+    @abstractmethod
+    def insert_or_coalesce(self, task: dict) -> tuple[dict, bool]:
+        """
+        Insert a task unless an active duplicate already exists.
+
+        A duplicate is a pending/in-progress task with the same
+        idempotency_key, or a pending task with the same fingerprint.
+        When found, the duplicate's priority is raised to the new task's
+        (if higher) and its coalesced count is bumped instead of adding
+        a row. Happens atomically.
+
+        Returns (stored task, True if it was coalesced into an existing one).
+        """
+
+    @abstractmethod
+    def counters(self) -> dict[str, int]:
+        """Lifetime counters (e.g. coalesced duplicates), surviving compaction."""
+
+    @abstractmethod
+    def update(self, task_id: str, where: Optional[dict] = None, **fields) -> bool:
+        """
+        Update fields on one task.
+
+        If `where` is given, the update only applies when those fields
+        currently match (e.g. the task is still leased to this worker).
+        Returns False if nothing was updated.
+        """
+
+    @abstractmethod
+    def claim(
+        self,
+        worker_id: str,
+        now: str,
+        lease_until: str,
+        priorities: Optional[list[int]] = None,
+    ) -> Optional[dict]:
+        """
+        Atomically take the next pending task and lease it to a worker.
+
+        Tasks whose not_before is still in the future are skipped. If
+        priorities is given, only tasks with one of those priority
+        values are considered. Returns the claimed task (already in
+        progress), or None.
+        """
+
+    @abstractmethod
+    def requeue_expired(self, now: str, max_attempts: int) -> tuple[int, list[str]]:
+        """
+        Put in-progress tasks whose lease ran out back to pending.
+
+        Tasks that already used max_attempts are failed instead.
+        Returns (how many were requeued, IDs of the tasks that failed).
+        """
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[dict]:
+        """Get a single task by ID."""
+
+    @abstractmethod
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        recent_first: bool = False,
+    ) -> list[dict]:
+        """List tasks in insertion order, optionally filtered by status."""
+
+    @abstractmethod
+    def list_finished(self, status: str, limit: int) -> list[dict]:
+        """Most recently finished tasks with a status, oldest first."""
+
+    @abstractmethod
+    def count(self, status: Optional[str] = None) -> int:
+        """Count tasks, optionally filtered by status."""
+
+    @abstractmethod
+    def delete_finished(self) -> int:
+        """Delete completed and failed tasks. Returns how many were removed."""
+
+    @abstractmethod
+    def finished_before(self, cutoff: str, limit: int) -> list[dict]:
+        """Completed/failed tasks that finished before cutoff, oldest first."""
+
+    @abstractmethod
+    def delete(self, task_ids: list[str]) -> int:
+        """Delete tasks by ID. Returns how many were removed."""
+
+    @abstractmethod
+    def change_token(self) -> tuple:
+        """
+        Cheap stamp that changes when the store is modified elsewhere.
+
+        WorkQueue compares this between calls to decide whether its
+        in-memory ready index is stale and has to be rebuilt.
+        """
+
+    def export_all(self) -> list[dict]:
+        """Dump every task, in insertion order."""
+        return self.list_tasks()
+
+    @abstractmethod
+    def import_all(self, tasks: list[dict], replace: bool = False) -> int:
+        """Load tasks in bulk. Existing IDs are overwritten."""
+
+    def close(self):
+        """Release any open handles."""
+
+
+class SQLiteQueueStorage(QueueStorage):
+    """
+    SQLite-backed queue storage (WAL mode).
+
+    WAL lets the daemon read while the CLI or Slack writes, and the
+    status/priority index keeps get_next independent of history size.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,  # autocommit; transactions are explicit
+            check_same_thread=False,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """Create the table and indexes, adding any columns that are missing."""
+        with self._lock:
+            columns = ", ".join(f"{name} {decl}" for name, decl in COLUMNS.items())
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS tasks ({columns})")
+
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+            for name, decl in COLUMNS.items():
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE tasks ADD COLUMN {name} {decl}")
+
+            for name, target in INDEXES.items():
+                self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def _row_to_dict(self, row: sqlite3.Row) -> dict:
+        return {key: row[key] for key in row.keys()}
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "rowid", limit: Optional[int] = None) -> list[dict]:
+        sql = f"SELECT {', '.join(COLUMNS)} FROM tasks"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [self._row_to_dict(r) for r in self._conn.execute(sql, params)]
+
+    def insert(self, task: dict):
+        names = [n for n in COLUMNS if n in task]
+        placeholders = ", ".join("?" for _ in names)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT INTO tasks ({', '.join(names)}) VALUES ({placeholders})",
+                tuple(task[n] for n in names),
+            )
+
+    def _find_duplicate(self, conn: sqlite3.Connection, task: dict) -> Optional[str]:
+        if task.get('idempotency_key'):
+            row = conn.execute(
+                f"SELECT id FROM tasks WHERE idempotency_key = ? "
+                f"AND status IN ({', '.join('?' for _ in KEY_ACTIVE_STATUSES)}) LIMIT 1",
+                (task['idempotency_key'], *KEY_ACTIVE_STATUSES),
+            ).fetchone()
+            if row:
+                return row["id"]
+        if task.get('fingerprint'):
+            row = conn.execute(
+                f"SELECT id FROM tasks WHERE fingerprint = ? "
+                f"AND status IN ({', '.join('?' for _ in FINGERPRINT_ACTIVE_STATUSES)}) LIMIT 1",
+                (task['fingerprint'], *FINGERPRINT_ACTIVE_STATUSES),
+            ).fetchone()
+            if row:
+                return row["id"]
+        return None
+
+    def insert_or_coalesce(self, task: dict) -> tuple[dict, bool]:
+        with self._transaction() as conn:
+            duplicate_id = self._find_duplicate(conn, task)
+            if duplicate_id is None:
+                names = [n for n in COLUMNS if n in task]
+                conn.execute(
+                    f"INSERT INTO tasks ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)})",
+                    tuple(task[n] for n in names),
+                )
+            else:
+                conn.execute(
+                    "UPDATE tasks SET priority = MAX(priority, ?), coalesced = coalesced + 1 WHERE id = ?",
+                    (task['priority'], duplicate_id),
+                )
+                conn.execute(
+                    "INSERT INTO counters (name, value) VALUES ('coalesced', 1) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + 1"
+                )
+        if duplicate_id is None:
+            return task, False
+        return self.get(duplicate_id), True
+
+    def counters(self) -> dict[str, int]:
+        with self._lock:
+            return {row["name"]: row["value"] for row in self._conn.execute("SELECT name, value FROM counters")}
+
+    def update(self, task_id: str, where: Optional[dict] = None, **fields) -> bool:
+        where = where or {}
+        unknown = (set(fields) | set(where)) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown task fields: {', '.join(sorted(unknown))}")
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        conditions = "".join(f" AND {name} IS ?" for name in where)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE tasks SET {assignments} WHERE id = ?{conditions}",
+                (*fields.values(), task_id, *where.values()),
+            )
+        return cursor.rowcount > 0
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE: takes the database write lock up front."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def claim(
+        self,
+        worker_id: str,
+        now: str,
+        lease_until: str,
+        priorities: Optional[list[int]] = None,
+    ) -> Optional[dict]:
+        where, params = "status = 'pending' AND (not_before IS NULL OR not_before <= ?)", (now,)
+        if priorities is not None:
+            if not priorities:
+                return None
+            where += f" AND priority IN ({', '.join('?' for _ in priorities)})"
+            params += tuple(priorities)
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT id FROM tasks WHERE {where} "
+                "ORDER BY priority DESC, created_at LIMIT 1",
+                params,
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'in_progress', started_at = ?, worker_id = ?, "
+                "lease_expires_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (now, worker_id, lease_until, row["id"]),
+            )
+        return self.get(row["id"])
+
+    def requeue_expired(self, now: str, max_attempts: int) -> tuple[int, list[str]]:
+        with self._transaction() as conn:
+            failed = [
+                row["id"] for row in conn.execute(
+                    "SELECT id FROM tasks WHERE status = 'in_progress' AND lease_expires_at < ? AND attempts >= ?",
+                    (now, max_attempts),
+                )
+            ]
+            conn.executemany(
+                "UPDATE tasks SET status = 'failed', completed_at = ?, "
+                "error = 'Lease expired after ' || attempts || ' attempts', "
+                "worker_id = NULL, lease_expires_at = NULL WHERE id = ?",
+                [(now, task_id) for task_id in failed],
+            )
+            requeued = conn.execute(
+                "UPDATE tasks SET status = 'pending', started_at = NULL, "
+                "worker_id = NULL, lease_expires_at = NULL "
+                "WHERE status = 'in_progress' AND lease_expires_at < ?",
+                (now,),
+            ).rowcount
+        return requeued, failed
+
+    def get(self, task_id: str) -> Optional[dict]:
+        rows = self._select("id = ?", (task_id,))
+        return rows[0] if rows else None
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        recent_first: bool = False,
+    ) -> list[dict]:
+        order = "rowid DESC" if recent_first else "rowid"
+        if status:
+            return self._select("status = ?", (status,), order=order, limit=limit)
+        return self._select(order=order, limit=limit)
+
+    def list_finished(self, status: str, limit: int) -> list[dict]:
+        rows = self._select(
+            "status = ?", (status,),
+            order="completed_at DESC",
+            limit=limit,
+        )
+        return list(reversed(rows))
+
+    def count(self, status: Optional[str] = None) -> int:
+        with self._lock:
+            if status:
+                row = self._conn.execute("SELECT COUNT(*) FROM tasks WHERE status = ?", (status,)).fetchone()
+            else:
+                row = self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()
+        return row[0]
+
+    def delete_finished(self) -> int:
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM tasks WHERE status IN ({placeholders})",
+                FINISHED_STATUSES,
+            )
+        return cursor.rowcount
+
+    def finished_before(self, cutoff: str, limit: int) -> list[dict]:
+        placeholders = ", ".join("?" for _ in FINISHED_STATUSES)
+        return self._select(
+            f"status IN ({placeholders}) AND completed_at < ?",
+            (*FINISHED_STATUSES, cutoff),
+            order="completed_at",
+            limit=limit,
+        )
+
+    def delete(self, task_ids: list[str]) -> int:
+        if not task_ids:
+            return 0
+        with self._transaction() as conn:
+            removed = 0
+            for task_id in task_ids:
+                removed += conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount
+        return removed
+
+    def change_token(self) -> tuple:
+        # data_version only moves when *another* connection commits, so our
+        # own writes (already applied to the index) don't force a rebuild.
+        # The inode catches the database file being swapped out entirely.
+        try:
+            inode = os.stat(self.db_path).st_ino
+        except FileNotFoundError:
+            inode = None
+        with self._lock:
+            version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return (inode, version)
+
+    def import_all(self, tasks: list[dict], replace: bool = False) -> int:
+        with self._transaction() as conn:
+            if replace:
+                conn.execute("DELETE FROM tasks")
+            for task in tasks:
+                names = [n for n in COLUMNS if n in task]
+                placeholders = ", ".join("?" for _ in names)
+                conn.execute(
+                    f"INSERT OR REPLACE INTO tasks ({', '.join(names)}) VALUES ({placeholders})",
+                    tuple(task[n] for n in names),
+                )
+        return len(tasks)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class JsonQueueStorage(QueueStorage):
+    """
+    The legacy work_queue.json format.
+
+    Every operation loads and rewrites the whole file, so this is kept
+    for importing old queues and exporting snapshots — not for live use.
+    """
+
+    def __init__(self, json_path: Path):
+        self.json_path = Path(json_path)
+        self.lock_path = self.json_path.with_name(self.json_path.name + ".lock")
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive cross-process lock for a read/modify/write cycle."""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with portalocker.Lock(str(self.lock_path), timeout=30):
+            yield
+
+    def _load(self) -> list[dict]:
+        try:
+            return json.loads(self.json_path.read_text())
+        except Exception:
+            return []
+
+    def _save(self, tasks: list[dict]):
+        self.json_path.parent.mkdir(parents=True, exist_ok=True)
+        self.json_path.write_text(json.dumps(tasks, indent=2))
+
+    def insert(self, task: dict):
+        with self._locked():
+            tasks = self._load()
+            tasks.append(task)
+            self._save(tasks)
+
+    def insert_or_coalesce(self, task: dict) -> tuple[dict, bool]:
+        with self._locked():
+            tasks = self._load()
+            for existing in tasks:
+                same_key = (
+                    task.get('idempotency_key')
+                    and existing.get('idempotency_key') == task['idempotency_key']
+                    and existing['status'] in KEY_ACTIVE_STATUSES
+                )
+                same_content = (
+                    task.get('fingerprint')
+                    and existing.get('fingerprint') == task['fingerprint']
+                    and existing['status'] in FINGERPRINT_ACTIVE_STATUSES
+                )
+                if same_key or same_content:
+                    existing['priority'] = max(existing['priority'], task['priority'])
+                    existing['coalesced'] = existing.get('coalesced', 0) + 1
+                    self._save(tasks)
+                    return dict(existing), True
+            tasks.append(task)
+            self._save(tasks)
+        return task, False
+
+    def counters(self) -> dict[str, int]:
+        # No side table in the JSON format; derive from the tasks present
+        return {'coalesced': sum(t.get('coalesced', 0) for t in self._load())}
+
+    def update(self, task_id: str, where: Optional[dict] = None, **fields) -> bool:
+        where = where or {}
+        with self._locked():
+            tasks = self._load()
+            for task in tasks:
+                if task['id'] == task_id:
+                    if any(task.get(k) != v for k, v in where.items()):
+                        return False
+                    task.update(fields)
+                    self._save(tasks)
+                    return True
+        return False
+
+    def claim(
+        self,
+        worker_id: str,
+        now: str,
+        lease_until: str,
+        priorities: Optional[list[int]] = None,
+    ) -> Optional[dict]:
+        with self._locked():
+            tasks = self._load()
+            pending = [
+                t for t in tasks
+                if t['status'] == 'pending'
+                and (not t.get('not_before') or t['not_before'] <= now)
+                and (priorities is None or t['priority'] in priorities)
+            ]
+            if not pending:
+                return None
+            task = min(pending, key=lambda t: (-t['priority'], t['created_at']))
+            task.update(
+                status='in_progress',
+                started_at=now,
+                worker_id=worker_id,
+                lease_expires_at=lease_until,
+                attempts=task.get('attempts', 0) + 1,
+            )
+            self._save(tasks)
+            return dict(task)
+
+    def requeue_expired(self, now: str, max_attempts: int) -> tuple[int, list[str]]:
+        requeued = 0
+        failed = []
+        with self._locked():
+            tasks = self._load()
+            for task in tasks:
+                lease = task.get('lease_expires_at')
+                if task['status'] != 'in_progress' or not lease or lease >= now:
+                    continue
+                if task.get('attempts', 0) >= max_attempts:
+                    task.update(
+                        status='failed',
+                        completed_at=now,
+                        error=f"Lease expired after {task.get('attempts', 0)} attempts",
+                    )
+                    failed.append(task['id'])
+                else:
+                    task.update(status='pending', started_at=None)
+                    requeued += 1
+                task.update(worker_id=None, lease_expires_at=None)
+            if requeued or failed:
+                self._save(tasks)
+        return requeued, failed
+
+    def get(self, task_id: str) -> Optional[dict]:
+        for task in self._load():
+            if task['id'] == task_id:
+                return task
+        return None
+
+    def list_tasks(
+        self,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        recent_first: bool = False,
+    ) -> list[dict]:
+        tasks = self._load()
+        if status:
+            tasks = [t for t in tasks if t['status'] == status]
+        if recent_first:
+            tasks.reverse()
+        return tasks[:limit] if limit is not None else tasks
+
+    def list_finished(self, status: str, limit: int) -> list[dict]:
+        tasks = [t for t in self._load() if t['status'] == status]
+        tasks.sort(key=lambda t: t.get('completed_at') or "")
+        return tasks[-limit:]
+
+    def count(self, status: Optional[str] = None) -> int:
+        return len(self.list_tasks(status))
+
+    def delete_finished(self) -> int:
+        with self._locked():
+            tasks = self._load()
+            kept = [t for t in tasks if t['status'] not in FINISHED_STATUSES]
+            self._save(kept)
+        return len(tasks) - len(kept)
+
+    def finished_before(self, cutoff: str, limit: int) -> list[dict]:
+        tasks = [
+            t for t in self._load()
+            if t['status'] in FINISHED_STATUSES and (t.get('completed_at') or "") < cutoff
+        ]
+        tasks.sort(key=lambda t: t.get('completed_at') or "")
+        return tasks[:limit]
+
+    def delete(self, task_ids: list[str]) -> int:
+        ids = set(task_ids)
+        with self._locked():
+            tasks = self._load()
+            kept = [t for t in tasks if t['id'] not in ids]
+            self._save(kept)
+        return len(tasks) - len(kept)
+
+    def change_token(self) -> tuple:
+        try:
+            stat = os.stat(self.json_path)
+        except FileNotFoundError:
+            return (None, None, None)
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def import_all(self, tasks: list[dict], replace: bool = False) -> int:
+        with self._locked():
+            if replace:
+                self._save(list(tasks))
+            else:
+                by_id = {t['id']: t for t in self._load()}
+                by_id.update({t['id']: t for t in tasks})
+                self._save(list(by_id.values()))
+        return len(tasks)
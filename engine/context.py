@@ -2,17 +2,36 @@
 Builds context for agents from config and state.
 """
 
+import threading
 import yaml
 from pathlib import Path
 from datetime import datetime
+from typing import Optional
 import pytz
 
 from engine.tools.vault import get_recent_meetings, search_meetings, read_file
 
+CONFIG_PATH = Path(__file__).parent.parent / "config.yaml"
+
+# Parsed config.yaml, reused until the file changes: (mtime_ns, config)
+_config_cache: Optional[tuple[int, dict]] = None
+_config_lock = threading.Lock()
+
+
 def load_config() -> dict:
-    config_path = Path(__file__).parent.parent / "config.yaml"
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    """
+    Load config.yaml, re-parsing only when the file has changed.
+
+    The returned dict is shared by every caller in the process; treat it
+    as read-only.
+    """
+    global _config_cache
+    mtime = CONFIG_PATH.stat().st_mtime_ns
+    with _config_lock:
+        if _config_cache is None or _config_cache[0] != mtime:
+            with open(CONFIG_PATH) as f:
+                _config_cache = (mtime, yaml.safe_load(f))
+        return _config_cache[1]
 
 def get_current_time() -> str:
     tz = pytz.timezone("America/New_York")
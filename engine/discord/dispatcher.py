@@ -24,6 +24,9 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+from engine.discord.poster import register_bot
+from engine.streaming import DISCORD_EDIT_INTERVAL, DISCORD_MESSAGE_LIMIT, StreamRenderer
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -77,6 +80,7 @@ async def run_agent_and_respond(
     """
     Spawn an agent, get response, post to Discord.
     """
+    renderer = None
     try:
         from engine.agents.base import run_vega_streaming
 
@@ -87,26 +91,23 @@ async def run_agent_and_respond(
             mention_author=False
         )
 
-        # Collect the full response
-        full_response = ""
+        # Edit it as the response streams in (rolls over past 2000 chars)
+        renderer = StreamRenderer(
+            edit=lambda msg, text: msg.edit(content=text),
+            post=channel.send,
+            placeholder=thinking_msg,
+            limit=DISCORD_MESSAGE_LIMIT,
+            min_interval=DISCORD_EDIT_INTERVAL,
+            name=f"discord {agent_name}",
+        )
         async for chunk in run_vega_streaming(message):
-            full_response += chunk
-
-        # Edit the message with the response
-        # Discord has 2000 char limit, split if needed
-        if len(full_response) <= 2000:
-            await thinking_msg.edit(content=full_response)
-        else:
-            # Split into chunks
-            await thinking_msg.edit(content=full_response[:2000])
-            remaining = full_response[2000:]
-            while remaining:
-                chunk = remaining[:2000]
-                remaining = remaining[2000:]
-                await channel.send(chunk)
+            await renderer.feed(chunk)
+        await renderer.finish()
 
     except Exception as e:
         logger.error(f"Error running agent: {e}")
+        if renderer is not None:
+            await renderer.abort()
         await channel.send(f"Sorry, I encountered an error: {str(e)}")
 
 
@@ -116,6 +117,9 @@ async def on_ready():
     logger.info(f"Bot is ready! Logged in as {bot.user}")
     logger.info(f"Connected to {len(bot.guilds)} guild(s)")
 
+    # Outbound posts from this process reuse the gateway connection
+    register_bot(bot)
+
     # Load webhook cache
     global _webhook_cache
     _webhook_cache = load_webhooks()
@@ -0,0 +1,87 @@
+"""
+Outbound Discord posting.
+
+One way to say something in a channel, whoever is asking (scheduled
+routines, the autonomous daemon, tools):
+
+- If the bot in engine.main is running in this process, post through
+  its existing gateway connection.
+- Otherwise post over REST (engine.discord.rest) — one HTTP call per
+  message with the channel ID cached, instead of a full gateway login.
+
+Usage:
+    from engine.discord.poster import post
+
+    await post("general", "Morning brief is ready")
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+import discord
+
+from engine.discord.rest import get_rest, split_message
+
+logger = logging.getLogger(__name__)
+
+_bot: Optional[discord.Client] = None
+
+
+def register_bot(bot: discord.Client):
+    """Make a connected bot available for outbound posts (call from on_ready)."""
+    global _bot
+    _bot = bot
+
+
+def get_bot() -> Optional[discord.Client]:
+    """The registered bot, if it's connected."""
+    if _bot is not None and _bot.is_ready() and not _bot.is_closed():
+        return _bot
+    return None
+
+
+async def _post_via_bot(bot: discord.Client, channel_name: str, content: str) -> bool:
+    channel = discord.utils.get(bot.get_all_channels(), name=channel_name)
+    if not isinstance(channel, discord.abc.Messageable):
+        logger.error(f"Channel not found: {channel_name}")
+        return False
+    for chunk in split_message(content):
+        await channel.send(chunk)
+    return True
+
+
+async def _post_via_rest(channel_name: str, content: str) -> bool:
+    rest = get_rest()
+    channel_id = await rest.resolve_channel(channel_name)
+    if channel_id is None:
+        logger.error(f"Channel not found: {channel_name}")
+        return False
+    await rest.send_message(channel_id, content)
+    return True
+
+
+async def post(channel_name: str, content: str) -> bool:
+    """
+    Post a message to a Discord channel by name.
+
+    Returns True if the message was posted.
+    """
+    channel_name = channel_name.lstrip("#")
+    bot = get_bot()
+    try:
+        if bot is None:
+            posted = await _post_via_rest(channel_name, content)
+        elif asyncio.get_running_loop() is bot.loop:
+            posted = await _post_via_bot(bot, channel_name, content)
+        else:
+            # Called from another thread/loop: hand the send to the bot's loop
+            future = asyncio.run_coroutine_threadsafe(_post_via_bot(bot, channel_name, content), bot.loop)
+            posted = await asyncio.wrap_future(future)
+    except Exception as e:
+        logger.error(f"Failed to post to #{channel_name}: {e}")
+        return False
+
+    if posted:
+        logger.info(f"Posted to #{channel_name} ({'gateway' if bot else 'REST'})")
+    return posted
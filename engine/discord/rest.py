@@ -0,0 +1,416 @@
+"""
+Discord REST client.
+
+Talks to the Discord HTTP API directly over a pooled aiohttp session —
+no gateway login, no on_ready wait. Used for outbound posting when the
+bot in engine.main isn't running in this process, and by every function
+in engine.tools.discord_async (and its sync wrappers).
+
+Features:
+- One pooled session per event loop (keep-alive connections)
+- Rate-limit buckets from X-RateLimit-* headers: requests wait for their
+  bucket (or the global limit) to reset instead of eating 429s
+- Cached directory of guilds, channels, roles and members, so names
+  resolve to IDs without extra requests (refreshed on expiry, and on a
+  lookup miss at most once per MISS_REFRESH_SECONDS)
+
+Usage:
+    from engine.discord.rest import get_rest
+
+    rest = get_rest()
+    channel = await rest.find_channel("general")
+    await rest.send_message(channel["id"], "hello")
+"""
+
+import asyncio
+import logging
+import os
+import re
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Optional
+
+import aiohttp
+
+from engine.streaming import split_at_boundary
+
+logger = logging.getLogger(__name__)
+
+API_BASE = "https://discord.com/api/v10"
+
+# Discord's per-message character limit
+MESSAGE_LIMIT = 2000
+
+# The directory is refreshed after this long (or on a miss)
+DIRECTORY_TTL_SECONDS = 600
+
+# At most one miss-triggered refresh per this many seconds
+MISS_REFRESH_SECONDS = 60
+
+# Channel types
+TEXT_CHANNEL = 0
+VOICE_CHANNEL = 2
+CATEGORY_CHANNEL = 4
+ANNOUNCEMENT_CHANNEL = 5
+TEXT_CHANNEL_TYPES = (TEXT_CHANNEL, ANNOUNCEMENT_CHANNEL)
+
+# Permission bit for seeing a channel
+VIEW_CHANNEL = 1 << 10
+
+# Path segments whose following ID is a "major parameter" — rate limits
+# are tracked separately per channel/guild/webhook
+MAJOR_PARAMETERS = ("channels", "guilds", "webhooks")
+
+
+def split_message(content: str, limit: int = MESSAGE_LIMIT) -> list[str]:
+    """Split content into Discord-sized chunks, on clean boundaries."""
+    chunks = []
+    while len(content) > limit:
+        head, content = split_at_boundary(content, limit)
+        chunks.append(head)
+    return chunks + [content]
+
+
+def _route_key(method: str, path: str) -> str:
+    """Rate-limit route: the path with minor IDs wildcarded, major ones kept."""
+    segments = path.split("?")[0].strip("/").split("/")
+    route = []
+    for i, segment in enumerate(segments):
+        if segment.isdigit() and not (i and segments[i - 1] in MAJOR_PARAMETERS):
+            segment = ":id"
+        route.append(segment)
+    return f"{method} /{'/'.join(route)}"
+
+
+class DiscordAPIError(Exception):
+    """Non-success response from the Discord API."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Discord API {status}: {message}")
+        self.status = status
+
+
+@dataclass
+class _Bucket:
+    remaining: Optional[int] = None  # None until Discord tells us
+    reset_at: float = 0.0            # monotonic time the window resets
+
+
+@dataclass
+class Directory:
+    """Snapshot of the guilds the bot is in: channels, roles, members."""
+    guilds: list[dict] = field(default_factory=list)
+    channels: dict[str, list[dict]] = field(default_factory=dict)  # guild ID -> channels
+    roles: dict[str, list[dict]] = field(default_factory=dict)     # guild ID -> roles
+    members: dict[str, list[dict]] = field(default_factory=dict)   # guild ID -> members
+    loaded_at: Optional[float] = None  # monotonic time of the load; None = never loaded
+
+    def expired(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > DIRECTORY_TTL_SECONDS
+
+    def guild_ids(self, guild_name: Optional[str] = None) -> list[str]:
+        return [
+            g["id"] for g in self.guilds
+            if guild_name is None or g["name"].lower() == guild_name.lower()
+        ]
+
+
+class DiscordREST:
+    """
+    Async Discord HTTP client with rate-limit buckets and a cached directory.
+
+    One aiohttp session (and its connection pool) is kept per event loop,
+    since sessions can't be shared across loops. Rate-limit state and the
+    directory are plain data shared by all of them.
+    """
+
+    def __init__(self, token: Optional[str] = None):
+        self._token = token
+        self._sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+        # Route -> bucket hash (from X-RateLimit-Bucket), bucket key -> state
+        self._bucket_hashes: dict[str, str] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self._global_reset_at = 0.0
+
+        self.directory = Directory()
+        self._last_miss_refresh: Optional[float] = None
+        self._me: Optional[dict] = None
+        self._dm_channels: dict[str, str] = {}  # user ID -> DM channel ID
+
+    @property
+    def token(self) -> str:
+        token = self._token or os.getenv("DISCORD_TOKEN")
+        if not token:
+            raise ValueError("DISCORD_TOKEN not set")
+        return token
+
+    def _session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = aiohttp.ClientSession(
+                headers={
+                    "Authorization": f"Bot {self.token}",
+                    "User-Agent": "DiscordBot (jpa-os, 1.0)",
+                },
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=30),
+            )
+            self._sessions[loop] = session
+        return session
+
+    # ------------------------------------------------------------------
+    # Requests and rate limits
+    # ------------------------------------------------------------------
+
+    def _bucket_key(self, method: str, path: str) -> str:
+        route = _route_key(method, path)
+        bucket_hash = self._bucket_hashes.get(route)
+        if bucket_hash is None:
+            return route
+        # Same bucket hash, different major parameter = different bucket
+        major = re.findall(r"/(?:channels|guilds|webhooks)/(\d+)", path)
+        return f"{bucket_hash}:{major[0] if major else ''}"
+
+    async def _wait_for_bucket(self, key: str):
+        """Sleep until this bucket (and the global limit) has room."""
+        now = time.monotonic()
+        delay = max(0.0, self._global_reset_at - now)
+
+        bucket = self._buckets.get(key)
+        if bucket is not None and bucket.remaining is not None:
+            if bucket.remaining <= 0 and bucket.reset_at > now:
+                delay = max(delay, bucket.reset_at - now)
+            else:
+                bucket.remaining -= 1  # reserve a slot for this request
+
+        if delay > 0:
+            logger.debug(f"Discord rate limit: waiting {delay:.2f}s for {key}")
+            await asyncio.sleep(delay)
+
+    def _update_bucket(self, method: str, path: str, headers) -> str:
+        """Record rate-limit headers from a response. Returns the bucket key."""
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        if bucket_hash:
+            self._bucket_hashes[_route_key(method, path)] = bucket_hash
+        key = self._bucket_key(method, path)
+
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if remaining is not None and reset_after is not None:
+            self._buckets[key] = _Bucket(
+                remaining=int(remaining),
+                reset_at=time.monotonic() + float(reset_after),
+            )
+        return key
+
+    async def request(self, method: str, path: str, reason: Optional[str] = None, **kwargs):
+        """
+        Make an API request, respecting rate-limit buckets.
+
+        Args:
+            method: HTTP method
+            path: API path, e.g. "/channels/123/messages"
+            reason: Audit log reason (for destructive actions)
+            **kwargs: Passed to aiohttp (json=, params=, ...)
+
+        Returns:
+            The decoded JSON body (None for 204 No Content)
+        """
+        session = self._session()
+        if reason:
+            kwargs["headers"] = {**kwargs.get("headers", {}), "X-Audit-Log-Reason": reason}
+
+        for attempt in range(5):
+            await self._wait_for_bucket(self._bucket_key(method, path))
+
+            async with session.request(method, f"{API_BASE}{path}", **kwargs) as resp:
+                key = self._update_bucket(method, path, resp.headers)
+
+                if resp.status == 429:
+                    body = await resp.json()
+                    retry_after = float(body.get("retry_after", 1))
+                    if body.get("global") or resp.headers.get("X-RateLimit-Global"):
+                        self._global_reset_at = time.monotonic() + retry_after
+                    else:
+                        self._buckets[key] = _Bucket(remaining=0, reset_at=time.monotonic() + retry_after)
+                    logger.warning(f"Discord rate limited on {method} {path}, retrying in {retry_after:.2f}s")
+                    continue
+
+                if resp.status == 204:
+                    return None
+                if resp.status >= 400:
+                    raise DiscordAPIError(resp.status, await resp.text())
+                return await resp.json()
+
+        raise DiscordAPIError(429, f"Still rate limited after retries: {method} {path}")
+
+    # ------------------------------------------------------------------
+    # Directory
+    # ------------------------------------------------------------------
+
+    async def me(self) -> dict:
+        """The bot's own user (cached)."""
+        if self._me is None:
+            self._me = await self.request("GET", "/users/@me")
+        return self._me
+
+    async def refresh_directory(self) -> Directory:
+        """Reload guilds, channels, roles and members."""
+        directory = Directory()
+        directory.guilds = await self.request("GET", "/users/@me/guilds")
+        for guild in directory.guilds:
+            gid = guild["id"]
+            directory.channels[gid] = await self.request("GET", f"/guilds/{gid}/channels")
+            directory.roles[gid] = await self.request("GET", f"/guilds/{gid}/roles")
+            try:
+                directory.members[gid] = await self.request(
+                    "GET", f"/guilds/{gid}/members", params={"limit": 1000}
+                )
+            except DiscordAPIError as e:
+                # Needs the Server Members intent enabled for the bot
+                logger.warning(f"Can't list members of {guild['name']}: {e}")
+                directory.members[gid] = []
+        directory.loaded_at = time.monotonic()
+        self.directory = directory
+        return directory
+
+    def _may_refresh_on_miss(self) -> bool:
+        """Allow one miss-triggered refresh per MISS_REFRESH_SECONDS."""
+        last = self._last_miss_refresh
+        if last is not None and time.monotonic() - last < MISS_REFRESH_SECONDS:
+            return False
+        self._last_miss_refresh = time.monotonic()
+        return True
+
+    async def _find(self, search) -> Optional[dict]:
+        """
+        Run search(directory) on the cached directory.
+
+        An expired directory is refreshed first. A miss refreshes it too,
+        but only once per MISS_REFRESH_SECONDS, so repeated lookups of a
+        name that doesn't exist don't each reload every guild.
+        """
+        if not self.directory.expired():
+            found = search(self.directory)
+            if found is not None or not self._may_refresh_on_miss():
+                return found
+        return search(await self.refresh_directory())
+
+    async def guilds(self) -> list[dict]:
+        if self.directory.expired():
+            await self.refresh_directory()
+        return self.directory.guilds
+
+    async def find_guild(self, guild_name: Optional[str] = None) -> Optional[dict]:
+        """A guild by name, or the first guild if no name is given."""
+        def search(d: Directory):
+            ids = d.guild_ids(guild_name)
+            return next((g for g in d.guilds if g["id"] in ids), None)
+        return await self._find(search)
+
+    async def find_channel(
+        self,
+        name: str,
+        guild_name: Optional[str] = None,
+        types: tuple = TEXT_CHANNEL_TYPES,
+    ) -> Optional[dict]:
+        """A channel by name (text channels by default)."""
+        name = name.lstrip("#")
+
+        def search(d: Directory):
+            for gid in d.guild_ids(guild_name):
+                for channel in d.channels.get(gid, []):
+                    if channel["name"] == name and channel["type"] in types:
+                        return channel
+            return None
+        return await self._find(search)
+
+    async def find_member(self, username: str, guild_name: Optional[str] = None) -> Optional[dict]:
+        """A guild member by username (or legacy name#discriminator)."""
+        wanted = username.lower()
+
+        def search(d: Directory):
+            for gid in d.guild_ids(guild_name):
+                for member in d.members.get(gid, []):
+                    user = member["user"]
+                    tag = f"{user['username']}#{user.get('discriminator', '0')}"
+                    if user["username"].lower() == wanted or tag == username:
+                        return {**member, "guild_id": gid}
+            return None
+        return await self._find(search)
+
+    async def find_role(self, name: str, guild_name: Optional[str] = None) -> Optional[dict]:
+        """A role by exact name."""
+        def search(d: Directory):
+            for gid in d.guild_ids(guild_name):
+                for role in d.roles.get(gid, []):
+                    if role["name"] == name:
+                        return {**role, "guild_id": gid}
+            return None
+        return await self._find(search)
+
+    async def resolve_channel(self, name: str, guild_name: Optional[str] = None) -> Optional[str]:
+        """Channel ID for a text channel name."""
+        channel = await self.find_channel(name, guild_name)
+        return channel["id"] if channel else None
+
+    def forget_channel(self, channel_id: str):
+        """Drop a deleted channel from the cached directory."""
+        for channels in self.directory.channels.values():
+            channels[:] = [c for c in channels if c["id"] != channel_id]
+
+    def remember_channel(self, channel: dict):
+        """Add a newly created channel to the cached directory."""
+        self.directory.channels.setdefault(channel["guild_id"], []).append(channel)
+
+    # ------------------------------------------------------------------
+    # Actions
+    # ------------------------------------------------------------------
+
+    async def send_message(self, channel_id: str, content: str) -> list[dict]:
+        """Post content to a channel, split at the message limit."""
+        return [
+            await self.request("POST", f"/channels/{channel_id}/messages", json={"content": chunk})
+            for chunk in split_message(content)
+        ]
+
+    async def dm_channel(self, user_id: str) -> str:
+        """ID of the DM channel with a user (cached)."""
+        if user_id not in self._dm_channels:
+            channel = await self.request("POST", "/users/@me/channels", json={"recipient_id": user_id})
+            self._dm_channels[user_id] = channel["id"]
+        return self._dm_channels[user_id]
+
+    async def execute_webhook(self, webhook_url: str, **payload):
+        """Post through a webhook URL (content=, username=, avatar_url=)."""
+        webhook_id, webhook_token = webhook_url.split("/webhooks/", 1)[1].split("/")[:2]
+        payload = {k: v for k, v in payload.items() if v is not None}
+        return await self.request("POST", f"/webhooks/{webhook_id}/{webhook_token}", json=payload)
+
+    async def create_webhook(self, channel_id: str, name: str, reason: Optional[str] = None) -> str:
+        """Create a webhook in a channel and return its URL."""
+        webhook = await self.request(
+            "POST", f"/channels/{channel_id}/webhooks", reason=reason, json={"name": name}
+        )
+        return f"https://discord.com/api/webhooks/{webhook['id']}/{webhook['token']}"
+
+    async def close(self):
+        """Close the session for the current loop."""
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None and not session.closed:
+            await session.close()
+
+
+_rest_instance = None
+
+def get_rest() -> DiscordREST:
+    """Get the shared Discord REST client."""
+    global _rest_instance
+    if _rest_instance is None:
+        _rest_instance = DiscordREST()
+    return _rest_instance
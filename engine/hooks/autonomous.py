@@ -13,8 +13,8 @@ from claude_agent_sdk import HookContext
 
 logger = logging.getLogger(__name__)
 
-# Path to the work queue file
-WORK_QUEUE_PATH = Path("/Users/jpa/jpa-os/vault/hive/work_queue.md")
+# How many pending tasks to list in the Stop hook message
+PENDING_WORK_PREVIEW = 5
 
 
 async def check_for_more_work(
@@ -40,13 +40,13 @@ async def check_for_more_work(
     pending_work = _get_pending_work()
 
     if pending_work:
-        logger.info(f"Stop hook: Found {len(pending_work)} pending tasks")
+        logger.info(f"Stop hook: Found {pending_work['pending']} pending tasks")
         return {
             'systemMessage': f"""
-AUTONOMOUS MODE: You have pending tasks in the work queue.
+AUTONOMOUS MODE: You have {pending_work['pending']} pending task(s) in the work queue.
 Before fully stopping, please review and address these items:
 
-{_format_work_items(pending_work)}
+{_format_work_items(pending_work['items'])}
 
 If you've completed your current task and these items need attention,
 continue working on them. Otherwise, acknowledge completion.
@@ -86,30 +86,33 @@ async def log_stop_reason(
     return {}
 
 
-def _get_pending_work() -> list[dict]:
+def _get_pending_work() -> dict:
     """
-    Read pending work items from the queue.
+    Look up pending work in the queue.
 
-    Returns a list of pending tasks if the queue exists.
+    Uses the shared queue's cached summary, which the daemon in this
+    process keeps current and which is only rebuilt when another process
+    changes the store, so this is cheap on every Stop event. Returns {}
+    if nothing is pending.
     """
-    if not WORK_QUEUE_PATH.exists():
-        return []
-
     try:
-        content = WORK_QUEUE_PATH.read_text()
-        # Simple parsing: look for unchecked items
-        pending = []
-        for line in content.split('\n'):
-            line = line.strip()
-            if line.startswith('- [ ]'):
-                pending.append({
-                    'task': line[5:].strip(),
-                    'status': 'pending'
-                })
-        return pending
+        from engine.autonomous.queue import get_queue
+        summary = get_queue().pending_summary(limit=PENDING_WORK_PREVIEW)
     except Exception as e:
         logger.error(f"Error reading work queue: {e}")
-        return []
+        return {}
+
+    if not summary.pending:
+        return {}
+
+    return {
+        'pending': summary.pending,
+        'in_progress': summary.in_progress,
+        'items': [
+            {'task': f"{description} ({priority})", 'status': 'pending'}
+            for description, priority in summary.top
+        ],
+    }
 
 
 def _format_work_items(items: list[dict]) -> str:
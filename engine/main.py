@@ -1,8 +1,9 @@
 """
 jpa-os Main Entry Point
 
-Runs both the Discord dispatcher (for receiving messages) and the scheduler
-(for autonomous routines) in parallel.
+Defines the Discord bot (for receiving messages) and runs it alongside the
+scheduler (for autonomous routines) in one supervised runtime — see
+engine/runtime.py, which hosts both as services.
 
 Usage:
     python -m engine.main
@@ -13,17 +14,19 @@ This is what Railway should run.
 import asyncio
 import logging
 import os
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from datetime import datetime
 
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from dotenv import load_dotenv
 
 load_dotenv()
 
+from engine.discord.poster import register_bot
+from engine.scheduler.core import TIMEZONE
 from engine.scheduler.routines import ROUTINES
 from engine.scheduler.runner import run_routine
+from engine.streaming import DISCORD_EDIT_INTERVAL, DISCORD_MESSAGE_LIMIT, StreamRenderer
 
 # Setup logging
 logging.basicConfig(
@@ -32,9 +35,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Timezone
-TIMEZONE = ZoneInfo("America/New_York")
-
 # Bot setup
 intents = discord.Intents.default()
 intents.message_content = True
@@ -43,33 +43,31 @@ intents.guilds = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
 
-# Track last run times for routines
-last_run = {}
-
 
 async def run_agent_and_respond(message: str, channel: discord.TextChannel, reference=None):
     """Run Vega and respond in Discord."""
+    renderer = None
     try:
         from engine.agents.base import run_vega_streaming
 
         thinking_msg = await channel.send("_thinking..._", reference=reference, mention_author=False)
 
-        full_response = ""
+        renderer = StreamRenderer(
+            edit=lambda msg, text: msg.edit(content=text),
+            post=channel.send,
+            placeholder=thinking_msg,
+            limit=DISCORD_MESSAGE_LIMIT,
+            min_interval=DISCORD_EDIT_INTERVAL,
+            name="discord Vega",
+        )
         async for chunk in run_vega_streaming(message):
-            full_response += chunk
-
-        if len(full_response) <= 2000:
-            await thinking_msg.edit(content=full_response)
-        else:
-            await thinking_msg.edit(content=full_response[:2000])
-            remaining = full_response[2000:]
-            while remaining:
-                chunk = remaining[:2000]
-                remaining = remaining[2000:]
-                await channel.send(chunk)
+            await renderer.feed(chunk)
+        await renderer.finish()
 
     except Exception as e:
         logger.error(f"Error running agent: {e}")
+        if renderer is not None:
+            await renderer.abort()
         await channel.send(f"Sorry, I encountered an error: {str(e)}")
 
 
@@ -79,10 +77,8 @@ async def on_ready():
     logger.info(f"Bot is ready! Logged in as {bot.user}")
     logger.info(f"Connected to {len(bot.guilds)} guild(s)")
 
-    # Start the scheduler
-    if not scheduler_check.is_running():
-        scheduler_check.start()
-        logger.info("Scheduler started")
+    # Routines and tools post through this connection instead of logging in again
+    register_bot(bot)
 
     # Set status
     await bot.change_presence(
@@ -116,40 +112,6 @@ async def on_message(message: discord.Message):
     await bot.process_commands(message)
 
 
-@tasks.loop(minutes=1)
-async def scheduler_check():
-    """Check if any routines should run."""
-    from croniter import croniter
-
-    now = datetime.now(TIMEZONE)
-    current_minute = now.strftime("%Y-%m-%d %H:%M")
-
-    for routine in ROUTINES:
-        if not routine.enabled:
-            continue
-
-        cron = croniter(routine.schedule, now.replace(second=0, microsecond=0) - timedelta(minutes=1))
-        next_run = cron.get_next(datetime)
-
-        if next_run.strftime("%Y-%m-%d %H:%M") == current_minute:
-            if last_run.get(routine.name) != current_minute:
-                logger.info(f"Triggering routine: {routine.name}")
-                last_run[routine.name] = current_minute
-
-                try:
-                    # Run the routine
-                    await run_routine(routine.name)
-                    logger.info(f"Routine {routine.name} completed")
-                except Exception as e:
-                    logger.error(f"Routine {routine.name} failed: {e}")
-
-
-@scheduler_check.before_loop
-async def before_scheduler():
-    """Wait for bot to be ready before starting scheduler."""
-    await bot.wait_until_ready()
-
-
 @bot.command(name="ping")
 async def ping(ctx):
     await ctx.send(f"Pong! {round(bot.latency * 1000)}ms")
@@ -182,16 +144,17 @@ async def run_now(ctx, routine_name: str):
 
 
 async def main():
-    """Start everything."""
-    token = os.getenv("DISCORD_TOKEN")
-    if not token:
+    """Start everything: the bot and the scheduler, supervised by the runtime."""
+    from engine.runtime import DiscordService, Runtime, SchedulerService
+
+    if not os.getenv("DISCORD_TOKEN"):
         logger.error("DISCORD_TOKEN not set")
         return
 
     logger.info("Starting jpa-os...")
     logger.info(f"Loaded {len(ROUTINES)} routines")
 
-    await bot.start(token)
+    await Runtime([DiscordService("discord", bot=bot), SchedulerService()]).run()
 
 
 if __name__ == "__main__":
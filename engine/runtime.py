@@ -0,0 +1,689 @@
+"""
+jpa-os Runtime
+
+Hosts any subset of jpa-os's long-running components as services in one
+process, on one event loop:
+
+- discord: the Discord bot from engine/main.py
+- discord-dispatcher: the Discord bot from engine/discord/dispatcher.py
+  (webhook agent identities; logs in with the same token, so run one or
+  the other)
+- slack: the Slack dispatcher (Socket Mode)
+- scheduler: the routine scheduler
+- autonomous: the autonomous work-queue daemon
+
+Hosted together they share what separate processes each built for
+themselves: one import of the agent SDK, one parsed config
+(engine.context.load_config), one HTTP pool per API (the loop's Discord
+REST session and Slack web client) and one cap on concurrent agent
+sessions (engine.agents.sessions). When Discord or Slack is hosted, Vega
+agent sessions are kept warm (engine.agents.pool) so replies skip CLI
+startup.
+
+Supervision:
+- A service that crashes or exits is restarted with exponential backoff;
+  one that keeps failing (max_restarts within restart_window) is given
+  up on while the others keep running
+- Health checks every health_interval seconds (after a startup grace);
+  a service unhealthy for unhealthy_threshold checks in a row is restarted
+- SIGINT/SIGTERM stop every service gracefully (in-flight work drains up
+  to stop_timeout); a second signal cancels immediately
+
+Usage:
+    python -m engine.runtime                       # $JPA_SERVICES, or discord,scheduler
+    python -m engine.runtime slack scheduler autonomous
+    python -m engine.runtime all
+"""
+
+import argparse
+import asyncio
+import importlib
+import logging
+import math
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+load_dotenv()
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Seconds between health checks
+DEFAULT_HEALTH_INTERVAL = 30.0
+
+# Consecutive failed health checks before a service is restarted
+DEFAULT_UNHEALTHY_THRESHOLD = 3
+
+# Seconds a health check may take before it counts as failed
+HEALTH_CHECK_TIMEOUT = 10.0
+
+# Seconds after a (re)start before health checks count
+DEFAULT_STARTUP_GRACE = 60.0
+
+# A service restarted more than max_restarts times within restart_window
+# seconds is given up on
+DEFAULT_MAX_RESTARTS = 5
+DEFAULT_RESTART_WINDOW = 15 * 60
+
+# Restart backoff: doubles per consecutive failure, capped
+BACKOFF_INITIAL_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 300.0
+
+# Seconds services get to stop gracefully on shutdown
+DEFAULT_STOP_TIMEOUT = 60.0
+
+# A scheduler whose next fire is this far overdue is stuck
+SCHEDULER_MAX_LAG = timedelta(minutes=5)
+
+# Warm Vega sessions kept ready for interactive services
+DEFAULT_WARM_SESSIONS = 1
+
+
+class FatalServiceError(Exception):
+    """Raised by a service when restarting it won't help (bad token, etc.)."""
+
+
+# ============================================================================
+# Services
+# ============================================================================
+
+class Service:
+    """
+    A long-running component hosted by the runtime.
+
+    run() runs the service until it stops, returning (or raising) when it
+    does; stop() asks a running run() to return. Override healthy() to
+    report liveness beyond "run() hasn't exited".
+    """
+
+    name = "service"
+    startup_grace = DEFAULT_STARTUP_GRACE
+    interactive = False  # answers people (wants warm agent sessions)
+
+    def problem(self) -> Optional[str]:
+        """Why the service can't start at all (e.g. a missing token), or None."""
+        return None
+
+    async def run(self):
+        raise NotImplementedError
+
+    async def stop(self):
+        pass
+
+    async def healthy(self) -> bool:
+        return True
+
+    def describe(self) -> str:
+        """Short live status for the runtime summary."""
+        return ""
+
+
+class DiscordService(Service):
+    """A discord.py bot defined at module level as `bot`."""
+
+    startup_grace = 120.0
+    interactive = True
+
+    def __init__(self, name: str = "discord", module: str = "engine.main", bot=None):
+        """
+        Args:
+            name: Service name
+            module: Module defining `bot` (imported on first start)
+            bot: The bot itself, if the caller already has it
+        """
+        self.name = name
+        self.module = module
+        self.bot = bot
+
+    def problem(self) -> Optional[str]:
+        if not os.getenv("DISCORD_TOKEN"):
+            return "DISCORD_TOKEN not set"
+        return None
+
+    async def run(self):
+        import discord
+
+        if self.bot is None:
+            self.bot = importlib.import_module(self.module).bot
+        bot = self.bot
+        if bot.is_closed():
+            bot.clear()  # re-open after a previous run closed it
+
+        try:
+            await bot.start(os.getenv("DISCORD_TOKEN"))
+        except discord.LoginFailure as e:
+            raise FatalServiceError(f"Discord login failed: {e}") from e
+        finally:
+            if not bot.is_closed():
+                await bot.close()
+
+    async def stop(self):
+        if self.bot is not None and not self.bot.is_closed():
+            await self.bot.close()
+
+    async def healthy(self) -> bool:
+        bot = self.bot
+        return (
+            bot is not None
+            and not bot.is_closed()
+            and bot.is_ready()
+            and math.isfinite(bot.latency)
+        )
+
+    def describe(self) -> str:
+        bot = self.bot
+        if bot is None or not bot.is_ready():
+            return "connecting"
+        return f"{bot.latency * 1000:.0f}ms latency, {len(bot.guilds)} guild(s)"
+
+
+class SlackService(Service):
+    """The Slack dispatcher over Socket Mode."""
+
+    name = "slack"
+    interactive = True
+
+    def __init__(self):
+        self.handler = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    def problem(self) -> Optional[str]:
+        from engine.slack.client import missing_tokens
+        return missing_tokens()
+
+    async def run(self):
+        from engine.slack import dispatcher
+
+        self._stopped = asyncio.Event()
+        self.handler = await dispatcher.create_handler()
+        try:
+            await self.handler.connect_async()
+            logger.info("Slack dispatcher connected")
+            await self._stopped.wait()
+        finally:
+            await self.handler.close_async()
+            dispatcher.log_session_stats()
+
+    async def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def healthy(self) -> bool:
+        return self.handler is not None and await self.handler.client.is_connected()
+
+
+class SchedulerService(Service):
+    """The routine scheduler."""
+
+    name = "scheduler"
+
+    def __init__(self):
+        self.scheduler = None
+        self._stopped: Optional[asyncio.Event] = None
+
+    async def run(self):
+        from engine.scheduler.daemon import build_scheduler, scheduler_loop
+
+        self._stopped = asyncio.Event()
+        self.scheduler = build_scheduler()
+        await scheduler_loop(self._stopped, scheduler=self.scheduler)
+
+    async def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def healthy(self) -> bool:
+        """False if a fire is long overdue (the loop isn't dispatching)."""
+        next_at = self.scheduler.next_fire_at() if self.scheduler else None
+        return next_at is None or self.scheduler.now() - next_at < SCHEDULER_MAX_LAG
+
+    def describe(self) -> str:
+        if self.scheduler is None:
+            return ""
+        running = self.scheduler.running()
+        next_at = self.scheduler.next_fire_at()
+        parts = [f"{len(running)} running"]
+        if next_at:
+            parts.append(f"next {next_at.strftime('%a %H:%M %Z')}")
+        return ", ".join(parts)
+
+
+class AutonomousService(Service):
+    """The autonomous work-queue daemon."""
+
+    name = "autonomous"
+
+    def __init__(self, workers: Optional[int] = None, drain_timeout: float = DEFAULT_STOP_TIMEOUT - 15):
+        """
+        Args:
+            workers: Concurrent agent sessions (defaults to $JPA_DAEMON_WORKERS, or 1)
+            drain_timeout: Seconds in-flight tasks get to finish on stop
+        """
+        self.workers = workers or int(os.getenv("JPA_DAEMON_WORKERS", 1))
+        self.drain_timeout = drain_timeout
+        self.daemon = None
+
+    async def run(self):
+        from engine.autonomous.daemon import AutonomousDaemon
+
+        # Signals are handled by the runtime, which stops us via stop()
+        self.daemon = AutonomousDaemon(
+            workers=self.workers,
+            drain_timeout=self.drain_timeout,
+            handle_signals=False,
+        )
+        await self.daemon.start()
+
+    async def stop(self):
+        if self.daemon is not None:
+            self.daemon.stop()
+
+    async def healthy(self) -> bool:
+        return self.daemon is not None and self.daemon.running
+
+    def describe(self) -> str:
+        if self.daemon is None:
+            return ""
+        busy = sum(1 for w in self.daemon.worker_stats.values() if w.current_task)
+        return f"{busy}/{self.daemon.workers} workers busy, {self.daemon.tasks_processed} tasks processed"
+
+
+SERVICES = {
+    "discord": lambda: DiscordService("discord", "engine.main"),
+    "discord-dispatcher": lambda: DiscordService("discord-dispatcher", "engine.discord.dispatcher"),
+    "slack": SlackService,
+    "scheduler": SchedulerService,
+    "autonomous": AutonomousService,
+}
+
+# What `python -m engine.main` has always run
+DEFAULT_SERVICES = ["discord", "scheduler"]
+
+# Expansion of "all"
+ALL_SERVICES = ["discord", "slack", "scheduler", "autonomous"]
+
+
+def build_services(names: list[str]) -> list[Service]:
+    """
+    Create services by name.
+
+    Args:
+        names: Service names (see SERVICES), or "all"
+
+    Raises:
+        ValueError: For an unknown name, or both Discord bots at once
+    """
+    expanded = []
+    for name in names:
+        name = name.strip().lower()
+        for n in (ALL_SERVICES if name == "all" else [name]):
+            if n and n not in expanded:
+                expanded.append(n)
+
+    unknown = [n for n in expanded if n not in SERVICES]
+    if unknown:
+        raise ValueError(f"Unknown service(s): {', '.join(unknown)} (available: {', '.join(SERVICES)})")
+    if "discord" in expanded and "discord-dispatcher" in expanded:
+        raise ValueError("discord and discord-dispatcher log in as the same bot; run one or the other")
+    return [SERVICES[n]() for n in expanded]
+
+
+# ============================================================================
+# Supervisor
+# ============================================================================
+
+@dataclass
+class ServiceStatus:
+    """Supervision state for one service."""
+    service: Service
+    state: str = "pending"  # pending, running, backoff, stopped, failed
+    starts: int = 0
+    started_at: Optional[float] = None
+    restarts: deque = field(default_factory=deque)  # monotonic times, within the window
+    total_restarts: int = 0
+    unhealthy: int = 0  # consecutive failed health checks
+    last_error: Optional[str] = None
+    restart_reason: Optional[str] = None  # set when the supervisor stops it for a restart
+    task: Optional[asyncio.Task] = None  # current run()
+    supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def uptime(self) -> float:
+        if self.state != "running" or self.started_at is None:
+            return 0.0
+        return time.monotonic() - self.started_at
+
+
+class Runtime:
+    """Runs services on one event loop, restarting them when they fail."""
+
+    def __init__(
+        self,
+        services: list[Service],
+        health_interval: float = DEFAULT_HEALTH_INTERVAL,
+        unhealthy_threshold: int = DEFAULT_UNHEALTHY_THRESHOLD,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        restart_window: float = DEFAULT_RESTART_WINDOW,
+        stop_timeout: float = DEFAULT_STOP_TIMEOUT,
+        warm_sessions: Optional[int] = None,
+    ):
+        """
+        Args:
+            services: Services to host (names must be unique)
+            health_interval: Seconds between health checks
+            unhealthy_threshold: Failed checks in a row before a restart
+            max_restarts: Restarts allowed within restart_window before
+                the service is given up on
+            restart_window: Seconds over which restarts are counted
+            stop_timeout: Seconds services get to stop on shutdown before
+                they're cancelled
+            warm_sessions: Vega sessions kept warm while an interactive
+                service is hosted (defaults to $JPA_WARM_SESSIONS, or 1)
+        """
+        names = [s.name for s in services]
+        duplicates = {n for n in names if names.count(n) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate service name(s): {', '.join(sorted(duplicates))}")
+
+        self.statuses = {s.name: ServiceStatus(s) for s in services}
+        self.health_interval = health_interval
+        self.unhealthy_threshold = unhealthy_threshold
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.stop_timeout = stop_timeout
+        if warm_sessions is None:
+            warm_sessions = int(os.getenv("JPA_WARM_SESSIONS", DEFAULT_WARM_SESSIONS))
+        self.warm_sessions = warm_sessions
+
+        self.start_time: Optional[datetime] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._signals = 0
+
+    async def run(self):
+        """Start every service and supervise them until shutdown."""
+        self.start_time = datetime.now()
+        self._stop = asyncio.Event()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._handle_signal)
+
+        logger.info(f"Starting runtime with services: {', '.join(self.statuses)}")
+        for name, status in self.statuses.items():
+            problem = status.service.problem()
+            if problem:
+                status.state = "failed"
+                status.last_error = problem
+                logger.error(f"Not starting {name}: {problem}")
+                continue
+            status.supervisor = asyncio.create_task(self._supervise(status), name=f"supervise:{name}")
+
+        supervisors = [s.supervisor for s in self.statuses.values() if s.supervisor]
+        if not supervisors:
+            logger.error("No service could start")
+            return
+
+        interactive = any(s.supervisor and s.service.interactive for s in self.statuses.values())
+        if interactive and self.warm_sessions > 0:
+            from engine.agents.base import prewarm
+            prewarm(self.warm_sessions)
+
+        health = asyncio.create_task(self._health_loop())
+        stop_wait = asyncio.create_task(self._stop.wait())
+        all_stopped = asyncio.gather(*supervisors, return_exceptions=True)
+        try:
+            # Runs until shutdown, or until every service has been given up on
+            await asyncio.wait([stop_wait, all_stopped], return_when=asyncio.FIRST_COMPLETED)
+            if not self._stop.is_set():
+                logger.error("Every service has stopped; exiting")
+        finally:
+            stop_wait.cancel()
+            health.cancel()
+            await self._shutdown()
+
+    def stop(self):
+        """Stop every service (gracefully) and return from run()."""
+        if self._stop is not None:
+            self._stop.set()
+
+    def _handle_signal(self):
+        """First signal: stop gracefully. Second: cancel services immediately."""
+        self._signals += 1
+        if self._signals == 1:
+            logger.info("Shutdown signal received, stopping services...")
+            self.stop()
+        else:
+            logger.info("Second shutdown signal, cancelling services")
+            for status in self.statuses.values():
+                if status.task is not None:
+                    status.task.cancel()
+
+    # ------------------------------------------------------------------
+    # Supervision
+    # ------------------------------------------------------------------
+
+    async def _supervise(self, status: ServiceStatus):
+        """Run a service, restarting it with backoff until shutdown or it's given up on."""
+        service = status.service
+        backoff = BACKOFF_INITIAL_SECONDS
+
+        while not self._stop.is_set():
+            status.state = "running"
+            status.starts += 1
+            status.started_at = time.monotonic()
+            status.unhealthy = 0
+            status.restart_reason = None
+            if status.starts > 1:
+                logger.info(f"Restarting {service.name} (start #{status.starts})")
+            status.task = asyncio.create_task(service.run(), name=f"service:{service.name}")
+            await asyncio.wait([status.task])
+
+            error = _outcome(status.task)
+            if self._stop.is_set():
+                if error:
+                    logger.info(f"{service.name} stopped: {error}")
+                break
+
+            reason = status.restart_reason or error or "exited unexpectedly"
+            status.last_error = reason
+            if isinstance(_exception(status.task), FatalServiceError):
+                status.state = "failed"
+                logger.error(f"{service.name} failed permanently: {reason}")
+                return
+
+            now = time.monotonic()
+            if now - status.started_at > self.restart_window:
+                backoff = BACKOFF_INITIAL_SECONDS  # it had been stable; start over
+            status.restarts.append(now)
+            status.total_restarts += 1
+            while status.restarts and now - status.restarts[0] > self.restart_window:
+                status.restarts.popleft()
+            if len(status.restarts) > self.max_restarts:
+                status.state = "failed"
+                logger.error(
+                    f"{service.name} restarted {len(status.restarts)} times in "
+                    f"{self.restart_window / 60:.0f} minutes; giving up ({reason})"
+                )
+                return
+
+            status.state = "backoff"
+            logger.warning(f"{service.name} {reason}; restarting in {backoff:.0f}s")
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, BACKOFF_MAX_SECONDS)
+
+        status.state = "stopped"
+
+    async def _restart(self, status: ServiceStatus, reason: str):
+        """Stop a running service so its supervisor starts it again."""
+        status.restart_reason = reason
+        await self._stop_service(status)
+
+    async def _stop_service(self, status: ServiceStatus):
+        """Ask a service to stop; cancel it if it hasn't within stop_timeout."""
+        task = status.task
+        if task is None or task.done():
+            return
+        try:
+            await asyncio.wait_for(status.service.stop(), timeout=self.stop_timeout)
+        except Exception as e:
+            logger.error(f"Error stopping {status.service.name}: {e}")
+        done, _ = await asyncio.wait([task], timeout=self.stop_timeout)
+        if not done:
+            logger.warning(f"{status.service.name} didn't stop within {self.stop_timeout:.0f}s, cancelling")
+            task.cancel()
+            await asyncio.wait([task])
+
+    async def _health_loop(self):
+        """Check running services periodically; restart ones that stay unhealthy."""
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for status in self.statuses.values():
+                service = status.service
+                if status.state != "running" or status.task is None or status.task.done():
+                    continue
+                if status.uptime < service.startup_grace:
+                    continue
+
+                try:
+                    ok = await asyncio.wait_for(service.healthy(), timeout=HEALTH_CHECK_TIMEOUT)
+                except Exception as e:
+                    logger.warning(f"Health check for {service.name} failed: {e or type(e).__name__}")
+                    ok = False
+
+                if ok:
+                    if status.unhealthy:
+                        logger.info(f"{service.name} is healthy again")
+                    status.unhealthy = 0
+                    continue
+
+                status.unhealthy += 1
+                logger.warning(f"{service.name} unhealthy ({status.unhealthy}/{self.unhealthy_threshold})")
+                if status.unhealthy >= self.unhealthy_threshold:
+                    await self._restart(status, "failed health checks")
+
+    # ------------------------------------------------------------------
+    # Shutdown
+    # ------------------------------------------------------------------
+
+    async def _shutdown(self):
+        """Stop every service, close shared connections, log a summary."""
+        await asyncio.gather(*(self._stop_service(s) for s in self.statuses.values()))
+        supervisors = [s.supervisor for s in self.statuses.values() if s.supervisor]
+        await asyncio.gather(*supervisors, return_exceptions=True)
+
+        await _close_agent_pool()
+        await _close_shared_clients()
+        self._log_summary()
+
+    def summary(self) -> str:
+        lines = []
+        for name, status in self.statuses.items():
+            parts = [status.state]
+            if status.state == "running":
+                parts.append(f"up {timedelta(seconds=int(status.uptime))}")
+            parts.append(f"{status.total_restarts} restart(s)")
+            detail = status.service.describe()
+            if detail:
+                parts.append(detail)
+            if status.last_error and status.state != "running":
+                parts.append(f"last error: {status.last_error}")
+            lines.append(f"  {name}: {', '.join(parts)}")
+        return "\n".join(lines)
+
+    def _log_summary(self):
+        from engine.agents.pool import get_pool
+        from engine.agents.sessions import get_session_limiter
+
+        runtime = datetime.now() - self.start_time if self.start_time else "unknown"
+        logger.info("=" * 60)
+        logger.info("RUNTIME STOPPED")
+        logger.info(f"Runtime: {runtime}")
+        for line in self.summary().splitlines():
+            logger.info(line)
+        logger.info(f"Agent sessions: {get_session_limiter().summary()}")
+        logger.info(f"Warm session pool: {get_pool().summary()}")
+        logger.info("=" * 60)
+
+
+def _exception(task: asyncio.Task) -> Optional[BaseException]:
+    if task.cancelled():
+        return None
+    return task.exception()
+
+
+def _outcome(task: asyncio.Task) -> Optional[str]:
+    """How a service's run() ended: None if it returned, else a description."""
+    if task.cancelled():
+        return "cancelled"
+    error = task.exception()
+    if error is None:
+        return None
+    if not isinstance(error, FatalServiceError):
+        logger.error(f"{task.get_name()} crashed", exc_info=error)
+    return f"{type(error).__name__}: {error}"
+
+
+async def _close_agent_pool():
+    """Shut down this loop's warm agent sessions (their CLI processes)."""
+    from engine.agents.pool import get_pool
+
+    try:
+        await get_pool().close()
+    except Exception as e:
+        logger.error(f"Error closing agent session pool: {e}")
+
+
+async def _close_shared_clients():
+    """Close this loop's pooled HTTP sessions (Discord REST, Slack web API)."""
+    from engine.discord.rest import get_rest
+    from engine.slack.client import get_async_client
+
+    for close in (get_rest().close, get_async_client().close):
+        try:
+            await close()
+        except Exception as e:
+            logger.debug(f"Error closing shared client: {e}")
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    """Entry point: python -m engine.runtime [service ...]"""
+    parser = argparse.ArgumentParser(
+        prog="python -m engine.runtime",
+        description="Run jpa-os services in one supervised process.",
+    )
+    parser.add_argument(
+        "services",
+        nargs="*",
+        help=f"Services to run ({', '.join(SERVICES)}, or all). "
+             f"Defaults to $JPA_SERVICES, or {','.join(DEFAULT_SERVICES)}",
+    )
+    args = parser.parse_args()
+
+    names = args.services or os.getenv("JPA_SERVICES", ",".join(DEFAULT_SERVICES)).split(",")
+    names = [n for arg in names for n in arg.split(",")]
+    try:
+        services = build_services(names)
+    except ValueError as e:
+        parser.error(str(e))
+
+    asyncio.run(Runtime(services).run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Scheduler Core
+
+Decides when routines fire. Shared by the standalone scheduler daemon
+(engine.scheduler.daemon) and the Discord bot (engine.main).
+
+Each routine's next fire time is computed once and kept in a min-heap.
+The loop sleeps until the earliest one, fires whatever is due, and
+pushes each routine's following fire time — no per-minute polling and
+no string comparison of minutes.
+
+If the loop wakes up late (process suspended, event loop blocked,
+restart), fires that are overdue by more than the grace window are
+"missed" and handled by a catch-up policy. Fires older than the
+catch-up window are dropped whatever the policy, so a brief missed by
+half a day isn't sent in the afternoon.
+
+- skip: drop missed fires, wait for the next one
+- once: fire once, however many were missed (default)
+- all:  fire once per missed occurrence (the most recent MAX_CATCH_UP)
+
+Fires are dispatched as independent asyncio tasks, so a slow routine
+never delays another. A global cap limits how many run at once, each
+run has a timeout, and a routine that is still running when it comes
+due again follows its overlap policy:
+
+- skip:   drop the new fire (default)
+- queue:  run it after the current one finishes (at most one waiting)
+- cancel: cancel the current run and start the new one
+
+With a SchedulerState (state.py), every fire and run outcome is
+persisted and schedules resume from the last handled slot on boot.
+
+Usage:
+    scheduler = Scheduler(ROUTINES, TIMEZONE, on_fire=fire, state=SchedulerState())
+    await scheduler.run()
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Awaitable, Callable, Optional
+from zoneinfo import ZoneInfo
+
+from croniter import croniter
+
+from engine.scheduler.routines import Routine
+from engine.scheduler.state import SchedulerState
+
+logger = logging.getLogger(__name__)
+
+# jpa's timezone; cron expressions are evaluated here
+TIMEZONE = ZoneInfo("America/New_York")
+
+
+class CatchUp(Enum):
+    SKIP = "skip"
+    ONCE = "once"
+    ALL = "all"
+
+
+class Overlap(Enum):
+    SKIP = "skip"
+    QUEUE = "queue"
+    CANCEL = "cancel"
+
+
+# A fire this late still counts as on time
+DEFAULT_GRACE = timedelta(minutes=1)
+
+# Missed fires older than this are never caught up
+DEFAULT_CATCH_UP_WINDOW = timedelta(hours=2)
+
+# Upper bound on how many missed occurrences CatchUp.ALL replays
+MAX_CATCH_UP = 10
+
+# Routines running at once, across all routines
+DEFAULT_MAX_CONCURRENT = 2
+
+# A run taking longer than this is cancelled (Routine.timeout overrides)
+DEFAULT_TIMEOUT_SECONDS = 30 * 60
+
+# Re-check the heap at least this often, so wall-clock jumps (NTP, DST,
+# sleep/wake) can't strand the loop in a long sleep
+MAX_SLEEP_SECONDS = 300
+
+
+def next_fire(schedule: str, after: datetime) -> datetime:
+    """First time a cron schedule fires strictly after `after`."""
+    return croniter(schedule, after).get_next(datetime)
+
+
+class Scheduler:
+    """
+    Min-heap of (next fire time, routine) with a sleep-until-earliest loop.
+
+    on_fire(routine, scheduled_for) runs in its own task for every fire.
+    """
+
+    def __init__(
+        self,
+        routines: list[Routine],
+        timezone: ZoneInfo,
+        on_fire: Callable[[Routine, datetime], Awaitable],
+        catch_up: CatchUp = CatchUp.ONCE,
+        grace: timedelta = DEFAULT_GRACE,
+        last_fired: Optional[dict[str, datetime]] = None,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        catch_up_window: timedelta = DEFAULT_CATCH_UP_WINDOW,
+        state: Optional[SchedulerState] = None,
+    ):
+        """
+        Args:
+            routines: Routines to schedule (disabled ones are ignored)
+            timezone: Timezone cron expressions are evaluated in
+            on_fire: Coroutine called when a routine is due
+            catch_up: Default policy for missed fires (routines can override)
+            grace: How late a fire can be before it counts as missed
+            last_fired: When each routine last fired; schedules resume from
+                there so fires missed while the process was down are caught up
+                (defaults to what `state` recorded)
+            max_concurrent: Max routines running at once
+            timeout: Default per-run timeout in seconds
+            catch_up_window: Missed fires older than this are dropped
+            state: Where fires and run outcomes are persisted
+        """
+        self.timezone = timezone
+        self.on_fire = on_fire
+        self.catch_up = catch_up
+        self.grace = grace
+        self.timeout = timeout
+        self.catch_up_window = catch_up_window
+        self.state = state
+
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._active: dict[str, asyncio.Task] = {}
+        self._waiting: dict[str, datetime] = {}  # overlap=queue: next run per routine
+
+        now = self.now()
+        if last_fired is None and state is not None:
+            last_fired = state.last_fired()
+        last_fired = last_fired or {}
+        self._heap: list[tuple[datetime, int, Routine]] = []
+        for seq, routine in enumerate(r for r in routines if r.enabled):
+            base = last_fired.get(routine.name, now).astimezone(timezone)
+            self._heap.append((next_fire(routine.schedule, base), seq, routine))
+        heapq.heapify(self._heap)
+
+    def now(self) -> datetime:
+        return datetime.now(self.timezone)
+
+    def next_fire_at(self) -> Optional[datetime]:
+        """When the earliest routine is due, or None if nothing is scheduled."""
+        return self._heap[0][0] if self._heap else None
+
+    def upcoming(self) -> list[tuple[datetime, Routine]]:
+        """Every scheduled routine with its next fire time, soonest first."""
+        return [(when, routine) for when, _, routine in sorted(self._heap)]
+
+    def _policy(self, routine: Routine) -> CatchUp:
+        return CatchUp(routine.catch_up) if routine.catch_up else self.catch_up
+
+    def due(self, now: Optional[datetime] = None) -> list[tuple[Routine, datetime]]:
+        """
+        Pop every routine due at `now` and reschedule it.
+
+        Returns (routine, scheduled_for) pairs to fire, oldest first,
+        with the catch-up policy already applied.
+        """
+        now = now or self.now()
+        fires = []
+
+        while self._heap and self._heap[0][0] <= now:
+            when, seq, routine = heapq.heappop(self._heap)
+
+            # Walk every occurrence up to now, keeping the most recent few
+            recent = deque([when], maxlen=MAX_CATCH_UP + 1)
+            overdue = 1
+            occurrences = croniter(routine.schedule, when)
+            following = occurrences.get_next(datetime)
+            while following <= now:
+                recent.append(following)
+                overdue += 1
+                following = occurrences.get_next(datetime)
+
+            missed = list(recent)
+            if now - missed[-1] <= self.grace:
+                # Latest occurrence is on time; anything before it was missed
+                on_time = [missed.pop()]
+                overdue -= 1
+            else:
+                on_time = []
+            missed = [t for t in missed[-MAX_CATCH_UP:] if now - t <= self.catch_up_window]
+
+            policy = self._policy(routine)
+            if overdue:
+                logger.warning(
+                    f"Routine {routine.name} missed {overdue} fire(s) since "
+                    f"{when.isoformat()} (catch-up: {policy.value})"
+                )
+            if policy == CatchUp.ALL:
+                replay = missed
+            elif policy == CatchUp.ONCE and missed and not on_time:
+                replay = missed[-1:]
+            else:
+                replay = []
+
+            fires.extend((routine, t) for t in replay + on_time)
+            heapq.heappush(self._heap, (following, seq, routine))
+
+            if self.state is not None:
+                # Mark the slot handled before running it, so a restart doesn't repeat it
+                self.state.record_fire(routine.name, recent[-1])
+
+        fires.sort(key=lambda fire: fire[1])
+        return fires
+
+    def running(self) -> list[str]:
+        """Names of routines with a run in flight (including ones waiting for a slot)."""
+        return [name for name, task in self._active.items() if not task.done()]
+
+    def dispatch(self, routine: Routine, scheduled_for: datetime) -> Optional[asyncio.Task]:
+        """
+        Start a run of `routine` in the background, applying its overlap policy.
+
+        Returns the new task, or None if the fire was skipped or queued.
+        """
+        current = self._active.get(routine.name)
+        if current is not None and not current.done():
+            overlap = Overlap(routine.overlap)
+            if overlap == Overlap.SKIP:
+                logger.warning(f"Routine {routine.name} is still running, skipping this fire")
+                self._record(routine, "skipped")
+                return None
+            if overlap == Overlap.QUEUE:
+                if routine.name in self._waiting:
+                    logger.warning(f"Routine {routine.name} already has a run queued, coalescing")
+                else:
+                    logger.info(f"Routine {routine.name} is still running, queued to run next")
+                self._waiting[routine.name] = scheduled_for
+                return None
+            logger.warning(f"Routine {routine.name} is still running, cancelling it for the new fire")
+            current.cancel()
+
+        if self.state is not None:
+            self.state.record_start(routine.name, self.now())
+
+        task = asyncio.create_task(self.fire(routine, scheduled_for), name=f"routine:{routine.name}")
+        self._active[routine.name] = task
+        task.add_done_callback(lambda done: self._run_finished(routine, done))
+        return task
+
+    def _run_finished(self, routine: Routine, task: asyncio.Task):
+        if self._active.get(routine.name) is task:
+            del self._active[routine.name]
+        scheduled_for = self._waiting.pop(routine.name, None)
+        if scheduled_for is not None:
+            self.dispatch(routine, scheduled_for)
+
+    async def fire(self, routine: Routine, scheduled_for: datetime):
+        """Run one routine under the concurrency cap and its timeout, logging (not raising) failures."""
+        timeout = routine.timeout or self.timeout
+        async with self._slots:
+            logger.info(f"Triggering routine: {routine.name} (scheduled {scheduled_for.strftime('%H:%M')})")
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self.on_fire(routine, scheduled_for), timeout=timeout)
+                logger.info(f"Routine {routine.name} completed")
+                self._record(routine, "success", started)
+            except asyncio.TimeoutError:
+                logger.error(f"Routine {routine.name} timed out after {timeout:g}s")
+                self._record(routine, "timeout", started, f"Timed out after {timeout:g}s")
+            except asyncio.CancelledError:
+                logger.warning(f"Routine {routine.name} cancelled")
+                self._record(routine, "cancelled", started)
+                raise
+            except Exception as e:
+                logger.error(f"Routine {routine.name} failed: {e}")
+                self._record(routine, "failed", started, str(e))
+
+    def _record(self, routine: Routine, outcome: str, started: Optional[float] = None, error: Optional[str] = None):
+        """Persist a run outcome (never lets a state error break the scheduler)."""
+        if self.state is None:
+            return
+        duration = time.monotonic() - started if started is not None else None
+        try:
+            self.state.record_result(routine.name, outcome, duration, error, finished_at=self.now())
+        except Exception as e:
+            logger.error(f"Could not record {routine.name} outcome: {e}")
+
+    async def shutdown(self):
+        """Cancel in-flight runs and wait for them to unwind."""
+        self._waiting.clear()
+        tasks = list(self._active.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run(self, stop: Optional[asyncio.Event] = None):
+        """Dispatch routines as they come due until `stop` is set (or forever)."""
+        try:
+            await self._run(stop)
+        finally:
+            await self.shutdown()
+
+    async def _run(self, stop: Optional[asyncio.Event]):
+        while stop is None or not stop.is_set():
+            for routine, scheduled_for in self.due():
+                self.dispatch(routine, scheduled_for)
+
+            next_at = self.next_fire_at()
+            if next_at is None:
+                delay = MAX_SLEEP_SECONDS
+            else:
+                delay = min(MAX_SLEEP_SECONDS, max(0.0, (next_at - self.now()).total_seconds()))
+
+            if stop is None:
+                await asyncio.sleep(delay)
+            else:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
@@ -11,15 +11,16 @@ This should be run as a background service (launchd, systemd, etc.)
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from datetime import datetime
+from typing import Optional
 
-from croniter import croniter
 from dotenv import load_dotenv
 load_dotenv()
 
-from engine.scheduler.routines import ROUTINES
+from engine.scheduler.core import Scheduler, TIMEZONE
+from engine.scheduler.routines import Routine, ROUTINES
 from engine.scheduler.runner import run_routine
+from engine.scheduler.state import SchedulerState
 
 logging.basicConfig(
     level=logging.INFO,
@@ -27,21 +28,29 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# jpa's timezone
-TIMEZONE = ZoneInfo("America/New_York")
 
+async def _fire(routine: Routine, scheduled_for: datetime):
+    await run_routine(routine.name)
 
-def get_next_run(cron_expr: str, base_time: datetime) -> datetime:
-    """Get the next run time for a cron expression."""
-    cron = croniter(cron_expr, base_time)
-    return cron.get_next(datetime)
 
+def build_scheduler() -> Scheduler:
+    """
+    Create the routine scheduler.
+
+    Resumes from persisted state: missed fires are caught up, handled ones aren't repeated.
+    """
+    return Scheduler(ROUTINES, TIMEZONE, on_fire=_fire, state=SchedulerState())
 
-async def scheduler_loop():
+
+async def scheduler_loop(stop: Optional[asyncio.Event] = None, scheduler: Optional[Scheduler] = None):
     """
     Main scheduler loop.
 
-    Checks every minute if any routine should run.
+    Sleeps until the next routine is due (see scheduler/core.py).
+
+    Args:
+        stop: Set to stop the loop (in-flight runs are cancelled); None runs forever
+        scheduler: Scheduler to run (defaults to build_scheduler())
     """
     logger.info("Scheduler daemon starting...")
     logger.info(f"Timezone: {TIMEZONE}")
@@ -50,37 +59,12 @@ async def scheduler_loop():
         if r.enabled:
             logger.info(f"  - {r.name}: {r.schedule}")
 
-    # Track last run times to avoid double-firing
-    last_run = {}
-
-    while True:
-        now = datetime.now(TIMEZONE)
-        current_minute = now.strftime("%Y-%m-%d %H:%M")
-
-        for routine in ROUTINES:
-            if not routine.enabled:
-                continue
-
-            # Check if this routine should run now
-            cron = croniter(routine.schedule, now.replace(second=0, microsecond=0) - timedelta(minutes=1))
-            next_run = cron.get_next(datetime)
-
-            # If next run is within this minute and we haven't run it yet
-            if next_run.strftime("%Y-%m-%d %H:%M") == current_minute:
-                if last_run.get(routine.name) != current_minute:
-                    logger.info(f"Triggering routine: {routine.name}")
-                    last_run[routine.name] = current_minute
-
-                    try:
-                        await run_routine(routine.name)
-                        logger.info(f"Routine {routine.name} completed")
-                    except Exception as e:
-                        logger.error(f"Routine {routine.name} failed: {e}")
-
-        # Sleep until next minute
-        now = datetime.now(TIMEZONE)
-        seconds_until_next_minute = 60 - now.second
-        await asyncio.sleep(seconds_until_next_minute)
+    scheduler = scheduler or build_scheduler()
+    next_at = scheduler.next_fire_at()
+    if next_at:
+        logger.info(f"Next fire: {next_at.strftime('%a %H:%M %Z')}")
+
+    await scheduler.run(stop)
 
 
 def main():
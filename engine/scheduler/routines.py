@@ -17,6 +17,9 @@ class Routine:
     prompt: str  # what to tell the agent
     channel: Optional[str] = None  # where to post (None = determine dynamically)
     enabled: bool = True
+    catch_up: Optional[str] = None  # "skip", "once" or "all" for missed fires (None = scheduler default)
+    overlap: str = "skip"  # if still running when due again: "skip", "queue" or "cancel" (the previous run)
+    timeout: Optional[float] = None  # seconds before a run is cancelled (None = scheduler default)
 
 
 # Morning brief — start jpa's day with context
@@ -6,64 +6,34 @@ Executes a routine: runs the agent with the prompt, posts result to Discord.
 Usage:
     python -m engine.scheduler.runner morning_brief
     python -m engine.scheduler.runner evening_recap --dry-run
+    python -m engine.scheduler.runner --status
 """
 
-import os
 import sys
 import argparse
 import asyncio
 import logging
 from datetime import datetime
+from typing import Optional
 
 from dotenv import load_dotenv
 load_dotenv()
 
-import discord
-import aiohttp
-
+from engine.discord.poster import post
 from engine.scheduler.routines import get_routine, ROUTINES
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-async def post_to_discord(channel_name: str, content: str):
-    """Post a message to Discord channel."""
-    token = os.environ.get("DISCORD_TOKEN")
-    if not token:
-        logger.error("DISCORD_TOKEN not set")
-        return False
-
-    intents = discord.Intents.default()
-    client = discord.Client(intents=intents)
-    posted = False
-
-    @client.event
-    async def on_ready():
-        nonlocal posted
-        for guild in client.guilds:
-            for channel in guild.text_channels:
-                if channel.name == channel_name:
-                    # Split long messages (Discord 2000 char limit)
-                    if len(content) <= 2000:
-                        await channel.send(content)
-                    else:
-                        chunks = [content[i:i+2000] for i in range(0, len(content), 2000)]
-                        for chunk in chunks:
-                            await channel.send(chunk)
-                    posted = True
-                    logger.info(f"Posted to #{channel_name}")
-                    await client.close()
-                    return
-        logger.error(f"Channel not found: {channel_name}")
-        await client.close()
-
-    try:
-        await client.start(token)
-    except:
-        pass
-
-    return posted
+async def post_to_discord(channel_name: str, content: str) -> bool:
+    """
+    Post a message to Discord channel.
+
+    Goes through the running bot when engine.main is up, otherwise a
+    single REST call (see engine.discord.poster).
+    """
+    return await post(channel_name, content)
 
 
 async def run_routine(routine_name: str, dry_run: bool = False) -> str:
@@ -120,6 +90,36 @@ async def run_routine(routine_name: str, dry_run: bool = False) -> str:
     return response
 
 
+def _format_time(iso: Optional[str]) -> str:
+    if not iso:
+        return "-"
+    return datetime.fromisoformat(iso).strftime("%a %m/%d %H:%M")
+
+
+def print_status():
+    """Print each routine's persisted scheduler state and next fire time."""
+    from engine.scheduler.core import TIMEZONE, next_fire
+    from engine.scheduler.state import SchedulerState
+
+    state = SchedulerState().all()
+    now = datetime.now(TIMEZONE)
+
+    print(f"{'Routine':<20} {'Last fired':<14} {'Outcome':<10} {'Took':>7} {'Last success':<14} {'Next':<14}")
+    print("-" * 84)
+    for r in ROUTINES:
+        row = state.get(r.name, {})
+        duration = row.get("last_duration")
+        took = f"{duration:.0f}s" if duration is not None else "-"
+        next_at = next_fire(r.schedule, now).strftime("%a %m/%d %H:%M") if r.enabled else "disabled"
+        print(
+            f"{r.name:<20} {_format_time(row.get('last_fired')):<14} "
+            f"{row.get('last_outcome') or '-':<10} {took:>7} "
+            f"{_format_time(row.get('last_success')):<14} {next_at:<14}"
+        )
+        if row.get("last_error") and row.get("last_outcome") != "success":
+            print(f"{'':<20} error: {row['last_error'][:60]}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Run a scheduled routine")
     parser.add_argument("routine", nargs="?", help="Name of routine to run")
@@ -127,6 +127,8 @@ def main():
                         help="Print output instead of posting to Slack")
     parser.add_argument("--list", "-l", action="store_true",
                         help="List available routines")
+    parser.add_argument("--status", "-s", action="store_true",
+                        help="Show last run, outcome and next fire for each routine")
 
     args = parser.parse_args()
 
@@ -137,6 +139,10 @@ def main():
             print(f"  {r.name}: {r.schedule} ({status})")
         return
 
+    if args.status:
+        print_status()
+        return
+
     if not args.routine:
         parser.print_help()
         return
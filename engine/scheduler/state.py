@@ -0,0 +1,127 @@
+"""
+Persistent Scheduler State
+
+One row per routine in a small SQLite database under vault/hive, so the
+scheduler survives restarts without double-firing or silently skipping:
+
+- last_fired: the scheduled slot most recently handled. Written when a
+  fire is dispatched (before the routine runs), so a restart mid-run
+  doesn't fire the same slot again.
+- last_outcome / last_duration / last_error: how the latest run ended
+  ("success", "failed", "timeout", "cancelled", "skipped").
+- last_success: when the routine last completed successfully.
+
+On boot the Scheduler resumes each routine from last_fired, so fires
+missed while the process was down are caught up (see core.py).
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+ROOT = Path(__file__).parent.parent.parent
+
+DEFAULT_STATE_PATH = ROOT / "vault" / "hive" / "scheduler_state.db"
+
+COLUMNS = {
+    "name": "TEXT PRIMARY KEY",
+    "last_fired": "TEXT",
+    "last_started": "TEXT",
+    "last_outcome": "TEXT",
+    "last_duration": "REAL",
+    "last_error": "TEXT",
+    "last_success": "TEXT",
+    "runs": "INTEGER NOT NULL DEFAULT 0",
+    "failures": "INTEGER NOT NULL DEFAULT 0",
+}
+
+
+class SchedulerState:
+    """Per-routine fire/run history (SQLite, WAL mode)."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or DEFAULT_STATE_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,  # autocommit; every write is one statement
+            check_same_thread=False,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._ensure_schema()
+
+    def _ensure_schema(self):
+        """Create the table, adding any columns that are missing."""
+        with self._lock:
+            columns = ", ".join(f"{name} {decl}" for name, decl in COLUMNS.items())
+            self._conn.execute(f"CREATE TABLE IF NOT EXISTS routines ({columns})")
+
+            existing = {row["name"] for row in self._conn.execute("PRAGMA table_info(routines)")}
+            for name, decl in COLUMNS.items():
+                if name not in existing:
+                    self._conn.execute(f"ALTER TABLE routines ADD COLUMN {name} {decl}")
+
+    def _upsert(self, name: str, assignments: str, params: tuple):
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO routines (name) VALUES (?)", (name,))
+            self._conn.execute(f"UPDATE routines SET {assignments} WHERE name = ?", params + (name,))
+
+    def record_fire(self, name: str, scheduled_for: datetime):
+        """Mark a scheduled slot as handled (call before running it)."""
+        self._upsert(name, "last_fired = ?", (scheduled_for.isoformat(),))
+
+    def record_start(self, name: str, started_at: datetime):
+        self._upsert(name, "last_started = ?", (started_at.isoformat(),))
+
+    def record_result(
+        self,
+        name: str,
+        outcome: str,
+        duration: Optional[float] = None,
+        error: Optional[str] = None,
+        finished_at: Optional[datetime] = None,
+    ):
+        """Record how a run ended."""
+        success = outcome == "success"
+        self._upsert(
+            name,
+            "last_outcome = ?, last_duration = ?, last_error = ?, "
+            "last_success = COALESCE(?, last_success), "
+            "runs = runs + ?, failures = failures + ?",
+            (
+                outcome,
+                duration,
+                error,
+                (finished_at or datetime.now()).isoformat() if success else None,
+                1 if duration is not None else 0,
+                0 if success or outcome == "skipped" else 1,
+            ),
+        )
+
+    def get(self, name: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM routines WHERE name = ?", (name,)).fetchone()
+        return dict(row) if row else None
+
+    def all(self) -> dict[str, dict]:
+        """Every routine's state, keyed by name."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM routines").fetchall()
+        return {row["name"]: dict(row) for row in rows}
+
+    def last_fired(self) -> dict[str, datetime]:
+        """Routine name -> last handled slot, for Scheduler(last_fired=...)."""
+        return {
+            name: datetime.fromisoformat(row["last_fired"])
+            for name, row in self.all().items()
+            if row["last_fired"]
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
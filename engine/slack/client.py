@@ -0,0 +1,231 @@
+"""
+Shared Slack Web API client.
+
+One AsyncWebClient per event loop, shared by engine/tools/slack_async.py
+and the dispatcher, instead of a new client per tool call.
+
+Features:
+- Retry handlers: rate-limited calls (HTTP 429) wait out Retry-After,
+  connection errors and 5xx responses are retried
+- Async clients keep one pooled aiohttp session (keep-alive) instead of
+  a session per request; each event loop gets its own client, so the
+  dispatcher's loop and the tools' background loop never share a session
+- Per-method latency counters (calls, errors, mean/max seconds); slow
+  calls are logged
+
+Usage:
+    from engine.slack.client import get_async_client, get_stats
+
+    await get_async_client().chat_postMessage(channel="C123", text="hi")
+    print(get_stats().summary())
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+import aiohttp
+from slack_sdk.http_retry.builtin_async_handlers import (
+    AsyncConnectionErrorRetryHandler,
+    AsyncRateLimitErrorRetryHandler,
+    AsyncServerErrorRetryHandler,
+)
+from slack_sdk.web.async_client import AsyncWebClient
+
+logger = logging.getLogger(__name__)
+
+# Retries per failure kind before the error is raised to the caller
+MAX_RETRIES = 3
+
+# Calls slower than this are logged (after retries)
+SLOW_CALL_SECONDS = 3.0
+
+# Connections kept open by the async client's session
+POOL_SIZE = 20
+
+
+@dataclass
+class MethodStats:
+    calls: int = 0
+    errors: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+
+class SlackCallStats:
+    """Per-method call counts and latency. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods: dict[str, MethodStats] = {}
+
+    def record(self, method: str, seconds: float, error: bool = False):
+        with self._lock:
+            stats = self._methods.setdefault(method, MethodStats())
+            stats.calls += 1
+            stats.errors += int(error)
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+        if seconds > SLOW_CALL_SECONDS:
+            logger.warning(f"Slow Slack call: {method} took {seconds:.1f}s")
+
+    def snapshot(self) -> dict[str, MethodStats]:
+        """Copy of the counters, keyed by API method."""
+        with self._lock:
+            return {m: MethodStats(**vars(s)) for m, s in self._methods.items()}
+
+    def summary(self) -> str:
+        """One line per method, busiest first."""
+        lines = []
+        for method, s in sorted(self.snapshot().items(), key=lambda kv: -kv[1].calls):
+            lines.append(
+                f"{method:<28} {s.calls:>6} calls {s.errors:>4} errors "
+                f"mean {s.mean_seconds * 1000:>7.0f}ms max {s.max_seconds * 1000:>7.0f}ms"
+            )
+        return "\n".join(lines) or "No Slack calls yet"
+
+
+_stats = SlackCallStats()
+
+
+def get_stats() -> SlackCallStats:
+    """Latency counters shared by every async client."""
+    return _stats
+
+
+class PooledAsyncWebClient(AsyncWebClient):
+    """
+    AsyncWebClient with a pooled aiohttp session and latency counters.
+
+    The session is created lazily inside the running loop (and replaced,
+    after closing the old one, if the client is later used from a
+    different loop), so the client can be constructed at import time.
+    The first loop it runs on adopts it as that loop's shared client.
+    """
+
+    _session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_session(self):
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self._session_loop is not loop:
+            if self.session is not None and not self.session.closed:
+                _close_on_loop(self.session, self._session_loop)
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._session_loop = loop
+            _bind(self, loop)
+
+    async def api_call(self, api_method: str, **kwargs):
+        self._ensure_session()
+        started = time.monotonic()
+        error = False
+        try:
+            return await super().api_call(api_method, **kwargs)
+        except Exception:
+            error = True
+            raise
+        finally:
+            _stats.record(api_method, time.monotonic() - started, error)
+
+    async def close(self):
+        """Close the pooled session."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+
+def _close_on_loop(session: aiohttp.ClientSession, loop: Optional[asyncio.AbstractEventLoop]):
+    """
+    Close a session that belongs to another event loop.
+
+    If that loop is still running the close is scheduled on it. A stopped
+    loop can't run the close any more, so the session is detached (marked
+    closed) and its connector's sockets go with it when it's collected.
+    """
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(session.close(), loop)
+    else:
+        session.detach()
+
+
+def _token() -> Optional[str]:
+    return os.getenv("SLACK_BOT_TOKEN")
+
+
+def missing_tokens() -> Optional[str]:
+    """What the Slack dispatcher is missing to connect (with where to get it), or None."""
+    if not os.environ.get("SLACK_BOT_TOKEN"):
+        return (
+            "SLACK_BOT_TOKEN not set\n"
+            "Get it from: api.slack.com/apps > OAuth & Permissions > Bot User OAuth Token"
+        )
+    if not os.environ.get("SLACK_APP_TOKEN"):
+        return (
+            "SLACK_APP_TOKEN not set\n"
+            "Get it from: api.slack.com/apps > Basic Information > App-Level Tokens\n"
+            "Create one with 'connections:write' scope"
+        )
+    return None
+
+
+_lock = threading.Lock()
+_unbound_async_client: Optional[PooledAsyncWebClient] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, PooledAsyncWebClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _new_async_client() -> PooledAsyncWebClient:
+    return PooledAsyncWebClient(
+        token=_token(),
+        retry_handlers=[
+            AsyncConnectionErrorRetryHandler(max_retry_count=MAX_RETRIES),
+            AsyncRateLimitErrorRetryHandler(max_retry_count=MAX_RETRIES),
+            AsyncServerErrorRetryHandler(max_retry_count=MAX_RETRIES),
+        ],
+    )
+
+
+def _bind(client: PooledAsyncWebClient, loop: asyncio.AbstractEventLoop):
+    """Register a client as its loop's shared client (first one wins)."""
+    global _unbound_async_client
+    with _lock:
+        _async_clients.setdefault(loop, client)
+        if _unbound_async_client is client:
+            _unbound_async_client = None
+
+
+def get_async_client() -> AsyncWebClient:
+    """
+    Get the shared async client (bot token) for the running event loop.
+
+    Called outside a loop (e.g. AsyncApp(client=...) at import time) it
+    returns a client that binds to the first loop it's used on; later
+    calls from that loop get the same client back.
+    """
+    global _unbound_async_client
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _lock:
+        if loop is None:
+            if _unbound_async_client is None:
+                _unbound_async_client = _new_async_client()
+            return _unbound_async_client
+        client = _async_clients.get(loop)
+        if client is None:
+            client = _async_clients[loop] = _new_async_client()
+        return client
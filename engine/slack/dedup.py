@@ -0,0 +1,108 @@
+"""
+Slack Event Deduplication
+
+Socket Mode redelivers an event when the ack is slow, and a mention in a
+monitored channel arrives twice (app_mention + message). Either way the
+same request must not start two agent sessions.
+
+- A bounded cache of recently seen keys, each remembered for a TTL
+  (oldest evicted first when full)
+- Events are suppressed by event_id (redeliveries, checked by a global
+  middleware before any listener runs)
+- Messages are claimed by client_msg_id (or channel:ts) right before a
+  handler starts work, so whichever handler claims first wins and a
+  handler that ignores a message doesn't block the other
+- Counters for checks and suppressed duplicates, by kind
+
+Usage:
+    dedup = EventDeduplicator()
+    if dedup.seen("event_id", body.get("event_id")):
+        return  # redelivery
+    if not dedup.claim_message(event):
+        return  # another handler already took this message
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Slack retries a failed delivery up to 3 times over about 5 minutes
+DEFAULT_TTL_SECONDS = 15 * 60
+
+# Keys remembered at most (oldest evicted first)
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class EventDeduplicator:
+    """Bounded TTL cache of event/message keys. Thread-safe."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple[str, str], float]" = OrderedDict()  # key -> expires at
+        self.checked: Counter = Counter()
+        self.suppressed: Counter = Counter()
+
+    def seen(self, kind: str, key: Optional[str]) -> bool:
+        """
+        Record a key; True if it was already recorded within the TTL.
+
+        Args:
+            kind: Key namespace and counter label ("event_id", "message")
+            key: The key (None/empty is never a duplicate)
+        """
+        if not key:
+            return False
+        now = time.monotonic()
+        entry = (kind, key)
+        with self._lock:
+            self.checked[kind] += 1
+            self._expire(now)
+            if entry in self._entries:
+                self.suppressed[kind] += 1
+                duplicate = True
+            else:
+                self._entries[entry] = now + self.ttl
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                duplicate = False
+        if duplicate:
+            logger.info(f"Suppressed duplicate {kind} {key}")
+        return duplicate
+
+    def claim_message(self, event: dict) -> bool:
+        """
+        Claim a message for processing. False if another handler (or an
+        earlier delivery) already claimed it.
+        """
+        key = event.get("client_msg_id") or f"{event.get('channel')}:{event.get('ts')}"
+        return not self.seen("message", key)
+
+    def _expire(self, now: float):
+        # Entries are in insertion order and share one TTL, so expired ones are at the front
+        while self._entries:
+            entry, expires_at = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[entry]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "checked": dict(self.checked),
+                "suppressed": dict(self.suppressed),
+            }
+
+    def summary(self) -> str:
+        stats = self.stats()
+        parts = [
+            f"{kind}: {stats['suppressed'].get(kind, 0)}/{count} suppressed"
+            for kind, count in sorted(stats["checked"].items())
+        ]
+        return ", ".join(parts) or "No events checked"
@@ -0,0 +1,297 @@
+"""
+Slack Directory
+
+Cached map of the workspace's channels and users, so tools can resolve
+"team-jpa" or "jpa" to an ID without calling conversations.list /
+users.list on every call.
+
+- Full refreshes page through the whole workspace (cursor pagination),
+  so workspaces with more than one page of channels work.
+- The snapshot is persisted to vault/hive/slack_directory.json and
+  reused across processes until it's older than the TTL.
+- The dispatcher keeps it current between refreshes from events:
+  channel_created, channel_rename, channel_deleted, team_join, user_change.
+- A lookup miss triggers one refresh (rate-limited), so brand-new
+  channels still resolve.
+
+Usage:
+    from engine.slack.directory import get_directory
+
+    directory = get_directory()
+    channel_id = await directory.channel_id_async("team-jpa", client)
+    user = await directory.find_user_async("jpa", client)
+
+    # Cache only, no API calls
+    channel = directory.find_channel("team-jpa")
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parent.parent.parent
+DEFAULT_DIRECTORY_PATH = ROOT / "vault" / "hive" / "slack_directory.json"
+
+# A full refresh happens when the snapshot is older than this
+DIRECTORY_TTL_SECONDS = 6 * 60 * 60
+
+# At most one miss-triggered refresh per this many seconds
+MISS_REFRESH_SECONDS = 60
+
+# Page size for conversations.list / users.list
+PAGE_SIZE = 200
+
+CHANNEL_TYPES = "public_channel,private_channel"
+
+
+def _channel_entry(channel: dict) -> dict:
+    """The fields we keep for a channel."""
+    return {
+        "id": channel["id"],
+        "name": channel.get("name", ""),
+        "is_private": channel.get("is_private", False),
+        "is_member": channel.get("is_member", False),
+        "is_archived": channel.get("is_archived", False),
+        "purpose": (channel.get("purpose") or {}).get("value", ""),
+    }
+
+
+def _user_entry(user: dict) -> dict:
+    """The fields we keep for a user."""
+    profile = user.get("profile") or {}
+    return {
+        "id": user["id"],
+        "name": user.get("name", ""),
+        "display_name": profile.get("display_name", ""),
+        "real_name": profile.get("real_name", "") or user.get("real_name", ""),
+        "email": profile.get("email", ""),
+        "is_bot": user.get("is_bot", False),
+        "deleted": user.get("deleted", False),
+    }
+
+
+async def _paginate_async(call, key: str, **kwargs) -> list[dict]:
+    """Collect every page of a cursor-paginated AsyncWebClient method."""
+    items, cursor = [], None
+    while True:
+        response = await call(limit=PAGE_SIZE, cursor=cursor, **kwargs)
+        items.extend(response.get(key, []))
+        cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        if not cursor:
+            return items
+
+
+class SlackDirectory:
+    """Channels and users by ID, with name lookup. Thread-safe."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or DEFAULT_DIRECTORY_PATH)
+        self._lock = threading.RLock()
+        self.channels: dict[str, dict] = {}
+        self.users: dict[str, dict] = {}
+        self.fetched_at = 0.0  # wall clock, shared with other processes via the file
+        self._last_miss_refresh: Optional[float] = None  # monotonic; None = never
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Slack directory {self.path}: {e}")
+            return
+        with self._lock:
+            self.channels = data.get("channels", {})
+            self.users = data.get("users", {})
+            self.fetched_at = data.get("fetched_at", 0.0)
+
+    def _save(self):
+        with self._lock:
+            content = json.dumps({
+                "fetched_at": self.fetched_at,
+                "channels": self.channels,
+                "users": self.users,
+            })
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(content)
+            os.replace(tmp_path, self.path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def expired(self) -> bool:
+        return time.time() - self.fetched_at > DIRECTORY_TTL_SECONDS
+
+    async def refresh_async(self, client):
+        """Reload every channel and user (all pages) with an AsyncWebClient."""
+        started = time.monotonic()
+        channels = await _paginate_async(
+            client.conversations_list, "channels", types=CHANNEL_TYPES, exclude_archived=True
+        )
+        users = await _paginate_async(client.users_list, "members")
+        self.replace(channels, users)
+        self._log_refresh(channels, users, started)
+
+    def _log_refresh(self, channels: list, users: list, started: float):
+        logger.info(
+            f"Slack directory refreshed: {len(channels)} channels, {len(users)} users "
+            f"in {time.monotonic() - started:.1f}s"
+        )
+
+    def replace(self, channels: list[dict], users: list[dict]):
+        """Swap in a full snapshot from the API."""
+        with self._lock:
+            self.channels = {c["id"]: _channel_entry(c) for c in channels}
+            self.users = {u["id"]: _user_entry(u) for u in users}
+            self.fetched_at = time.time()
+        self._save()
+
+    def _needs_refresh(self) -> bool:
+        if self.expired():
+            self._load()  # another process may have refreshed it already
+        return self.expired()
+
+    async def ensure_fresh_async(self, client):
+        """Refresh if the snapshot (ours or another process's) is past its TTL."""
+        if self._needs_refresh():
+            await self.refresh_async(client)
+
+    def _may_refresh_on_miss(self, client) -> bool:
+        """Allow one miss-triggered refresh per MISS_REFRESH_SECONDS."""
+        if client is None:
+            return False
+        last = self._last_miss_refresh
+        if last is not None and time.monotonic() - last < MISS_REFRESH_SECONDS:
+            return False
+        self._last_miss_refresh = time.monotonic()
+        return True
+
+    async def _refresh_on_miss_async(self, client) -> bool:
+        """Refresh after a lookup miss (rate-limited). Returns True if it refreshed."""
+        if not self._may_refresh_on_miss(client):
+            return False
+        await self.refresh_async(client)
+        return True
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def _find_channel(self, name: str) -> Optional[dict]:
+        name = name.lstrip("#")
+        with self._lock:
+            for channel in self.channels.values():
+                if channel["name"] == name and not channel.get("is_archived"):
+                    return channel
+        return None
+
+    def _find_user(self, query: str) -> Optional[dict]:
+        query = query.lstrip("@").lower()
+        with self._lock:
+            for user in self.users.values():
+                if user.get("deleted"):
+                    continue
+                if query in (user["name"].lower(), user["display_name"].lower(), user["real_name"].lower()):
+                    return user
+        return None
+
+    def find_channel(self, name: str) -> Optional[dict]:
+        """A channel by name, from the cache only (no API calls)."""
+        return self._find_channel(name)
+
+    async def find_channel_async(self, name: str, client=None) -> Optional[dict]:
+        """A channel by name. With a client, stale or missing entries are refreshed."""
+        if client is not None:
+            await self.ensure_fresh_async(client)
+        channel = self._find_channel(name)
+        if channel is None and await self._refresh_on_miss_async(client):
+            channel = self._find_channel(name)
+        return channel
+
+    async def channel_id_async(self, name: str, client=None) -> Optional[str]:
+        channel = await self.find_channel_async(name, client)
+        return channel["id"] if channel else None
+
+    async def find_user_async(self, query: str, client=None) -> Optional[dict]:
+        """A user by username, display name or real name (case-insensitive)."""
+        if client is not None:
+            await self.ensure_fresh_async(client)
+        user = self._find_user(query)
+        if user is None and await self._refresh_on_miss_async(client):
+            user = self._find_user(query)
+        return user
+
+    async def user_id_async(self, query: str, client=None) -> Optional[str]:
+        user = await self.find_user_async(query, client)
+        return user["id"] if user else None
+
+    async def list_channels_async(self, include_private: bool = False, client=None) -> list[dict]:
+        """Active channels sorted by name."""
+        if client is not None:
+            await self.ensure_fresh_async(client)
+        return self._list_channels(include_private)
+
+    def _list_channels(self, include_private: bool) -> list[dict]:
+        with self._lock:
+            channels = [
+                c for c in self.channels.values()
+                if not c.get("is_archived") and (include_private or not c["is_private"])
+            ]
+        return sorted(channels, key=lambda c: c["name"])
+
+    # ------------------------------------------------------------------
+    # Incremental updates (from dispatcher events)
+    # ------------------------------------------------------------------
+
+    def upsert_channel(self, channel: dict):
+        """channel_created / channel_rename / group_rename: add or update a channel."""
+        with self._lock:
+            entry = self.channels.get(channel["id"], {})
+            entry.update({k: v for k, v in _channel_entry(channel).items() if k in channel or k not in entry})
+            self.channels[channel["id"]] = entry
+        self._save()
+
+    def remove_channel(self, channel_id: str):
+        """channel_deleted / channel_archive: forget a channel."""
+        with self._lock:
+            removed = self.channels.pop(channel_id, None)
+        if removed is not None:
+            self._save()
+
+    def upsert_user(self, user: dict):
+        """team_join / user_change: add or update a user."""
+        with self._lock:
+            self.users[user["id"]] = _user_entry(user)
+        self._save()
+
+
+_directory_instance = None
+
+def get_directory() -> SlackDirectory:
+    """Get the shared Slack directory."""
+    global _directory_instance
+    if _directory_instance is None:
+        _directory_instance = SlackDirectory()
+    return _directory_instance
@@ -15,11 +15,21 @@ Requires environment variables:
 import os
 import asyncio
 import logging
+import time
 from pathlib import Path
+from typing import Optional
 
+from slack_bolt import BoltResponse
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 
+from engine.slack.client import get_async_client, get_stats, missing_tokens
+from engine.slack.dedup import EventDeduplicator
+from engine.slack.directory import get_directory
+from engine.slack.history import get_history
+from engine.slack.lanes import ConversationLanes, Turn
+from engine.streaming import SLACK_EDIT_INTERVAL, SLACK_MESSAGE_LIMIT, StreamRenderer, get_stream_stats
+
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -27,12 +37,25 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize Slack app
+# Initialize Slack app on the shared pooled client (SLACK_BOT_TOKEN).
+# Events are acked as soon as the middleware has run; listeners run after.
 app = AsyncApp(
-    token=os.environ.get("SLACK_BOT_TOKEN"),
-    name="jpa-os"
+    client=get_async_client(),
+    name="jpa-os",
+    process_before_response=False,
 )
 
+# Redelivered events and messages already taken by another handler
+dedup = EventDeduplicator()
+
+
+@app.middleware
+async def suppress_redeliveries(body, next):
+    """Ack redelivered events (same event_id) without running any listener."""
+    if dedup.seen("event_id", body.get("event_id")):
+        return BoltResponse(status=200, body="")
+    await next()
+
 
 def get_agent_name_from_bot_id(bot_id: str) -> str:
     """
@@ -44,40 +67,76 @@ def get_agent_name_from_bot_id(bot_id: str) -> str:
     return "Vega"
 
 
-async def run_agent_and_respond(agent_name: str, message: str, say, thread_ts: str = None):
+async def run_agent_and_respond(agent_name: str, message: str, say, thread_ts: str = None, thinking_msg: dict = None):
     """
     Spawn an agent, get response, post to Slack.
+
+    thinking_msg is a placeholder already posted by the lanes; without one,
+    a new "_thinking..._" message is posted.
     """
+    renderer = None
     try:
         # Import here to avoid circular imports
         from engine.agents.base import run_vega_streaming
 
         # Acknowledge we're working on it
-        thinking_msg = await say(
-            text=f"_thinking..._",
-            thread_ts=thread_ts
+        if thinking_msg is None:
+            thinking_msg = await say(
+                text=f"_thinking..._",
+                thread_ts=thread_ts
+            )
+
+        # Edit the placeholder as the response streams in
+        renderer = StreamRenderer(
+            edit=lambda msg, text: app.client.chat_update(channel=msg["channel"], ts=msg["ts"], text=text),
+            post=lambda text: say(text=text, thread_ts=thread_ts),
+            placeholder=thinking_msg,
+            limit=SLACK_MESSAGE_LIMIT,
+            min_interval=SLACK_EDIT_INTERVAL,
+            name=f"slack {agent_name}",
         )
-
-        # Collect the full response
-        full_response = ""
         async for chunk in run_vega_streaming(message):
-            full_response += chunk
-
-        # Update the message with the response
-        await app.client.chat_update(
-            channel=thinking_msg["channel"],
-            ts=thinking_msg["ts"],
-            text=full_response
-        )
+            await renderer.feed(chunk)
+        await renderer.finish()
 
     except Exception as e:
         logger.error(f"Error running agent: {e}")
+        if renderer is not None:
+            await renderer.abort()
         await say(
             text=f"Sorry, I encountered an error: {str(e)}",
             thread_ts=thread_ts
         )
 
 
+async def run_turn(turn: Turn):
+    """Run one queued turn (see engine/slack/lanes.py)."""
+    await run_agent_and_respond(
+        agent_name=turn.agent_name,
+        message=turn.text,
+        say=turn.say,
+        thread_ts=turn.thread_ts,
+        thinking_msg=turn.placeholder,
+    )
+
+
+# One turn at a time per conversation, a few at a time overall
+lanes = ConversationLanes(app.client, run_turn)
+
+
+def conversation_key(event: dict) -> tuple:
+    """
+    Lane key: the thread a message belongs to. A top-level channel message
+    starts its own thread (that's where it's answered), so unrelated
+    messages — from different people — never share a turn. Top-level DMs
+    are one conversation with one person and share the DM's lane.
+    """
+    channel = event.get("channel")
+    if event.get("channel_type") == "im":
+        return (channel, event.get("thread_ts"))
+    return (channel, event.get("thread_ts") or event.get("ts"))
+
+
 @app.event("app_mention")
 async def handle_mention(event, say):
     """
@@ -101,12 +160,18 @@ async def handle_mention(event, say):
     # Get thread_ts for threading
     thread_ts = event.get("thread_ts") or event.get("ts")
 
-    # Run the agent
-    await run_agent_and_respond(
+    # The message event for this mention may already have been handled
+    if not dedup.claim_message(event):
+        return
+
+    # Queue the agent turn
+    await lanes.submit(
+        conversation_key(event),
+        text,
+        say,
+        thread_ts=thread_ts,
         agent_name="Vega",
-        message=text,
-        say=say,
-        thread_ts=thread_ts
+        message_ts=event.get("ts"),
     )
 
 
@@ -115,34 +180,72 @@ ALWAYS_LISTEN_CHANNELS = [
     "team-jpa",  # Channel names (will be resolved to IDs)
 ]
 
-# Cache for channel name -> ID mapping
-_channel_id_cache = {}
+# Re-resolve monitored channel names that weren't found at most this often
+UNRESOLVED_RETRY_SECONDS = 600
 
 
-async def get_channel_id(channel_name: str) -> str | None:
-    """Get channel ID from channel name."""
-    if channel_name in _channel_id_cache:
-        return _channel_id_cache[channel_name]
+class MonitoredChannels:
+    """
+    IDs of ALWAYS_LISTEN_CHANNELS, resolved once at startup (full
+    directory pagination) so the per-message check is a set lookup.
 
-    try:
-        result = await app.client.conversations_list(types="public_channel,private_channel")
-        for channel in result.get("channels", []):
-            if channel.get("name") == channel_name:
-                _channel_id_cache[channel_name] = channel["id"]
-                return channel["id"]
-    except Exception as e:
-        logger.error(f"Error looking up channel {channel_name}: {e}")
+    Names that don't resolve are remembered and retried at most every
+    UNRESOLVED_RETRY_SECONDS; channel create/rename/delete events rebuild
+    the set from the directory without an API call.
+    """
 
-    return None
+    def __init__(self, names: list[str]):
+        self.names = [name.lstrip("#") for name in names]
+        self.ids: set[str] = set()
+        self.unresolved: set[str] = set(self.names)
+        self._retry_at = 0.0
+        self._retry_task: Optional[asyncio.Task] = None
+
+    async def resolve(self, client):
+        """Refresh the directory if stale, then rebuild the ID set."""
+        try:
+            await get_directory().ensure_fresh_async(client)
+        except Exception as e:
+            logger.error(f"Error refreshing Slack directory: {e}")
+        self.rebuild()
+        self._retry_at = time.monotonic() + UNRESOLVED_RETRY_SECONDS
+
+    def rebuild(self):
+        """Recompute the ID set from the cached directory (no API calls)."""
+        directory = get_directory()
+        ids, unresolved = set(), set()
+        for name in self.names:
+            channel = directory.find_channel(name)
+            if channel:
+                ids.add(channel["id"])
+            else:
+                unresolved.add(name)
+        if unresolved and unresolved != self.unresolved:
+            logger.warning(f"Monitored channels not found: {', '.join(sorted(unresolved))}")
+        self.ids, self.unresolved = ids, unresolved
+
+    def __contains__(self, channel_id: str) -> bool:
+        if self.unresolved and time.monotonic() >= self._retry_at:
+            self._retry_at = time.monotonic() + UNRESOLVED_RETRY_SECONDS
+            if self._retry_task is None or self._retry_task.done():
+                self._retry_task = asyncio.create_task(self._retry())
+        return channel_id in self.ids
+
+    async def _retry(self):
+        """Unresolved names: one forced directory refresh."""
+        try:
+            await get_directory().refresh_async(app.client)
+        except Exception as e:
+            logger.error(f"Error refreshing Slack directory: {e}")
+        self.rebuild()
+
+
+monitored_channels = MonitoredChannels(ALWAYS_LISTEN_CHANNELS)
 
 
 async def is_always_listen_channel(channel_id: str) -> bool:
     """Check if this channel is one we always listen to."""
-    for channel_name in ALWAYS_LISTEN_CHANNELS:
-        cid = await get_channel_id(channel_name)
-        if cid == channel_id:
-            return True
-    return False
+    return channel_id in monitored_channels
 
 
 @app.event("message")
@@ -150,12 +253,19 @@ async def handle_message(event, say):
     """
     Handle messages - DMs and monitored channels.
     """
+    # Keep cached history current (including edits to bot messages)
+    subtype = event.get("subtype")
+    if subtype == "message_changed":
+        get_history().apply_edit(event["channel"], event["message"])
+    elif subtype == "message_deleted":
+        get_history().apply_delete(event["channel"], event["deleted_ts"])
+
     # Ignore bot messages to prevent loops
     if event.get("bot_id"):
         return
 
     # Ignore message edits, deletes, etc.
-    if event.get("subtype"):
+    if subtype:
         return
 
     text = event.get("text", "").strip()
@@ -168,47 +278,96 @@ async def handle_message(event, say):
     # Handle DMs
     if channel_type == "im":
         logger.info(f"Received DM: {event}")
-        await run_agent_and_respond(
+        if not dedup.claim_message(event):
+            return
+        await lanes.submit(
+            conversation_key(event),
+            text,
+            say,
+            thread_ts=event.get("thread_ts"),
             agent_name="Vega",
-            message=text,
-            say=say,
-            thread_ts=event.get("thread_ts")
+            message_ts=event.get("ts"),
         )
         return
 
     # Handle monitored channels (no @mention needed)
     if await is_always_listen_channel(channel_id):
         logger.info(f"Received message in monitored channel: {event}")
-        await run_agent_and_respond(
+        if not dedup.claim_message(event):
+            return
+        await lanes.submit(
+            conversation_key(event),
+            text,
+            say,
+            thread_ts=event.get("thread_ts") or event.get("ts"),
             agent_name="Vega",
-            message=text,
-            say=say,
-            thread_ts=event.get("thread_ts") or event.get("ts")
+            message_ts=event.get("ts"),
         )
 
 
+# ============================================================================
+# Directory updates — keep the cached channel/user map current between refreshes
+# ============================================================================
+
+@app.event("channel_created")
+@app.event("channel_rename")
+@app.event("group_rename")
+async def handle_channel_change(event):
+    get_directory().upsert_channel(event["channel"])
+    monitored_channels.rebuild()
+
+
+@app.event("channel_deleted")
+@app.event("channel_archive")
+@app.event("group_archive")
+async def handle_channel_removed(event):
+    get_directory().remove_channel(event["channel"])
+    monitored_channels.rebuild()
+
+
+@app.event("team_join")
+@app.event("user_change")
+async def handle_user_change(event):
+    get_directory().upsert_user(event["user"])
+
+
+async def create_handler() -> AsyncSocketModeHandler:
+    """Socket Mode handler for the app, with monitored channels resolved."""
+    handler = AsyncSocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN"))
+
+    # Resolve monitored channel names to IDs once, up front
+    await monitored_channels.resolve(app.client)
+    logger.info(f"Listening in {len(monitored_channels.ids)} monitored channel(s)")
+    return handler
+
+
 async def main():
     """
     Start the Slack dispatcher.
     """
     # Check for required tokens
-    if not os.environ.get("SLACK_BOT_TOKEN"):
-        logger.error("SLACK_BOT_TOKEN not set")
-        logger.error("Get it from: api.slack.com/apps > OAuth & Permissions > Bot User OAuth Token")
+    problem = missing_tokens()
+    if problem:
+        for line in problem.splitlines():
+            logger.error(line)
         return
 
-    if not os.environ.get("SLACK_APP_TOKEN"):
-        logger.error("SLACK_APP_TOKEN not set")
-        logger.error("Get it from: api.slack.com/apps > Basic Information > App-Level Tokens")
-        logger.error("Create one with 'connections:write' scope")
-        return
-
-    handler = AsyncSocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN"))
+    handler = await create_handler()
 
     logger.info("Starting jpa-os Slack dispatcher...")
     logger.info("Vega is online and listening.")
 
-    await handler.start_async()
+    try:
+        await handler.start_async()
+    finally:
+        log_session_stats()
+
+
+def log_session_stats():
+    """Log API call, streaming and dedup counters for this session."""
+    logger.info("Slack API calls this session:\n" + get_stats().summary())
+    logger.info("Streamed responses this session: " + get_stream_stats().summary())
+    logger.info("Duplicate events: " + dedup.summary())
 
 
 if __name__ == "__main__":
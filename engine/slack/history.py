@@ -0,0 +1,363 @@
+"""
+Slack Message History Cache
+
+Local per-channel copy of conversation history in SQLite, so re-reading a
+channel only fetches what's new.
+
+- Bulk fetches page through conversations.history / conversations.replies
+  with cursors (no 100-message cap)
+- Each channel remembers the ts range it holds completely; later reads
+  fetch only messages newer than the latest cached ts (and older ones
+  only if the request reaches past the cached range)
+- since/until windows for reviews that need e.g. a full week of history
+- Edits and deletions seen by the dispatcher are applied to the cache
+
+Usage:
+    from engine.slack.history import get_history
+
+    history = get_history()
+    recent = await history.channel_messages(client, "C123", limit=50)
+    week = await history.channel_messages(client, "C123", since=time.time() - 7 * 86400)
+    thread = await history.thread_messages(client, "C123", "1700000000.000100")
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ROOT = Path(__file__).parent.parent.parent
+DEFAULT_HISTORY_PATH = ROOT / "vault" / "hive" / "slack_history.db"
+
+# Page size for conversations.history / conversations.replies (API max 999, recommended <= 200)
+PAGE_SIZE = 200
+
+# Sentinel low bound: the cache reaches back to the start of the channel
+CHANNEL_START = "0"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS messages (
+        channel TEXT NOT NULL,
+        ts TEXT NOT NULL,
+        ts_num REAL NOT NULL,
+        thread_ts TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (channel, ts)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_messages_time ON messages (channel, ts_num)",
+    # Thread replies (not part of the channel timeline, so kept separately)
+    """CREATE TABLE IF NOT EXISTS replies (
+        channel TEXT NOT NULL,
+        thread_ts TEXT NOT NULL,
+        ts TEXT NOT NULL,
+        ts_num REAL NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (channel, thread_ts, ts)
+    )""",
+    # Fully cached ts range per channel / thread
+    """CREATE TABLE IF NOT EXISTS coverage (
+        channel TEXT NOT NULL,
+        thread_ts TEXT NOT NULL DEFAULT '',
+        oldest TEXT NOT NULL,
+        latest TEXT NOT NULL,
+        PRIMARY KEY (channel, thread_ts)
+    )""",
+]
+
+
+def _num(ts) -> float:
+    return float(ts) if ts else 0.0
+
+
+async def _pages(call, key: str, limit: Optional[int] = None, **kwargs):
+    """
+    Fetch cursor-paginated messages (newest first for conversations.history).
+
+    Returns:
+        (messages, exhausted) — exhausted is True if every page was read
+    """
+    messages, cursor = [], None
+    while True:
+        page_size = PAGE_SIZE if limit is None else min(PAGE_SIZE, max(limit - len(messages), 1))
+        # inclusive: window bounds are closed; re-fetching a boundary message is harmless
+        response = await call(limit=page_size, cursor=cursor, inclusive=True, **kwargs)
+        messages.extend(response.get(key, []))
+        cursor = (response.get("response_metadata") or {}).get("next_cursor")
+        if not cursor or not response.get("has_more", True):
+            return messages, True
+        if limit is not None and len(messages) >= limit:
+            return messages, False
+
+
+class SlackHistory:
+    """Cached channel and thread history (SQLite, WAL mode). Thread-safe."""
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or DEFAULT_HISTORY_PATH)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=30,
+            isolation_level=None,  # autocommit; multi-row writes use explicit transactions
+            check_same_thread=False,
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        with self._lock:
+            for statement in SCHEMA:
+                self._conn.execute(statement)
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _coverage(self, channel: str, thread_ts: str = "") -> Optional[tuple[str, str]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT oldest, latest FROM coverage WHERE channel = ? AND thread_ts = ?",
+                (channel, thread_ts),
+            ).fetchone()
+        return (row["oldest"], row["latest"]) if row else None
+
+    def _store(
+        self,
+        channel: str,
+        messages: list[dict],
+        oldest: str,
+        latest: str,
+        thread_ts: str = "",
+    ):
+        """Save fetched messages and widen the covered range, in one transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if thread_ts:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO replies (channel, thread_ts, ts, ts_num, data) VALUES (?, ?, ?, ?, ?)",
+                        [(channel, thread_ts, m["ts"], _num(m["ts"]), json.dumps(m)) for m in messages],
+                    )
+                else:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO messages (channel, ts, ts_num, thread_ts, data) VALUES (?, ?, ?, ?, ?)",
+                        [(channel, m["ts"], _num(m["ts"]), m.get("thread_ts"), json.dumps(m)) for m in messages],
+                    )
+                current = self._coverage(channel, thread_ts)
+                if current is not None:
+                    oldest = min(oldest, current[0], key=_num)
+                    latest = max(latest, current[1], key=_num)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO coverage (channel, thread_ts, oldest, latest) VALUES (?, ?, ?, ?)",
+                    (channel, thread_ts, oldest, latest),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _query(
+        self,
+        channel: str,
+        since: Optional[float],
+        until: Optional[float],
+        limit: Optional[int],
+        thread_ts: str = "",
+    ) -> list[dict]:
+        """Cached messages in [since, until], newest `limit` of them, oldest first."""
+        table, where, params = "messages", "channel = ?", [channel]
+        if thread_ts:
+            table, where = "replies", "channel = ? AND thread_ts = ?"
+            params.append(thread_ts)
+        if since is not None:
+            where += " AND ts_num >= ?"
+            params.append(since)
+        if until is not None:
+            where += " AND ts_num <= ?"
+            params.append(until)
+        sql = f"SELECT data FROM {table} WHERE {where} ORDER BY ts_num DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(row["data"]) for row in reversed(rows)]
+
+    # ------------------------------------------------------------------
+    # Channel history
+    # ------------------------------------------------------------------
+
+    async def channel_messages(
+        self,
+        client,
+        channel: str,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        Channel messages, oldest first, fetching only what the cache lacks.
+
+        Args:
+            client: AsyncWebClient
+            channel: Channel ID
+            since: Unix time; include messages at or after it
+            until: Unix time; include messages at or before it
+            limit: Newest N messages in the window (None = all of them)
+
+        Returns:
+            Message dicts as returned by conversations.history
+        """
+        if since is None and limit is None:
+            raise ValueError("channel_messages needs since or limit")
+
+        coverage = self._coverage(channel)
+        if coverage is None:
+            await self._fetch_initial(client, channel, since, until, limit)
+        else:
+            await self._fetch_newer(client, channel, coverage[1])
+            await self._fetch_older(client, channel, since, until, limit)
+
+        return self._query(channel, since, until, limit)
+
+    async def _fetch_initial(
+        self,
+        client,
+        channel: str,
+        since: Optional[float],
+        until: Optional[float],
+        limit: Optional[int],
+    ):
+        """Nothing cached yet: newest messages back to `since` (or `limit` of them)."""
+        kwargs = {}
+        if since is not None:
+            kwargs["oldest"] = f"{since:.6f}"
+        if until is not None and until < time.time():
+            kwargs["latest"] = f"{until:.6f}"
+        messages, exhausted = await _pages(
+            client.conversations_history, "messages", limit=None if since is not None else limit,
+            channel=channel, **kwargs,
+        )
+        # Nothing exists between the newest message and `until` (or now)
+        latest = kwargs.get("latest") or (messages[0]["ts"] if messages else kwargs.get("oldest", CHANNEL_START))
+        oldest = kwargs.get("oldest", CHANNEL_START) if exhausted else messages[-1]["ts"]
+        self._store(channel, messages, oldest, latest)
+        logger.debug(f"Cached {len(messages)} messages for {channel}")
+
+    async def _fetch_newer(self, client, channel: str, latest: str):
+        """Everything after the newest cached ts."""
+        messages, _ = await _pages(client.conversations_history, "messages", channel=channel, oldest=latest)
+        if messages:
+            self._store(channel, messages, latest, messages[0]["ts"])
+
+    async def _fetch_older(
+        self,
+        client,
+        channel: str,
+        since: Optional[float],
+        until: Optional[float],
+        limit: Optional[int],
+    ):
+        """Extend the cached range backwards if the request reaches past it."""
+        oldest, _ = self._coverage(channel)
+        if oldest == CHANNEL_START:
+            return
+
+        if since is not None:
+            if since >= _num(oldest):
+                return
+            messages, _ = await _pages(
+                client.conversations_history, "messages",
+                channel=channel, oldest=f"{since:.6f}", latest=oldest,
+            )
+            self._store(channel, messages, f"{since:.6f}", oldest)
+            return
+
+        # Limit-based read: page back until the window holds `limit` messages
+        while oldest != CHANNEL_START:
+            missing = limit - len(self._query(channel, None, until, limit))
+            if missing <= 0:
+                return
+            # +1: the inclusive bound returns the cached boundary message again
+            messages, exhausted = await _pages(
+                client.conversations_history, "messages", limit=missing + 1, channel=channel, latest=oldest,
+            )
+            new_oldest = CHANNEL_START if exhausted else messages[-1]["ts"]
+            self._store(channel, messages, new_oldest, oldest)
+            if new_oldest == oldest:
+                return
+            oldest = new_oldest
+
+    # ------------------------------------------------------------------
+    # Threads
+    # ------------------------------------------------------------------
+
+    async def thread_messages(self, client, channel: str, thread_ts: str, limit: Optional[int] = None) -> list[dict]:
+        """
+        A thread's parent and replies, oldest first. Only replies newer than
+        the latest cached one are fetched (the parent always comes back too).
+
+        Args:
+            client: AsyncWebClient
+            channel: Channel ID
+            thread_ts: Parent message ts
+            limit: First N messages (None = the whole thread)
+
+        Returns:
+            Message dicts as returned by conversations.replies
+        """
+        coverage = self._coverage(channel, thread_ts)
+        kwargs = {"oldest": coverage[1]} if coverage else {}
+        messages, _ = await _pages(
+            client.conversations_replies, "messages", channel=channel, ts=thread_ts, **kwargs,
+        )
+        if messages or coverage is None:
+            latest = max((m["ts"] for m in messages), key=_num, default=thread_ts)
+            self._store(channel, messages, thread_ts, latest, thread_ts=thread_ts)
+        thread = self._query(channel, None, None, None, thread_ts=thread_ts)
+        return thread[:limit] if limit is not None else thread
+
+    # ------------------------------------------------------------------
+    # Updates (from dispatcher events)
+    # ------------------------------------------------------------------
+
+    def apply_edit(self, channel: str, message: dict):
+        """message_changed: replace a cached message with its edited version."""
+        data = json.dumps(message)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE messages SET data = ? WHERE channel = ? AND ts = ?", (data, channel, message["ts"])
+            )
+            self._conn.execute(
+                "UPDATE replies SET data = ? WHERE channel = ? AND ts = ?", (data, channel, message["ts"])
+            )
+
+    def apply_delete(self, channel: str, ts: str):
+        """message_deleted: drop a cached message."""
+        with self._lock:
+            self._conn.execute("DELETE FROM messages WHERE channel = ? AND ts = ?", (channel, ts))
+            self._conn.execute("DELETE FROM replies WHERE channel = ? AND ts = ?", (channel, ts))
+
+    def forget(self, channel: str):
+        """Drop everything cached for a channel (it's refetched on the next read)."""
+        with self._lock:
+            for table in ("messages", "replies", "coverage"):
+                self._conn.execute(f"DELETE FROM {table} WHERE channel = ?", (channel,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_history_instance = None
+
+def get_history() -> SlackHistory:
+    """Get the shared Slack history cache."""
+    global _history_instance
+    if _history_instance is None:
+        _history_instance = SlackHistory()
+    return _history_instance
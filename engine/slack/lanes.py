@@ -0,0 +1,228 @@
+"""
+Conversation Lanes
+
+Serialises agent turns per conversation and caps how many run at once
+across the dispatcher:
+
+- One lane per conversation (a thread, or a channel/DM's top level): a
+  turn starts only after the previous turn in its lane has finished, so
+  replies land in the order the messages were sent
+- At most max_concurrent turns (agent sessions) run at once; the rest
+  wait in arrival order
+- Messages that arrive while a turn is still waiting — or within
+  coalesce_seconds of each other — are merged into that one turn
+- Waiting turns show their queue position in the "_thinking..._"
+  placeholder, updated as the queue moves
+
+Usage:
+    lanes = ConversationLanes(client, run_turn)
+    await lanes.submit(("C123", "1700000000.000100"), text, say, thread_ts)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Agent turns running at once across all conversations
+DEFAULT_MAX_CONCURRENT = 3
+
+# A turn waits this long after its latest message for follow-ups to merge in
+DEFAULT_COALESCE_SECONDS = 1.5
+
+THINKING_TEXT = "_thinking..._"
+
+
+def placeholder_text(position: int) -> str:
+    """Placeholder for a turn `position` places back in the queue (0 = running)."""
+    if position <= 0:
+        return THINKING_TEXT
+    return f"_thinking... (#{position} in queue)_"
+
+
+@dataclass
+class Turn:
+    """One agent turn: a conversation's pending message(s) and placeholder."""
+    key: Hashable
+    say: Callable
+    thread_ts: Optional[str]
+    agent_name: str
+    messages: list[str] = field(default_factory=list)
+    message_ts: set[str] = field(default_factory=set)
+    placeholder: Optional[dict] = None  # say() response: channel + ts
+    posting: bool = True  # placeholder still being posted; can't start yet
+    ready_at: float = 0.0
+    position: int = 0  # as last shown in the placeholder
+
+    @property
+    def text(self) -> str:
+        return "\n\n".join(self.messages)
+
+
+class ConversationLanes:
+    """Per-conversation serial queues with a global concurrency cap."""
+
+    def __init__(
+        self,
+        client,
+        run_turn: Callable[[Turn], Awaitable],
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        coalesce_seconds: float = DEFAULT_COALESCE_SECONDS,
+    ):
+        """
+        Args:
+            client: AsyncWebClient used to update placeholders
+            run_turn: Coroutine function that runs one Turn (and replaces
+                its placeholder with the response)
+            max_concurrent: Turns running at once across all lanes
+            coalesce_seconds: Quiet period before a turn starts
+        """
+        self.client = client
+        self.run_turn = run_turn
+        self.max_concurrent = max_concurrent
+        self.coalesce_seconds = coalesce_seconds
+
+        self._waiting: list[Turn] = []  # arrival order
+        self._active: set[Hashable] = set()  # lanes with a running turn
+        self._tasks: set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+
+    async def submit(
+        self,
+        key: Hashable,
+        text: str,
+        say,
+        thread_ts: Optional[str] = None,
+        agent_name: str = "Vega",
+        message_ts: Optional[str] = None,
+    ):
+        """
+        Queue a message for its conversation's lane.
+
+        Args:
+            key: Conversation key, e.g. (channel, thread_ts)
+            text: Message text
+            say: Bolt say() for the conversation
+            thread_ts: Thread to reply in
+            agent_name: Agent to run
+            message_ts: The message's ts; the same message delivered twice
+                (app_mention + message) is only added once
+        """
+        pending = next((t for t in self._waiting if t.key == key), None)
+        if pending is not None:
+            if message_ts is not None and message_ts in pending.message_ts:
+                return
+            if message_ts is not None:
+                pending.message_ts.add(message_ts)
+            pending.messages.append(text)
+            pending.ready_at = time.monotonic() + self.coalesce_seconds
+            logger.info(f"Coalesced message into pending turn for {key} ({len(pending.messages)} messages)")
+            self._pump()
+            return
+
+        turn = Turn(
+            key=key,
+            say=say,
+            thread_ts=thread_ts,
+            agent_name=agent_name,
+            messages=[text],
+            message_ts={message_ts} if message_ts else set(),
+            ready_at=time.monotonic() + self.coalesce_seconds,
+        )
+        # Waiting (so follow-ups coalesce into it) but not startable until
+        # its placeholder exists, however long say() takes under retries
+        self._waiting.append(turn)
+        turn.position = self._position(turn)
+        try:
+            turn.placeholder = await say(text=placeholder_text(turn.position), thread_ts=thread_ts)
+        except Exception as e:
+            logger.warning(f"Could not post placeholder for {key}: {e}")
+        finally:
+            turn.posting = False
+        self._pump()
+
+    def stats(self) -> dict:
+        return {
+            "running": len(self._active),
+            "waiting": len(self._waiting),
+            "max_concurrent": self.max_concurrent,
+        }
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _blocked(self, turn: Turn) -> bool:
+        """Waiting on its lane or a free slot (not just the coalesce window)."""
+        return turn.key in self._active or len(self._active) >= self.max_concurrent
+
+    def _position(self, turn: Turn) -> int:
+        """Turns that must start before this one (0 = it's next, or running)."""
+        if not self._blocked(turn):
+            return 0
+        ahead = self._waiting.index(turn) if turn in self._waiting else 0
+        return ahead + 1
+
+    def _pump(self):
+        """Start every turn that can start; schedule a wakeup for the rest."""
+        now = time.monotonic()
+        next_ready = None
+        for turn in list(self._waiting):
+            if len(self._active) >= self.max_concurrent:
+                break
+            if turn.key in self._active or turn.posting:
+                continue  # submit() pumps again once the placeholder is up
+            if turn.ready_at > now:
+                next_ready = min(next_ready or turn.ready_at, turn.ready_at)
+                continue
+            self._waiting.remove(turn)
+            self._active.add(turn.key)
+            task = asyncio.create_task(self._run(turn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+            self._wakeup = None
+        if next_ready is not None:
+            self._wakeup = asyncio.get_running_loop().call_later(next_ready - now, self._pump)
+
+        self._refresh_positions()
+
+    def _refresh_positions(self):
+        """Update placeholders whose queue position changed."""
+        for turn in self._waiting:
+            if turn.placeholder is None:
+                continue  # still being posted; refreshed on the next pump
+            position = self._position(turn)
+            if position != turn.position:
+                turn.position = position
+                self._show(turn, placeholder_text(position))
+
+    def _show(self, turn: Turn, text: str):
+        task = asyncio.create_task(self._update_placeholder(turn, text))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _update_placeholder(self, turn: Turn, text: str):
+        try:
+            await self.client.chat_update(
+                channel=turn.placeholder["channel"], ts=turn.placeholder["ts"], text=text
+            )
+        except Exception as e:
+            logger.debug(f"Could not update placeholder for {turn.key}: {e}")
+
+    async def _run(self, turn: Turn):
+        try:
+            if turn.position != 0:
+                turn.position = 0
+                await self._update_placeholder(turn, THINKING_TEXT)
+            await self.run_turn(turn)
+        except Exception as e:
+            logger.error(f"Turn for {turn.key} failed: {e}")
+        finally:
+            self._active.discard(turn.key)
+            self._pump()
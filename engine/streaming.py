@@ -0,0 +1,299 @@
+"""
+Progressive Streaming Renderer
+
+Shows an agent's response as it streams, instead of leaving
+"_thinking..._" up for the whole run:
+
+- The placeholder is edited as chunks arrive, at most once per
+  min_interval (a bounded cadence that stays under Slack/Discord edit
+  rate limits; a rate-limited edit doubles the interval)
+- Past the platform's message limit the text rolls over into a new
+  message, split on a paragraph/line/sentence/word boundary; an open
+  ``` code block is closed and reopened across the split
+- Time-to-first-token, total time, edits and messages are logged per
+  response and aggregated in get_stream_stats()
+
+Platform code supplies two coroutines: edit(message, text) and
+post(text) -> message.
+
+Usage:
+    renderer = StreamRenderer(
+        edit=lambda msg, text: msg.edit(content=text),
+        post=lambda text: channel.send(text),
+        placeholder=thinking_msg,
+        limit=DISCORD_MESSAGE_LIMIT,
+        min_interval=DISCORD_EDIT_INTERVAL,
+        name="discord",
+    )
+    async for chunk in run_vega_streaming(message):
+        await renderer.feed(chunk)
+    await renderer.finish()
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Discord rejects messages over 2000 characters
+DISCORD_MESSAGE_LIMIT = 2000
+
+# Slack accepts longer text, but recommends keeping a message under 4000 characters
+SLACK_MESSAGE_LIMIT = 4000
+
+# Seconds between edits of one message. Discord allows 5 edits per 5s per
+# channel; Slack's chat.update is Tier 3 (~50/min), shared by every stream
+DISCORD_EDIT_INTERVAL = 1.2
+SLACK_EDIT_INTERVAL = 3.0
+
+# Interval ceiling after repeated rate-limited edits
+MAX_EDIT_INTERVAL = 30.0
+
+# Tries for a finished message's write when rate limited
+MAX_WRITE_ATTEMPTS = 3
+
+# Shown after the text while the response is still streaming
+STREAMING_SUFFIX = " ▍"
+
+EMPTY_RESPONSE = "_(no response)_"
+
+FENCE = "```"
+
+
+def split_at_boundary(text: str, limit: int) -> tuple[str, str]:
+    """
+    Split text into a head of at most `limit` chars and the rest, at the
+    cleanest boundary in the second half of the head. A code block left
+    open by the split is closed in the head and reopened in the rest.
+    """
+    if len(text) <= limit:
+        return text, ""
+
+    reserve = len(FENCE) + 1  # room to close a fence
+    window = text[:limit - reserve]
+    cut = -1
+    for separator in ("\n\n", "\n", ". ", " "):
+        index = window.rfind(separator)
+        if index >= len(window) // 2:
+            cut = index + len(separator)
+            break
+    if cut == -1:
+        cut = len(window)
+
+    head, rest = text[:cut], text[cut:]
+    if head.count(FENCE) % 2 == 1:
+        head = head.rstrip("\n") + "\n" + FENCE
+        rest = FENCE + "\n" + rest
+    return head.rstrip(), rest.lstrip(" ")
+
+
+@dataclass
+class StreamMetrics:
+    """Timings for one streamed response (seconds)."""
+    name: str
+    started: float
+    first_token: Optional[float] = None
+    first_edit: Optional[float] = None
+    finished: Optional[float] = None
+    chunks: int = 0
+    chars: int = 0
+    edits: int = 0
+    messages: int = 1
+    rate_limited: int = 0
+
+    @property
+    def ttft(self) -> Optional[float]:
+        return self.first_token - self.started if self.first_token else None
+
+    @property
+    def total(self) -> Optional[float]:
+        return self.finished - self.started if self.finished else None
+
+    def summary(self) -> str:
+        ttft = f"{self.ttft:.1f}s" if self.ttft is not None else "n/a"
+        first_edit = f"{self.first_edit - self.started:.1f}s" if self.first_edit else "n/a"
+        return (
+            f"{self.name}: ttft {ttft}, first edit {first_edit}, total {self.total or 0:.1f}s, "
+            f"{self.chars} chars in {self.chunks} chunks, {self.edits} edits, {self.messages} message(s)"
+        )
+
+
+class StreamStats:
+    """Aggregate time-to-first-token across responses. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.responses = 0
+        self.ttft_total = 0.0
+        self.ttft_max = 0.0
+        self.duration_total = 0.0
+
+    def record(self, metrics: StreamMetrics):
+        with self._lock:
+            self.responses += 1
+            if metrics.ttft is not None:
+                self.ttft_total += metrics.ttft
+                self.ttft_max = max(self.ttft_max, metrics.ttft)
+            self.duration_total += metrics.total or 0.0
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self.responses:
+                return "No streamed responses yet"
+            return (
+                f"{self.responses} responses, ttft mean {self.ttft_total / self.responses:.1f}s "
+                f"max {self.ttft_max:.1f}s, mean duration {self.duration_total / self.responses:.1f}s"
+            )
+
+
+_stats = StreamStats()
+
+
+def get_stream_stats() -> StreamStats:
+    return _stats
+
+
+class StreamRenderer:
+    """Edits a placeholder message progressively as response chunks arrive."""
+
+    def __init__(
+        self,
+        edit: Callable[[Any, str], Awaitable],
+        post: Callable[[str], Awaitable[Any]],
+        placeholder: Any = None,
+        limit: int = DISCORD_MESSAGE_LIMIT,
+        min_interval: float = DISCORD_EDIT_INTERVAL,
+        name: str = "stream",
+    ):
+        """
+        Args:
+            edit: Coroutine function (message, text) that edits a message
+            post: Coroutine function (text) that posts a new message and returns it
+            placeholder: Message to edit first (None = post one on the first edit)
+            limit: Max characters per message
+            min_interval: Min seconds between edits
+            name: Label for the metrics log line
+        """
+        self.edit = edit
+        self.post = post
+        self.limit = limit
+        self.min_interval = min_interval
+        self.metrics = StreamMetrics(name=name, started=time.monotonic())
+
+        self._message = placeholder
+        self._current = ""  # text of the message being written
+        self._shown: Optional[str] = None
+        self._last_flush = 0.0
+        self._lock = asyncio.Lock()
+        self._pending: Optional[asyncio.Task] = None
+        self._finished = False
+
+    async def feed(self, chunk: str):
+        """Add a chunk; edits now or schedules an edit for the next slot."""
+        if not chunk:
+            return
+        if self.metrics.first_token is None:
+            self.metrics.first_token = time.monotonic()
+        self.metrics.chunks += 1
+        self.metrics.chars += len(chunk)
+        self._current += chunk
+
+        wait = self._last_flush + self.min_interval - time.monotonic()
+        if wait <= 0:
+            await self._flush()
+        elif self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._flush_later(wait))
+
+    async def finish(self) -> StreamMetrics:
+        """Write the final text (no streaming suffix) and record metrics."""
+        self._finished = True
+        if self._pending is not None:
+            self._pending.cancel()
+        if not self._current.strip() and self.metrics.messages == 1 and self.metrics.edits == 0:
+            self._current = EMPTY_RESPONSE
+        await self._flush(final=True)
+
+        self.metrics.finished = time.monotonic()
+        _stats.record(self.metrics)
+        logger.info(f"Streamed {self.metrics.summary()}")
+        return self.metrics
+
+    async def abort(self):
+        """After a failed run: drop the streaming suffix from what was shown (best effort)."""
+        self._finished = True
+        if self._pending is not None:
+            self._pending.cancel()
+        try:
+            await self._flush(final=True)
+        except Exception as e:
+            logger.debug(f"Could not tidy aborted stream: {e}")
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        if not self._finished:
+            # Shielded: finish() cancelling us must not interrupt a rollover
+            await asyncio.shield(self._flush())
+
+    async def _flush(self, final: bool = False):
+        async with self._lock:
+            # Roll over: finalise full messages, continue in a new one
+            room = self.limit - len(STREAMING_SUFFIX)
+            while len(self._current) > room:
+                head, self._current = split_at_boundary(self._current, room)
+                await self._write(head, required=True)
+                self._message = None
+                self._shown = None
+                self.metrics.messages += 1
+
+            text = self._current if final else self._current + STREAMING_SUFFIX
+            if self._current.strip() and text != self._shown:
+                await self._write(text, required=final)
+            self._last_flush = time.monotonic()
+
+    async def _write(self, text: str, required: bool = False):
+        """
+        Edit the current message (or post it), backing off when rate limited.
+
+        Interim edits are best-effort: one that fails (rate limited or
+        otherwise) is skipped and the next flush carries its text. A
+        required one (a finished message) waits out rate limits and
+        retries; other errors are raised.
+        """
+        for attempt in range(MAX_WRITE_ATTEMPTS):
+            try:
+                if self._message is None:
+                    self._message = await self.post(text)
+                else:
+                    await self.edit(self._message, text)
+                break
+            except Exception as e:
+                if not _is_rate_limit(e):
+                    if required:
+                        raise
+                    logger.warning(f"Stream edit failed, skipping this frame: {e}")
+                    return
+                self.metrics.rate_limited += 1
+                self.min_interval = min(self.min_interval * 2, MAX_EDIT_INTERVAL)
+                logger.warning(f"Stream edit rate limited; editing every {self.min_interval:.1f}s")
+                if not required:
+                    return
+                if attempt == MAX_WRITE_ATTEMPTS - 1:
+                    raise
+                await asyncio.sleep(self.min_interval)
+        self._shown = text
+        self.metrics.edits += 1
+        if self.metrics.first_edit is None:
+            self.metrics.first_edit = time.monotonic()
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    """429 from discord.py, slack_sdk or engine.discord.rest."""
+    status = getattr(error, "status", None)
+    response = getattr(error, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None) or getattr(response, "status", None)
+    return status == 429
@@ -0,0 +1,444 @@
+"""
+Async Discord tools for jpa-os agents.
+
+The same tools as engine/tools/discord.py, as coroutines on the shared
+REST client (engine/discord/rest.py). Await these from async code — the
+Slack and Discord dispatchers — so a tool call never blocks the event
+loop. engine/tools/discord.py wraps each one for sync callers.
+
+Usage:
+    from engine.tools import discord_async
+
+    await discord_async.send_message("general", "Deploy finished")
+"""
+
+import json
+from pathlib import Path
+
+import discord
+
+from engine.discord.rest import (
+    CATEGORY_CHANNEL,
+    TEXT_CHANNEL,
+    TEXT_CHANNEL_TYPES,
+    VIEW_CHANNEL,
+    VOICE_CHANNEL,
+    get_rest,
+)
+from engine.tools.loop import on_shutdown
+
+# Paths
+ROOT = Path(__file__).parent.parent.parent
+WEBHOOKS_PATH = ROOT / "vault" / "hive" / "discord_webhooks.json"
+
+
+def _load_webhooks() -> dict:
+    """Load webhook mappings."""
+    if WEBHOOKS_PATH.exists():
+        return json.loads(WEBHOOKS_PATH.read_text())
+    return {}
+
+
+def _save_webhooks(webhooks: dict):
+    """Save webhook mappings."""
+    WEBHOOKS_PATH.parent.mkdir(parents=True, exist_ok=True)
+    WEBHOOKS_PATH.write_text(json.dumps(webhooks, indent=2))
+
+
+async def _close_rest():
+    await get_rest().close()
+
+
+on_shutdown(_close_rest)
+
+
+# ============================================================================
+# Messaging
+# ============================================================================
+
+async def send_message(channel_name: str, content: str, guild_name: str = None) -> str:
+    """
+    Send a message to a Discord channel as Vega.
+
+    Args:
+        channel_name: Name of the channel (e.g., "general")
+        content: Message content
+        guild_name: Server name (optional if only in one server)
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    channel = await rest.find_channel(channel_name, guild_name)
+    if channel is None:
+        return f"Channel not found: #{channel_name}"
+    await rest.send_message(channel["id"], content)
+    return f"Sent message to #{channel_name}"
+
+
+async def send_dm(username: str, content: str) -> str:
+    """
+    Send a DM to a user.
+
+    Args:
+        username: Discord username
+        content: Message content
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    member = await rest.find_member(username)
+    if member is None:
+        return f"User not found: {username}"
+    channel_id = await rest.dm_channel(member["user"]["id"])
+    await rest.send_message(channel_id, content)
+    return f"Sent DM to {username}"
+
+
+async def ping_jpa(content: str) -> str:
+    """
+    Send a DM to jpa. Use when you need jpa's attention.
+
+    Args:
+        content: Message content
+
+    Returns:
+        Confirmation
+    """
+    # Try common username patterns
+    for username in ["jpa", "josephpalbanese", "joseph"]:
+        try:
+            result = await send_dm(username, content)
+        except Exception:
+            continue
+        if result.startswith("Sent"):
+            return result
+    return "Could not find jpa on Discord"
+
+
+async def send_as_agent(channel_name: str, agent_name: str, content: str, avatar_url: str = None) -> str:
+    """
+    Send a message as a specific agent using webhooks.
+    Creates the webhook if it doesn't exist.
+
+    Args:
+        channel_name: Channel to send to
+        agent_name: Name the message appears from
+        content: Message content
+        avatar_url: Optional avatar URL for the agent
+
+    Returns:
+        Confirmation
+    """
+    webhooks = _load_webhooks()
+
+    rest = get_rest()
+    channel = await rest.find_channel(channel_name)
+    if channel is None:
+        return f"Channel not found: #{channel_name}"
+
+    # Check for existing webhook
+    channel_key = channel["id"]
+    if agent_name in webhooks and channel_key in webhooks[agent_name]:
+        webhook_url = webhooks[agent_name][channel_key]
+    else:
+        # Create new webhook
+        webhook_url = await rest.create_webhook(channel["id"], agent_name)
+        webhooks.setdefault(agent_name, {})[channel_key] = webhook_url
+        _save_webhooks(webhooks)
+
+    # Send via webhook
+    await rest.execute_webhook(
+        webhook_url,
+        content=content,
+        username=agent_name,
+        avatar_url=avatar_url,
+    )
+    return f"Sent message as {agent_name} to #{channel_name}"
+
+
+# ============================================================================
+# Agent Identity Management
+# ============================================================================
+
+async def create_agent_identity(agent_name: str, channel_name: str = "general", avatar_url: str = None) -> str:
+    """
+    Create a Discord identity (webhook) for a new agent.
+    Call this when spawning a new agent so they can post as themselves.
+
+    Args:
+        agent_name: The agent's name
+        channel_name: Initial channel to create webhook in
+        avatar_url: Optional avatar URL
+
+    Returns:
+        Confirmation with webhook info
+    """
+    webhooks = _load_webhooks()
+
+    rest = get_rest()
+    channel = await rest.find_channel(channel_name)
+    if channel is None:
+        return f"Channel not found: #{channel_name}"
+
+    webhook_url = await rest.create_webhook(
+        channel["id"], agent_name, reason=f"jpa-os agent: {agent_name}"
+    )
+    webhooks.setdefault(agent_name, {})[channel["id"]] = webhook_url
+    _save_webhooks(webhooks)
+    return f"Created Discord identity for {agent_name} in #{channel_name}"
+
+
+async def list_agent_identities() -> str:
+    """
+    List all agent identities (webhooks) we've created.
+
+    Returns:
+        List of agents and their channels
+    """
+    webhooks = _load_webhooks()
+
+    if not webhooks:
+        return "No agent identities created yet."
+
+    output = ["Agent Discord Identities:\n"]
+    for agent, channels in webhooks.items():
+        output.append(f"  {agent}: {len(channels)} channel(s)")
+
+    return "\n".join(output)
+
+
+# ============================================================================
+# Channel Management
+# ============================================================================
+
+async def create_channel(name: str, category: str = None, topic: str = "", private: bool = False) -> str:
+    """
+    Create a new Discord channel.
+
+    Args:
+        name: Channel name
+        category: Category to put it in (optional)
+        topic: Channel topic
+        private: Make it private
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    guild = await rest.find_guild()
+    if guild is None:
+        return "No server found"
+
+    payload = {"name": name, "type": TEXT_CHANNEL, "topic": topic}
+
+    # Find category if specified
+    if category:
+        for c in rest.directory.channels.get(guild["id"], []):
+            if c["type"] == CATEGORY_CHANNEL and c["name"].lower() == category.lower():
+                payload["parent_id"] = c["id"]
+                break
+
+    if private:
+        # Hidden from @everyone (role ID == guild ID), visible to the bot
+        me = await rest.me()
+        payload["permission_overwrites"] = [
+            {"id": guild["id"], "type": 0, "deny": str(VIEW_CHANNEL)},
+            {"id": me["id"], "type": 1, "allow": str(VIEW_CHANNEL)},
+        ]
+
+    channel = await rest.request("POST", f"/guilds/{guild['id']}/channels", json=payload)
+    rest.remember_channel(channel)
+    return f"Created channel #{name}"
+
+
+async def delete_channel(name: str) -> str:
+    """
+    Delete a Discord channel.
+
+    Args:
+        name: Channel name
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    channel = await rest.find_channel(name)
+    if channel is None:
+        return f"Channel not found: #{name}"
+    await rest.request("DELETE", f"/channels/{channel['id']}", reason="Deleted by jpa-os")
+    rest.forget_channel(channel["id"])
+    return f"Deleted channel #{name}"
+
+
+async def list_channels() -> str:
+    """
+    List all channels in the server.
+
+    Returns:
+        Channel list
+    """
+    rest = get_rest()
+    directory = await rest.refresh_directory()
+
+    result = []
+    for guild in directory.guilds:
+        result.append(f"**{guild['name']}**\n")
+        channels = sorted(directory.channels.get(guild["id"], []), key=lambda c: c.get("position", 0))
+        text = [c for c in channels if c["type"] in TEXT_CHANNEL_TYPES]
+        for category in (c for c in channels if c["type"] == CATEGORY_CHANNEL):
+            result.append(f"  {category['name']}/")
+            for channel in text:
+                if channel.get("parent_id") == category["id"]:
+                    result.append(f"    #{channel['name']}")
+        # Uncategorized channels
+        for channel in text:
+            if not channel.get("parent_id"):
+                result.append(f"  #{channel['name']}")
+
+    return "\n".join(result) if result else "No channels found"
+
+
+async def set_channel_topic(channel_name: str, topic: str) -> str:
+    """
+    Set a channel's topic.
+
+    Args:
+        channel_name: Channel name
+        topic: New topic
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    channel = await rest.find_channel(channel_name)
+    if channel is None:
+        return f"Channel not found: #{channel_name}"
+    await rest.request("PATCH", f"/channels/{channel['id']}", json={"topic": topic})
+    channel["topic"] = topic
+    return f"Set topic for #{channel_name}"
+
+
+# ============================================================================
+# Role Management
+# ============================================================================
+
+async def create_role(name: str, color: str = None, permissions: list = None) -> str:
+    """
+    Create a new role.
+
+    Args:
+        name: Role name
+        color: Hex color (e.g., "#FF0000")
+        permissions: List of permission names
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    guild = await rest.find_guild()
+    if guild is None:
+        return "No server found"
+
+    payload = {"name": name}
+    if color:
+        payload["color"] = int(color.lstrip("#"), 16)
+    if permissions:
+        payload["permissions"] = str(discord.Permissions(**{p: True for p in permissions}).value)
+
+    role = await rest.request("POST", f"/guilds/{guild['id']}/roles", json=payload)
+    rest.directory.roles.setdefault(guild["id"], []).append(role)
+    return f"Created role: {name}"
+
+
+async def assign_role(username: str, role_name: str) -> str:
+    """
+    Assign a role to a user.
+
+    Args:
+        username: Discord username
+        role_name: Role to assign
+
+    Returns:
+        Confirmation
+    """
+    rest = get_rest()
+    role = await rest.find_role(role_name)
+    if role is None:
+        return f"Role not found: {role_name}"
+    member = await rest.find_member(username)
+    if member is None:
+        return f"User not found: {username}"
+
+    await rest.request(
+        "PUT", f"/guilds/{role['guild_id']}/members/{member['user']['id']}/roles/{role['id']}"
+    )
+    return f"Assigned {role_name} to {username}"
+
+
+# ============================================================================
+# Reading
+# ============================================================================
+
+async def read_channel(channel_name: str, limit: int = 10) -> str:
+    """
+    Read recent messages from a channel.
+
+    Args:
+        channel_name: Channel name
+        limit: Number of messages
+
+    Returns:
+        Messages
+    """
+    rest = get_rest()
+    channel = await rest.find_channel(channel_name)
+    if channel is None:
+        return f"No messages found in #{channel_name}"
+
+    # Newest first, at most 100 per request
+    history = await rest.request(
+        "GET", f"/channels/{channel['id']}/messages", params={"limit": min(limit, 100)}
+    )
+    messages = [f"[{msg['author']['username']}] {msg['content'][:200]}" for msg in history]
+
+    if not messages:
+        return f"No messages found in #{channel_name}"
+
+    return f"Last {len(messages)} messages in #{channel_name}:\n" + "\n".join(reversed(messages))
+
+
+# ============================================================================
+# Server Info
+# ============================================================================
+
+async def server_info() -> str:
+    """
+    Get info about the Discord server.
+
+    Returns:
+        Server information
+    """
+    rest = get_rest()
+    directory = await rest.refresh_directory()
+
+    info = []
+    for g in directory.guilds:
+        guild = await rest.request("GET", f"/guilds/{g['id']}", params={"with_counts": "true"})
+        channels = directory.channels.get(g["id"], [])
+        text_count = sum(1 for c in channels if c["type"] in TEXT_CHANNEL_TYPES)
+        voice_count = sum(1 for c in channels if c["type"] == VOICE_CHANNEL)
+
+        owner = guild["owner_id"]
+        for member in directory.members.get(g["id"], []):
+            if member["user"]["id"] == owner:
+                owner = member["user"]["username"]
+
+        info.append(f"**{guild['name']}**")
+        info.append(f"Members: {guild.get('approximate_member_count', '?')}")
+        info.append(f"Channels: {text_count} text, {voice_count} voice")
+        info.append(f"Roles: {len(guild.get('roles', []))}")
+        info.append(f"Owner: {owner}")
+
+    return "\n".join(info) if info else "No server info found"
@@ -0,0 +1,141 @@
+"""
+Background event loop for the sync tool APIs.
+
+The sync tools in engine/tools/slack.py and engine/tools/discord.py are
+thin wrappers over their async versions (slack_async.py,
+discord_async.py). Each call is submitted to one long-lived event loop
+running in a daemon thread and the caller waits for the result:
+
+- No nest_asyncio and no asyncio.run per call: the caller's own loop
+  (if any) is never re-entered
+- Pooled HTTP sessions (Slack AsyncWebClient, Discord REST) live on the
+  background loop and are reused across calls
+- Sessions are closed at interpreter exit
+
+Async code (the Slack/Discord dispatchers) should await the *_async
+modules directly — a sync wrapper called from inside a running loop
+still blocks that loop while it waits, and logs a warning once.
+
+Usage:
+    from engine.tools.loop import run_sync, sync_wrapper
+
+    result = run_sync(slack_async.read_channel("team-jpa"))
+    read_channel = sync_wrapper(slack_async.read_channel)
+"""
+
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import logging
+import threading
+from typing import Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long atexit cleanup may take before the loop is abandoned
+SHUTDOWN_TIMEOUT_SECONDS = 5
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_cleanups: list[Callable[[], Awaitable]] = []
+_warned: set[str] = set()
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    """The background loop, started on first use."""
+    global _loop, _thread
+    with _lock:
+        if _loop is None or _loop.is_closed() or not _thread.is_alive():
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(ready.set)
+                loop.run_forever()
+
+            _thread = threading.Thread(target=_run, name="tools-loop", daemon=True)
+            _thread.start()
+            ready.wait()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro: Awaitable, timeout: Optional[float] = None):
+    """
+    Run a coroutine on the background loop and wait for its result.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait before cancelling it (None = no limit)
+
+    Returns:
+        Whatever the coroutine returns (exceptions are re-raised here)
+    """
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() called on the tools loop itself; await the coroutine instead")
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def _warn_if_in_loop(name: str):
+    """Log once per tool when a sync wrapper is called from async code."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    if name not in _warned:
+        _warned.add(name)
+        logger.warning(
+            f"Sync tool {name}() called from a running event loop; it blocks that loop "
+            f"until done. Await the async version instead."
+        )
+
+
+def sync_wrapper(func: Callable[..., Awaitable]) -> Callable:
+    """Sync version of an async tool (same name, signature and docstring)."""
+    name = f"{func.__module__}.{func.__name__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        _warn_if_in_loop(name)
+        return run_sync(func(*args, **kwargs))
+
+    return wrapper
+
+
+def on_shutdown(cleanup: Callable[[], Awaitable]):
+    """Register a coroutine function to run on the background loop at exit."""
+    _cleanups.append(cleanup)
+
+
+def _shutdown():
+    with _lock:
+        loop = _loop
+    if loop is None or loop.is_closed() or not loop.is_running():
+        return
+
+    async def _cleanup():
+        for cleanup in _cleanups:
+            try:
+                await cleanup()
+            except Exception as e:
+                logger.warning(f"Tools loop cleanup failed: {e}")
+
+    try:
+        asyncio.run_coroutine_threadsafe(_cleanup(), loop).result(SHUTDOWN_TIMEOUT_SECONDS)
+    except Exception as e:
+        logger.warning(f"Tools loop shutdown incomplete: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+
+
+atexit.register(_shutdown)
@@ -0,0 +1,14 @@
+"""
+Shared test setup.
+
+Modules that connect to Slack build their app at import time and need a
+bot token to exist; tests never make real API calls with it.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault("SLACK_BOT_TOKEN", "xoxb-test")
@@ -0,0 +1,119 @@
+"""Warm agent sessions: recycled sessions must not carry a previous turn's conversation."""
+
+import asyncio
+
+import pytest
+from claude_agent_sdk import AssistantMessage, ClaudeAgentOptions, ResultMessage, SystemMessage, TextBlock
+
+from engine.agents import pool as pool_module
+from engine.agents.pool import AgentPool
+
+
+class FakeClient:
+    """A ClaudeSDKClient stand-in that remembers its conversation like the CLI does."""
+
+    confirm_clear = True  # False: /clear answers without starting a new conversation
+
+    def __init__(self, options):
+        self.options = options
+        self.history = []
+        self.dead = False
+        self._pending = []
+        self._sessions = 0
+
+    async def connect(self):
+        pass
+
+    async def disconnect(self):
+        pass
+
+    async def set_permission_mode(self, mode):
+        if self.dead:
+            raise ConnectionError("CLI exited")
+
+    async def query(self, prompt):
+        if self.dead:
+            raise ConnectionError("CLI exited")
+        if prompt == pool_module.CLEAR_COMMAND:
+            self._pending = []
+            if self.confirm_clear:
+                self.history = []
+                self._sessions += 1
+                self._pending.append(SystemMessage("init", {"session_id": f"s{self._sessions}"}))
+        else:
+            self._pending = [AssistantMessage([TextBlock(" | ".join(self.history))], "fake")]
+            self.history.append(prompt)
+        self._pending.append(ResultMessage("success", 1, 1, False, 1, f"s{self._sessions}"))
+
+    async def receive_response(self):
+        for message in self._pending:
+            yield message
+
+
+@pytest.fixture(autouse=True)
+def fake_client(monkeypatch):
+    monkeypatch.setattr(pool_module, "ClaudeSDKClient", FakeClient)
+    monkeypatch.setattr(FakeClient, "confirm_clear", True)
+
+
+async def turn(pool, text):
+    """One pooled turn; returns the client used and what it remembered beforehand."""
+    async with pool.session("Vega", ClaudeAgentOptions(), "prompt") as client:
+        await client.query(text)
+        seen = [m.content[0].text async for m in client.receive_response() if isinstance(m, AssistantMessage)]
+    await asyncio.gather(*pool._tasks)  # let the background clear finish
+    return client, seen[0]
+
+
+def run(scenario):
+    async def main():
+        pool = AgentPool()
+        try:
+            return await scenario(pool)
+        finally:
+            await pool.close()
+
+    return asyncio.run(main())
+
+
+def test_recycled_session_has_no_prior_conversation():
+    async def scenario(pool):
+        first, _ = await turn(pool, "my password is hunter2")
+        second, seen = await turn(pool, "what did the last person say?")
+        return first, second, seen, pool.stats()
+
+    first, second, seen, stats = run(scenario)
+
+    assert second is first
+    assert seen == ""
+    assert stats["hits"] == 1
+
+
+def test_unconfirmed_clear_discards_the_session(monkeypatch):
+    monkeypatch.setattr(FakeClient, "confirm_clear", False)
+
+    async def scenario(pool):
+        first, _ = await turn(pool, "my password is hunter2")
+        second, seen = await turn(pool, "what did the last person say?")
+        return first, second, seen, pool.stats()
+
+    first, second, seen, stats = run(scenario)
+
+    assert second is not first
+    assert seen == ""
+    assert stats["discarded"] == 2  # neither session's clear was confirmed
+    assert stats["cold_starts"] == 2
+
+
+def test_session_that_fails_its_health_check_is_not_handed_out():
+    async def scenario(pool):
+        first, _ = await turn(pool, "hello")
+        first.dead = True
+        second, _ = await turn(pool, "hello again")
+        return first, second, pool.stats()
+
+    first, second, stats = run(scenario)
+
+    assert second is not first
+    assert stats["discarded"] == 1
+    assert stats.get("hits", 0) == 0
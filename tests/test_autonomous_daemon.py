@@ -0,0 +1,56 @@
+"""Autonomous daemon: results only count when the worker still holds the task."""
+
+import asyncio
+
+import pytest
+
+from engine.autonomous import daemon as daemon_module
+from engine.autonomous.daemon import AutonomousDaemon, WorkerStats
+from engine.autonomous.queue import TaskStatus, WorkQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(tmp_path / "work_queue.db", markdown_debounce=0)
+
+
+def process(daemon, task, worker_id):
+    stats = WorkerStats(worker_id)
+    asyncio.run(daemon._process_task(task, worker_id, stats))
+    return stats
+
+
+def test_completed_task_is_counted(queue, monkeypatch):
+    async def agent(initial_task, stream_callback=None):
+        return "done"
+
+    monkeypatch.setattr(daemon_module, "run_vega_autonomous", agent)
+    daemon = AutonomousDaemon(queue=queue, handle_signals=False)
+    daemon.consecutive_failures = 2
+    task = queue.add("write the summary")
+    claimed = queue.claim_next("worker-a")
+
+    stats = process(daemon, claimed, "worker-a")
+
+    assert queue.get(task.id).status == TaskStatus.COMPLETED
+    assert (daemon.tasks_processed, stats.tasks_completed, daemon.consecutive_failures) == (1, 1, 0)
+
+
+def test_result_after_a_lost_lease_is_counted_as_lost(queue, monkeypatch):
+    async def agent(initial_task, stream_callback=None):
+        # Meanwhile the lease expired and another worker took the task over
+        queue.storage.update(claimed.id, worker_id="worker-b")
+        return "done"
+
+    monkeypatch.setattr(daemon_module, "run_vega_autonomous", agent)
+    daemon = AutonomousDaemon(queue=queue, handle_signals=False)
+    daemon.consecutive_failures = 2
+    queue.add("write the summary")
+    claimed = queue.claim_next("worker-a")
+
+    stats = process(daemon, claimed, "worker-a")
+
+    assert queue.get(claimed.id).status == TaskStatus.IN_PROGRESS
+    assert (daemon.tasks_processed, stats.tasks_completed) == (0, 0)
+    assert (daemon.tasks_lost, stats.tasks_lost) == (1, 1)
+    assert daemon.consecutive_failures == 2  # a lost lease isn't a success
@@ -0,0 +1,57 @@
+"""Stop hook: pending-work checks are served from the shared queue's cached view."""
+
+import pytest
+
+from engine.autonomous import queue as queue_module
+from engine.autonomous.daemon import AutonomousDaemon
+from engine.autonomous.queue import TaskPriority, WorkQueue
+from engine.hooks.autonomous import _get_pending_work
+
+
+@pytest.fixture
+def shared_queue(tmp_path, monkeypatch):
+    shared = WorkQueue(tmp_path / "work_queue.db", markdown_debounce=0)
+    monkeypatch.setattr(queue_module, "_queue_instance", shared)
+    return shared
+
+
+@pytest.fixture
+def view_builds(monkeypatch):
+    """Count how often a QueueView is built from storage."""
+    builds = []
+    real = queue_module.QueueView
+
+    def counting(storage):
+        builds.append(storage)
+        return real(storage)
+
+    monkeypatch.setattr(queue_module, "QueueView", counting)
+    return builds
+
+
+def test_daemon_works_on_the_shared_queue(shared_queue):
+    assert AutonomousDaemon(handle_signals=False).queue is shared_queue
+
+
+def test_daemon_writes_do_not_rebuild_the_hook_view(shared_queue, view_builds):
+    daemon_queue = AutonomousDaemon(handle_signals=False).queue
+    shared_queue.add("triage inbox", priority=TaskPriority.HIGH)
+
+    assert _get_pending_work()['pending'] == 1
+    task = daemon_queue.claim_next("worker-a")
+    assert _get_pending_work() == {}
+    daemon_queue.add("draft weekly update")
+    daemon_queue.complete(task.id, worker_id="worker-a")
+    work = _get_pending_work()
+
+    assert work['pending'] == 1
+    assert work['items'] == [{'task': "draft weekly update (normal)", 'status': 'pending'}]
+    assert view_builds.count(shared_queue.storage) == 1
+
+
+def test_writes_from_another_process_rebuild_the_view(shared_queue, view_builds, tmp_path):
+    _get_pending_work()
+    WorkQueue(tmp_path / "work_queue.db", markdown_debounce=0).add("from the CLI")
+
+    assert _get_pending_work()['pending'] == 1
+    assert view_builds.count(shared_queue.storage) == 2
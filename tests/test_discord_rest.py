@@ -0,0 +1,64 @@
+"""Discord REST directory: lookups served from the cache, misses refresh it sparingly."""
+
+import asyncio
+
+from engine.discord import rest as rest_module
+from engine.discord.rest import DiscordREST
+
+
+class CountingREST(DiscordREST):
+    """Answers directory requests from fixed data and counts guild list fetches."""
+
+    def __init__(self):
+        super().__init__(token="test")
+        self.guild_fetches = 0
+        self.channels = [{"id": "10", "name": "general", "type": 0}]
+
+    async def request(self, method, path, reason=None, **kwargs):
+        if path == "/users/@me/guilds":
+            self.guild_fetches += 1
+            return [{"id": "1", "name": "Hive"}]
+        if path.endswith("/channels"):
+            return list(self.channels)
+        return []
+
+
+def test_repeated_misses_refresh_the_directory_once():
+    rest = CountingREST()
+
+    async def main():
+        assert (await rest.find_channel("general"))["id"] == "10"  # initial load
+        for _ in range(5):
+            assert await rest.find_channel("no-such-channel") is None
+
+    asyncio.run(main())
+
+    assert rest.guild_fetches == 2  # initial load + one miss-triggered refresh
+
+
+def test_a_new_channel_is_found_by_the_miss_refresh():
+    rest = CountingREST()
+
+    async def main():
+        await rest.find_channel("general")
+        rest.channels.append({"id": "11", "name": "launch", "type": 0})
+        return await rest.find_channel("launch")
+
+    assert asyncio.run(main())["id"] == "11"
+
+
+def test_lookups_work_right_after_boot(monkeypatch):
+    """monotonic() counts from boot, so it can be smaller than the TTLs on a fresh host."""
+    monkeypatch.setattr(rest_module.time, "monotonic", lambda: 5.0)
+    rest = CountingREST()
+
+    async def main():
+        found = await rest.find_channel("general")
+        rest.channels.append({"id": "11", "name": "launch", "type": 0})
+        return found, await rest.find_channel("launch")
+
+    general, launch = asyncio.run(main())
+
+    assert general["id"] == "10"
+    assert launch["id"] == "11"
+    assert rest.guild_fetches == 2
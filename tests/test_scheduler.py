@@ -0,0 +1,149 @@
+"""Scheduler: missed-run catch-up, overlapping runs, and resuming from persisted state."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+from engine.scheduler.core import TIMEZONE, CatchUp, Scheduler
+from engine.scheduler.routines import Routine
+from engine.scheduler.state import SchedulerState
+
+# A Monday morning; routines below fire every 10 minutes
+START = datetime(2026, 1, 5, 8, 0, tzinfo=TIMEZONE)
+
+
+def routine(**overrides) -> Routine:
+    return Routine(name="digest", schedule="*/10 * * * *", prompt="post the digest", **overrides)
+
+
+async def ignore(routine, scheduled_for):
+    pass
+
+
+def scheduler(*routines, **kwargs) -> Scheduler:
+    kwargs.setdefault("last_fired", {r.name: START for r in routines})
+    return Scheduler(list(routines), TIMEZONE, on_fire=kwargs.pop("on_fire", ignore), **kwargs)
+
+
+def slots(fires) -> list[str]:
+    return [scheduled_for.strftime("%H:%M") for _, scheduled_for in fires]
+
+
+# ----------------------------------------------------------------------
+# Catch-up
+# ----------------------------------------------------------------------
+
+def test_on_time_fire_runs_once():
+    s = scheduler(routine())
+
+    assert slots(s.due(START + timedelta(minutes=10, seconds=20))) == ["08:10"]
+    assert s.next_fire_at() == START + timedelta(minutes=20)
+
+
+def test_missed_fires_run_once_by_default():
+    s = scheduler(routine())
+
+    assert slots(s.due(START + timedelta(minutes=35))) == ["08:30"]
+    assert s.next_fire_at() == START + timedelta(minutes=40)
+
+
+def test_catch_up_all_replays_every_missed_fire():
+    s = scheduler(routine(catch_up="all"))
+
+    assert slots(s.due(START + timedelta(minutes=35))) == ["08:10", "08:20", "08:30"]
+
+
+def test_catch_up_skip_drops_missed_fires():
+    s = scheduler(routine(), catch_up=CatchUp.SKIP)
+
+    assert s.due(START + timedelta(minutes=35)) == []
+    assert s.next_fire_at() == START + timedelta(minutes=40)
+
+
+def test_missed_fires_with_an_on_time_fire_only_run_the_on_time_one():
+    s = scheduler(routine())
+
+    assert slots(s.due(START + timedelta(minutes=30, seconds=30))) == ["08:30"]
+
+
+def test_fires_older_than_the_catch_up_window_are_dropped():
+    s = scheduler(routine(catch_up="all"), catch_up_window=timedelta(minutes=25))
+
+    assert slots(s.due(START + timedelta(minutes=45))) == ["08:20", "08:30", "08:40"]
+
+
+# ----------------------------------------------------------------------
+# Overlap
+# ----------------------------------------------------------------------
+
+class SlowRoutine:
+    """on_fire that blocks until released, recording each slot it ran for."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.ran = []
+
+    async def __call__(self, routine, scheduled_for):
+        self.ran.append(scheduled_for.strftime("%H:%M"))
+        await self.release.wait()
+
+
+def test_overlap_skip_drops_a_fire_while_the_routine_is_running(tmp_path):
+    state = SchedulerState(tmp_path / "state.db")
+
+    async def main():
+        slow = SlowRoutine()
+        r = routine(overlap="skip")
+        s = scheduler(r, on_fire=slow, state=state)
+        first = s.dispatch(r, START + timedelta(minutes=10))
+        await asyncio.sleep(0)
+        assert s.dispatch(r, START + timedelta(minutes=20)) is None
+        slow.release.set()
+        await first
+        return slow.ran
+
+    assert asyncio.run(main()) == ["08:10"]
+    assert state.get("digest")["last_outcome"] == "success"
+    assert state.get("digest")["runs"] == 1
+
+
+def test_overlap_queue_runs_the_latest_fire_after_the_current_one():
+    async def main():
+        slow = SlowRoutine()
+        r = routine(overlap="queue")
+        s = scheduler(r, on_fire=slow)
+        s.dispatch(r, START + timedelta(minutes=10))
+        await asyncio.sleep(0)
+        assert s.dispatch(r, START + timedelta(minutes=20)) is None
+        assert s.dispatch(r, START + timedelta(minutes=30)) is None  # coalesced with the queued one
+        slow.release.set()
+        while s.running():
+            await asyncio.sleep(0.01)
+        return slow.ran
+
+    assert asyncio.run(main()) == ["08:10", "08:30"]
+
+
+# ----------------------------------------------------------------------
+# Restart
+# ----------------------------------------------------------------------
+
+def test_restart_resumes_from_the_last_handled_slot(tmp_path):
+    path = tmp_path / "state.db"
+    before = scheduler(routine(), state=SchedulerState(path))
+    assert slots(before.due(START + timedelta(minutes=10, seconds=5))) == ["08:10"]
+
+    after = Scheduler([routine()], TIMEZONE, on_fire=ignore, state=SchedulerState(path))
+
+    assert after.next_fire_at() == START + timedelta(minutes=20)
+    assert after.due(START + timedelta(minutes=10, seconds=30)) == []  # 08:10 isn't fired again
+
+
+def test_restart_catches_up_fires_missed_while_down(tmp_path):
+    path = tmp_path / "state.db"
+    before = scheduler(routine(), state=SchedulerState(path))
+    before.due(START + timedelta(minutes=10, seconds=5))
+
+    after = Scheduler([routine()], TIMEZONE, on_fire=ignore, state=SchedulerState(path))
+
+    assert slots(after.due(START + timedelta(minutes=45))) == ["08:40"]
+    assert SchedulerState(path).last_fired()["digest"] == START + timedelta(minutes=40)
@@ -0,0 +1,49 @@
+"""Shared Slack client: sessions follow the event loop they're used on."""
+
+import asyncio
+import threading
+
+from engine.slack.client import PooledAsyncWebClient
+
+
+async def ensure_session(client):
+    client._ensure_session()
+    return client.session
+
+
+def test_session_from_a_finished_loop_is_closed_when_replaced():
+    client = PooledAsyncWebClient(token="xoxb-test")
+    old = asyncio.run(ensure_session(client))
+
+    new = asyncio.run(ensure_session(client))
+
+    assert new is not old
+    assert old.closed
+    asyncio.run(client.close())
+
+
+def test_session_from_a_running_loop_is_closed_on_that_loop():
+    client = PooledAsyncWebClient(token="xoxb-test")
+    other = asyncio.new_event_loop()
+    thread = threading.Thread(target=other.run_forever, daemon=True)
+    thread.start()
+    try:
+        old = asyncio.run_coroutine_threadsafe(ensure_session(client), other).result(timeout=5)
+
+        async def replace():
+            new = await ensure_session(client)
+            for _ in range(100):
+                if old.closed:
+                    break
+                await asyncio.sleep(0.01)
+            await client.close()
+            return new
+
+        new = asyncio.run(replace())
+
+        assert new is not old
+        assert old.closed
+    finally:
+        other.call_soon_threadsafe(other.stop)
+        thread.join(timeout=5)
+        other.close()
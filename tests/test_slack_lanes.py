@@ -0,0 +1,119 @@
+"""Conversation lanes: which Slack messages share an agent turn."""
+
+import asyncio
+
+from engine.slack.dispatcher import conversation_key
+from engine.slack.lanes import ConversationLanes
+
+
+class FakeSlack:
+    """Records placeholders posted by say() and edits to them."""
+
+    def __init__(self):
+        self.posted = []
+        self.updates = []
+
+    def say_in(self, channel):
+        async def say(text, thread_ts=None):
+            ts = f"900.{len(self.posted)}"
+            self.posted.append({"channel": channel, "ts": ts, "thread_ts": thread_ts, "text": text})
+            return {"channel": channel, "ts": ts}
+        return say
+
+    async def chat_update(self, channel, ts, text):
+        self.updates.append((channel, ts, text))
+
+
+def run_lanes(events, say_for):
+    """Submit message events the way the dispatcher does; return the turns that ran."""
+    slack = FakeSlack()
+    turns = []
+
+    async def run_turn(turn):
+        turns.append(turn)
+
+    async def main():
+        lanes = ConversationLanes(slack, run_turn, coalesce_seconds=0.05)
+        await asyncio.gather(*(
+            lanes.submit(
+                conversation_key(event),
+                event["text"],
+                say_for(slack, event),
+                thread_ts=event.get("thread_ts") or (None if event.get("channel_type") == "im" else event["ts"]),
+                message_ts=event["ts"],
+            )
+            for event in events
+        ))
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+    return slack, turns
+
+
+def test_two_users_in_a_channel_each_get_their_own_reply():
+    events = [
+        {"channel": "C1", "channel_type": "channel", "user": "U1", "ts": "100.1", "text": "what's on today?"},
+        {"channel": "C1", "channel_type": "channel", "user": "U2", "ts": "100.2", "text": "deploy status?"},
+    ]
+    slack, turns = run_lanes(events, lambda slack, event: slack.say_in(event["channel"]))
+
+    assert sorted(t.text for t in turns) == ["deploy status?", "what's on today?"]
+    # Each reply goes in its own message's thread, under its own placeholder
+    assert {t.text: t.thread_ts for t in turns} == {"what's on today?": "100.1", "deploy status?": "100.2"}
+    assert len({t.placeholder["ts"] for t in turns}) == 2
+
+
+def test_messages_in_one_thread_share_a_turn():
+    events = [
+        {"channel": "C1", "channel_type": "channel", "ts": "100.3", "thread_ts": "100.1", "text": "also"},
+        {"channel": "C1", "channel_type": "channel", "ts": "100.4", "thread_ts": "100.1", "text": "and this"},
+    ]
+    slack, turns = run_lanes(events, lambda slack, event: slack.say_in(event["channel"]))
+
+    assert len(turns) == 1
+    assert turns[0].text == "also\n\nand this"
+    assert turns[0].thread_ts == "100.1"
+
+
+def test_top_level_dm_follow_ups_share_a_turn():
+    events = [
+        {"channel": "D1", "channel_type": "im", "ts": "100.5", "text": "hi"},
+        {"channel": "D1", "channel_type": "im", "ts": "100.6", "text": "one more thing"},
+    ]
+    slack, turns = run_lanes(events, lambda slack, event: slack.say_in(event["channel"]))
+
+    assert len(turns) == 1
+    assert turns[0].thread_ts is None
+
+
+def test_turn_waits_for_a_slow_placeholder_before_starting():
+    slack = FakeSlack()
+    started = []
+
+    async def run_turn(turn):
+        started.append((turn.text, turn.placeholder))
+
+    def slow_say(channel, delay):
+        say = slack.say_in(channel)
+
+        async def delayed(text, thread_ts=None):
+            await asyncio.sleep(delay)  # e.g. waiting out a 429
+            return await say(text, thread_ts=thread_ts)
+        return delayed
+
+    async def main():
+        lanes = ConversationLanes(slack, run_turn, coalesce_seconds=0.05)
+        slow = asyncio.create_task(lanes.submit(("C1", "100.1"), "first", slow_say("C1", 0.3), "100.1", message_ts="100.1"))
+        await asyncio.sleep(0.01)
+        # Another lane starts and finishes (pumping the queue) while the placeholder is in flight
+        await lanes.submit(("C2", "200.1"), "elsewhere", slack.say_in("C2"), "200.1", message_ts="200.1")
+        await asyncio.sleep(0.15)
+        await lanes.submit(("C1", "100.1"), "follow-up", slack.say_in("C1"), "100.1", message_ts="100.2")
+        await slow
+        await asyncio.sleep(0.2)
+
+    asyncio.run(main())
+
+    assert len(slack.posted) == 2  # one placeholder per turn, none duplicated
+    assert [text for text, _ in started] == ["elsewhere", "first\n\nfollow-up"]
+    assert all(placeholder is not None for _, placeholder in started)
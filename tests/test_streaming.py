@@ -0,0 +1,68 @@
+"""Stream rendering: interim edits are best-effort, final writes are not."""
+
+import asyncio
+
+import pytest
+
+from engine.streaming import StreamRenderer
+
+
+class FlakyChat:
+    """Posts/edits messages, failing the edits listed in fail_on (by edit number)."""
+
+    def __init__(self, fail_on=()):
+        self.fail_on = set(fail_on)
+        self.edits = []
+        self.calls = 0
+
+    async def post(self, text):
+        return {"text": text}
+
+    async def edit(self, message, text):
+        self.calls += 1
+        if self.calls in self.fail_on:
+            raise ConnectionError("edit failed")
+        self.edits.append(text)
+
+
+def test_failed_interim_edit_is_skipped_and_the_run_continues():
+    chat = FlakyChat(fail_on={1})
+
+    async def main():
+        renderer = StreamRenderer(chat.edit, chat.post, placeholder={"text": "_thinking..._"}, min_interval=0)
+        await renderer.feed("Hello")   # this edit fails
+        await renderer.feed(" world")
+        await renderer.finish()
+
+    asyncio.run(main())
+
+    assert chat.edits[-1] == "Hello world"
+
+
+def test_failed_final_write_is_raised():
+    chat = FlakyChat(fail_on={2})
+
+    async def main():
+        renderer = StreamRenderer(chat.edit, chat.post, placeholder={"text": "_thinking..._"}, min_interval=0)
+        await renderer.feed("Hello")
+        await renderer.finish()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(main())
+
+
+def test_failed_scheduled_edit_does_not_leave_a_task_error():
+    chat = FlakyChat(fail_on={2})
+
+    async def main():
+        renderer = StreamRenderer(chat.edit, chat.post, placeholder={"text": "_thinking..._"}, min_interval=0.05)
+        await renderer.feed("Hello")       # edits now
+        await renderer.feed(" world")      # scheduled; that edit fails
+        pending = renderer._pending
+        await asyncio.sleep(0.1)
+        assert pending.done() and pending.exception() is None
+        await renderer.finish()
+
+    asyncio.run(main())
+
+    assert chat.edits[-1] == "Hello world"
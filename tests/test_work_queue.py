@@ -0,0 +1,240 @@
+"""Work queue: task IDs, leases, dedup, delayed/recurring tasks and the archive."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from engine.autonomous.queue import MAX_ATTEMPTS, TaskPriority, TaskStatus, WorkQueue, next_occurrence
+from engine.autonomous.storage import JsonQueueStorage, QueueStorage, SQLiteQueueStorage
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return WorkQueue(tmp_path / "work_queue.db", markdown_debounce=0)
+
+
+# ----------------------------------------------------------------------
+# IDs
+# ----------------------------------------------------------------------
+
+def test_ids_are_unique_across_processes_adding_in_the_same_second(queue, tmp_path):
+    other = WorkQueue(tmp_path / "work_queue.db", markdown_debounce=0)
+
+    added = []
+    for i in range(20):
+        added.append(queue.add(f"from daemon A #{i}", dedupe=False).id)
+        added.append(other.add(f"from daemon B #{i}", dedupe=False).id)
+
+    assert len(set(added)) == 40
+    assert len(queue.list_all()) == 40
+
+
+def test_ids_are_not_reused_after_the_newest_task_is_removed(queue):
+    first = queue.add("one", dedupe=False)
+    queue.complete(first.id)
+    queue.clear_completed()
+
+    second = queue.add("two", dedupe=False)
+
+    assert second.id != first.id
+
+
+# ----------------------------------------------------------------------
+# Claims and leases
+# ----------------------------------------------------------------------
+
+def test_claim_takes_the_highest_priority_task_and_leases_it(queue):
+    queue.add("low", priority=TaskPriority.LOW)
+    urgent = queue.add("urgent", priority=TaskPriority.URGENT)
+
+    claimed = queue.claim_next("worker-a")
+
+    assert claimed.id == urgent.id
+    assert claimed.status == TaskStatus.IN_PROGRESS
+    assert claimed.worker_id == "worker-a"
+    assert queue.claim_next("worker-b").description == "low"
+    assert queue.claim_next("worker-c") is None
+
+
+def test_two_queues_never_claim_the_same_task(queue, tmp_path):
+    other = WorkQueue(tmp_path / "work_queue.db", markdown_debounce=0)
+    for i in range(10):
+        queue.add(f"task {i}", dedupe=False)
+
+    claimed = []
+    for _ in range(10):
+        claimed.append(queue.claim_next("worker-a"))
+        claimed.append(other.claim_next("worker-b"))
+
+    ids = [t.id for t in claimed if t is not None]
+    assert len(ids) == 10
+    assert len(set(ids)) == 10
+
+
+def test_only_the_lease_holder_can_finish_or_renew_a_task(queue):
+    task = queue.add("write report")
+    queue.claim_next("worker-a")
+
+    assert not queue.renew_lease(task.id, "worker-b")
+    assert not queue.complete(task.id, "done", worker_id="worker-b")
+    assert queue.renew_lease(task.id, "worker-a")
+    assert queue.complete(task.id, "done", worker_id="worker-a")
+    assert queue.get(task.id).status == TaskStatus.COMPLETED
+
+
+def test_expired_lease_is_requeued_for_another_worker(queue):
+    task = queue.add("flaky job")
+    queue.claim_next("worker-a", lease_seconds=-1)
+
+    reclaimed = queue.claim_next("worker-b")
+
+    assert reclaimed.id == task.id
+    assert reclaimed.worker_id == "worker-b"
+    assert reclaimed.attempts == 2
+    assert not queue.complete(task.id, worker_id="worker-a")
+
+
+def test_task_that_keeps_losing_its_lease_is_failed(queue):
+    task = queue.add("crashes the worker")
+    for _ in range(MAX_ATTEMPTS):
+        queue.claim_next("worker-a", lease_seconds=-1)
+
+    assert queue.requeue_expired() == 1
+    assert queue.get(task.id).status == TaskStatus.FAILED
+    assert queue.claim_next("worker-a") is None
+
+
+def test_released_task_goes_back_to_pending(queue):
+    task = queue.add("interrupted")
+    queue.claim_next("worker-a")
+
+    assert queue.release(task.id, "worker-a")
+    assert queue.get(task.id).status == TaskStatus.PENDING
+    assert queue.claim_next("worker-b").id == task.id
+
+
+# ----------------------------------------------------------------------
+# Dedup
+# ----------------------------------------------------------------------
+
+def test_duplicate_descriptions_coalesce_into_one_task(queue):
+    first = queue.add("Review today's meetings.")
+    second = queue.add("review todays meetings", priority=TaskPriority.HIGH)
+
+    assert second.id == first.id
+    assert queue.get(first.id).priority == TaskPriority.HIGH
+    assert len(queue.list_pending()) == 1
+    assert queue.stats()["sessions_saved"] == 1
+
+
+def test_idempotency_key_coalesces_while_the_task_is_running(queue):
+    first = queue.add("morning brief", idempotency_key="morning_brief:2026-01-07")
+    queue.claim_next("worker-a")
+
+    again = queue.add("morning brief (retry)", idempotency_key="morning_brief:2026-01-07")
+
+    assert again.id == first.id
+    assert len(queue.list_all()) == 1
+
+
+def test_finished_tasks_and_dedupe_false_do_not_coalesce(queue):
+    first = queue.add("sync calendar")
+    queue.complete(first.id)
+
+    assert queue.add("sync calendar").id != first.id
+    assert queue.add("sync calendar", dedupe=False).id != first.id
+    assert len(queue.list_pending()) == 2
+
+
+# ----------------------------------------------------------------------
+# Delayed and recurring tasks
+# ----------------------------------------------------------------------
+
+def test_delayed_task_is_held_until_due(queue):
+    later = datetime.now() + timedelta(hours=1)
+    task = queue.add("follow up", not_before=later)
+
+    assert queue.count_pending() == 0
+    assert queue.claim_next("worker-a") is None
+    assert [t.id for t in queue.list_scheduled()] == [task.id]
+    assert queue.next_due_at() == later
+
+
+def test_due_task_becomes_claimable(queue):
+    task = queue.add("follow up", not_before=datetime.now() - timedelta(seconds=1))
+
+    assert queue.count_pending() == 1
+    assert queue.claim_next("worker-a").id == task.id
+
+
+def test_finished_recurring_task_queues_its_next_run(queue):
+    task = queue.add("weekday standup", recurrence="0 9 * * 1-5", not_before=datetime.now() - timedelta(seconds=1))
+    queue.claim_next("worker-a")
+
+    queue.fail(task.id, "agent error", worker_id="worker-a")
+
+    [next_run] = queue.list_scheduled()
+    assert next_run.id != task.id
+    assert next_run.recurrence == "0 9 * * 1-5"
+    assert datetime.fromisoformat(next_run.not_before) == next_occurrence("0 9 * * 1-5")
+
+
+def test_recurring_task_that_runs_out_of_lease_attempts_is_rescheduled(queue):
+    task = queue.add("nightly sync", recurrence="0 3 * * *", not_before=datetime.now() - timedelta(minutes=1))
+
+    for _ in range(MAX_ATTEMPTS):
+        claimed = queue.claim_next("crashy-worker", lease_seconds=-1)  # lease already expired
+        assert claimed.id == task.id
+    assert queue.requeue_expired() == 1
+
+    assert queue.get(task.id).status == TaskStatus.FAILED
+    [next_run] = queue.list_scheduled()
+    assert next_run.description == "nightly sync"
+    assert next_run.recurrence == "0 3 * * *"
+    assert datetime.fromisoformat(next_run.not_before) > datetime.now()
+
+
+# ----------------------------------------------------------------------
+# Archive
+# ----------------------------------------------------------------------
+
+def test_compact_moves_old_finished_tasks_to_a_searchable_archive(queue):
+    done = queue.add("summarize the launch retro")
+    queue.complete(done.id, "three action items")
+    broken = queue.add("rebuild the index")
+    queue.fail(broken.id, "disk full")
+    waiting = queue.add("still pending")
+
+    assert queue.compact(retention_days=0) == 2
+
+    assert [t.id for t in queue.list_all()] == [waiting.id]
+    assert [t.id for t in queue.search_archive("action items")] == [done.id]
+    assert [t.id for t in queue.search_archive(status="failed")] == [broken.id]
+    assert queue.search_archive("nothing like this") == []
+
+
+def test_compact_keeps_tasks_inside_the_retention_window(queue):
+    task = queue.add("recent")
+    queue.complete(task.id)
+
+    assert queue.compact(retention_days=7) == 0
+    assert queue.get(task.id).status == TaskStatus.COMPLETED
+
+
+# ----------------------------------------------------------------------
+# Storage backends
+# ----------------------------------------------------------------------
+
+def test_a_partial_storage_backend_cannot_be_instantiated():
+    class HalfDone(QueueStorage):
+        def insert(self, task):
+            pass
+
+    with pytest.raises(TypeError):
+        HalfDone()
+
+
+@pytest.mark.parametrize("backend", [SQLiteQueueStorage, JsonQueueStorage])
+def test_storage_backends_implement_the_whole_interface(backend, tmp_path):
+    assert not getattr(backend, "__abstractmethods__", None)
+    WorkQueue(tmp_path / "queue.db", storage=backend(tmp_path / "queue.store"), markdown_debounce=0).add("works")